@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# @description      forklift.app builder
+#
+# @author           Andrea Benini
+# @date             2026-10-17
+# @license          GNU Affero General Public License v3.0
+# @see              Single file, self contained zipapp (python3 is the only requirement) with sources and
+#                   their optimized bytecode: each module.pyc sits next to its module.py, hash based and
+#                   unchecked so zipimport loads it without looking at the source. Interpreters with a
+#                   different bytecode version just ignore it and compile the sources, each time: an app
+#                   copied on another host is recompiled there by its own python3 (remote.execute.sh)
+#                       ./app.build.py                          # forklift.app, bytecode for this python3
+#                       ./app.build.py --no-bytecode            # sources only, smaller
+#                       python3 app.build.py --recompile APP    # bytecode of APP replaced, for this python3
+#
+# pyright: reportMissingImports=false
+#
+import os
+import sys
+import stat
+import zipfile
+import argparse
+import tempfile
+import py_compile
+
+
+APP_NAME    = 'forklift.app'
+APP_SHEBANG = b'#!/usr/bin/env python3\n'
+APP_OPTIMIZE = 2                        # python -OO: no asserts, no docstrings
+
+
+# appFiles() Sources in the app: (file on disk, name in the archive)
+def appFiles(root=''):
+    files = [(os.path.join(root, 'forklift.py'), '__main__.py'),
+             (os.path.join(root, 'forklift.py'), 'forklift.py'),
+             (os.path.join(root, '__init__.py'), '__init__.py')]
+    for name in sorted(os.listdir(os.path.join(root, 'forkliftlib'))):
+        if name.endswith('.py'):
+            files.append((os.path.join(root, 'forkliftlib', name), f'forkliftlib/{name}'))
+    return files
+
+# appBuild() Write the app in [output], sources are appFiles([root]) unless [files] are given
+# @return (int, int) [modules, bytes]
+def appBuild(root='', output=APP_NAME, bytecode=True, optimize=APP_OPTIMIZE, files=None):
+    with tempfile.TemporaryDirectory() as workdir:
+        with open(output, 'wb') as file:
+            file.write(APP_SHEBANG)
+            with zipfile.ZipFile(file, 'w', compression=zipfile.ZIP_DEFLATED) as archive:
+                for (source, name) in files or appFiles(root):
+                    archive.write(source, name)
+                    if not bytecode:
+                        continue
+                    compiled = os.path.join(workdir, name.replace('/', '_')+'c')
+                    py_compile.compile(source, cfile=compiled, dfile=name, doraise=True, optimize=optimize,
+                                       invalidation_mode=py_compile.PycInvalidationMode.UNCHECKED_HASH)
+                    archive.write(compiled, name+'c')
+                modules = len(archive.namelist())
+    os.chmod(output, os.stat(output).st_mode | stat.S_IXUSR | stat.S_IXGRP | stat.S_IXOTH)
+    return (modules, os.path.getsize(output))
+
+# appRecompile() Replace the bytecode of [app] with bytecode for this python3, same sources
+# @return (int, int) [modules, bytes]
+def appRecompile(app='', optimize=APP_OPTIMIZE):
+    with tempfile.TemporaryDirectory() as sources:
+        with zipfile.ZipFile(app) as archive:
+            names = [name for name in archive.namelist() if name.endswith('.py')]
+            for name in names:
+                archive.extract(name, sources)
+        return appBuild(output=app, optimize=optimize, files=[(os.path.join(sources, name), name) for name in names])
+
+
+def main():
+    root = os.path.dirname(os.path.realpath(__file__))
+    parser = argparse.ArgumentParser(description='Build forklift.app, single file zipapp')
+    parser.add_argument('-o', '--output', default=os.path.join(root, APP_NAME), help=f'Destination (default: {APP_NAME} in the sources directory)')
+    parser.add_argument('-O', '--optimize', type=int, default=APP_OPTIMIZE, choices=[0, 1, 2], help=f'Bytecode optimization level (default: {APP_OPTIMIZE})')
+    parser.add_argument('--no-bytecode', dest='bytecode', action='store_false', help='Sources only')
+    parser.add_argument('--recompile', metavar='APP', help='Replace the bytecode of an existing app with bytecode for this python3, nothing is built')
+    argument = parser.parse_args()
+    if argument.recompile:
+        (argument.output, argument.bytecode) = (argument.recompile, True)
+        (modules, size) = appRecompile(app=argument.recompile, optimize=argument.optimize)
+    else:
+        (modules, size) = appBuild(root=root, output=argument.output, bytecode=argument.bytecode, optimize=argument.optimize)
+    print(f'{argument.output}: {modules} files, {size} bytes' + (f', bytecode for python {sys.version_info.major}.{sys.version_info.minor}' if argument.bytecode else ''))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,251 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# @description      stand-in container runtime for benchmarks, N synthetic containers and images
+#
+# @author           Andrea Benini
+# @date             2026-10-17
+# @license          GNU Affero General Public License v3.0
+# @see              Answers the runtime commands used by forklift (--version, ps, images, inspect, history,
+#                   events, logs, exec, build, volumes and actions) with the "podman ... --format=json" layout, no
+#                   engine is needed. Images are stacks of layers, images of the same family share base layers.
+#                   Data is generated from these environment variables, same values same data:
+#                       FORKLIFT_BENCH_ITEMS     number of containers and of images (default: 10)
+#                       FORKLIFT_BENCH_NAME      containers and images name length (default: 24)
+#                       FORKLIFT_BENCH_LATENCY   milliseconds spent before answering ps/images/inspect (default: 0)
+#                       FORKLIFT_BENCH_SEED      random seed (default: 1)
+#                       FORKLIFT_BENCH_BUILD     seconds for each Containerfile step of "build" (default: 0)
+#                   Install it as "podman" and "docker" in a directory and put it first in $PATH:
+#                       benchmark/fakeruntime.py --install /tmp/fakebin
+#                       PATH=/tmp/fakebin:$PATH FORKLIFT_BENCH_ITEMS=50000 ./forklift.py
+#
+# pyright: reportMissingImports=false
+#
+import os
+import sys
+import json
+import time
+import random
+import string
+
+
+BENCH_ITEMS    = 10
+BENCH_NAME     = 24
+BENCH_LATENCY  = 0
+BENCH_SEED     = 1
+BENCH_STATES   = ['running', 'running', 'exited', 'created', 'paused']
+BENCH_TAGS     = ['latest', 'stable', 'v1', 'v2', '2026.10']
+BENCH_COMMANDS = ['/bin/sh', 'nginx', 'postgres', 'python3']
+BENCH_FAMILIES = 5                      # Base layers stacks shared by images
+RUNTIMES       = ['podman', 'docker']
+
+
+# benchSettings() Generation settings from the environment
+# @return (dict) {items, name, latency, seed}
+def benchSettings():
+    return {
+        'items':   int(os.getenv('FORKLIFT_BENCH_ITEMS', BENCH_ITEMS)),
+        'name':    int(os.getenv('FORKLIFT_BENCH_NAME', BENCH_NAME)),
+        'latency': float(os.getenv('FORKLIFT_BENCH_LATENCY', BENCH_LATENCY)),
+        'seed':    int(os.getenv('FORKLIFT_BENCH_SEED', BENCH_SEED)),
+    }
+
+# One random 64 bits value for each item, fields are taken from its bits (cheap enough for huge lists)
+def _randoms(seed, items):
+    rng = random.Random(seed)
+    return (rng, [rng.getrandbits(64) for _ in range(0, items)])
+
+# Unique name of [length] characters (at least the index suffix), a slice of [text] picked by [bits]
+def _name(text, bits, index, length):
+    suffix = f'-{index}'
+    size   = max(1, length-len(suffix))
+    offset = bits % (len(text)-size)
+    return text[offset:offset+size] + suffix
+
+def _text(rng, length):
+    return ''.join(rng.choices(string.ascii_lowercase, k=length+4096))
+
+
+# Image layers [(digest, size)], base first: the base layers of its family and one to three of its own
+def _layers(bits=0):
+    family = (bits >> 8) % BENCH_FAMILIES
+    layers = [(f'sha256:{family:032x}{layer:032x}', (family+1)*(layer+1)*7000000) for layer in range(0, 3)]
+    return layers + [(f'sha256:{bits:016x}{layer:048x}', (bits >> (40+layer*8)) % 300000000 + 1000) for layer in range(0, (bits >> 12) % 3 + 1)]
+
+# benchImages() [items] synthetic images, one out of ten is dangling (no names). Their [layers] are there on request (inspect)
+def benchImages(items=BENCH_ITEMS, name=BENCH_NAME, seed=BENCH_SEED, layers=False):
+    (rng, randoms) = _randoms(seed, items)
+    text = _text(rng, name)
+    images = []
+    for (index, bits) in enumerate(randoms):
+        stack = _layers(bits)
+        image = {
+            'Id':        f'{bits:016x}'*4,
+            'Names':     [] if index % 10 == 9 else [f'localhost/{_name(text, bits, index, name)}:{BENCH_TAGS[(bits >> 16) % len(BENCH_TAGS)]}'],
+            'CreatedAt': f'2026-{(bits >> 20) % 10 + 1:02d}-{(bits >> 24) % 28 + 1:02d}T{(bits >> 32) % 24:02d}:00:00Z',
+            'Size':      sum(size for (_, size) in stack),
+        }
+        if layers:
+            image['RootFS']  = {'Type': 'layers', 'Layers': [digest for (digest, _) in stack]}
+            image['History'] = [size for (_, size) in stack] + [0]      # Last entry: CMD, an empty layer
+        images.append(image)
+    return images
+
+# benchVolumes() One volume every five items, one out of two is not used by containers
+def benchVolumes(items=BENCH_ITEMS):
+    return [{'Name': f'volume-{index}', 'Driver': 'local', 'Mountpoint': f'/nonexistent/volumes/volume-{index}/_data', 'InUse': index % 2 == 0}
+            for index in range(0, max(1, items // 5))]
+
+# benchContainers() [items] synthetic containers, each one using one of the named images ([size]: writable layer size too)
+def benchContainers(items=BENCH_ITEMS, name=BENCH_NAME, seed=BENCH_SEED, size=False):
+    images = [image for image in benchImages(items=items, name=name, seed=seed) if image['Names']] or [{'Id': '0'*64, 'Names': ['localhost/scratch:latest']}]
+    (rng, randoms) = _randoms(seed+1, items)
+    text = _text(rng, name)
+    containers = []
+    for (index, bits) in enumerate(randoms):
+        image = images[index % len(images)]
+        container = {
+            'Id':        f'{bits:016x}'*4,
+            'Names':     [_name(text, bits, index, name)],
+            'Image':     image['Names'][0],
+            'ImageID':   image['Id'],
+            'State':     BENCH_STATES[(bits >> 16) % len(BENCH_STATES)],
+            'CreatedAt': f'2026-{(bits >> 20) % 10 + 1:02d}-{(bits >> 24) % 28 + 1:02d} {(bits >> 32) % 24:02d}:00:00 +0000 UTC',
+            'Command':   None if index % 7 == 6 else [BENCH_COMMANDS[(bits >> 40) % len(BENCH_COMMANDS)], '-c', 'serve'],
+        }
+        if size:
+            container['Size'] = {'rootFsSize': image.get('Size', 0), 'rwSize': (bits >> 24) % 50000000}
+        containers.append(container)
+    return containers
+
+
+# runtimeInstall() Install this script as "podman" and "docker" in [path]
+# @return (list) Installed executables
+def runtimeInstall(path=''):
+    os.makedirs(path, exist_ok=True)
+    installed = []
+    for runtime in RUNTIMES:
+        fileName = os.path.join(path, runtime)
+        with open(fileName, 'w') as file:
+            file.write(f'#!/bin/sh\nexec {sys.executable} {os.path.realpath(__file__)} --runtime {runtime} "$@"\n')
+        os.chmod(fileName, 0o755)
+        installed.append(fileName)
+    return installed
+
+
+# runtimeRun() Answer a runtime command line ([arguments] without the runtime name)
+# @return (int) Exit code
+def runtimeRun(runtime='podman', arguments=[]):
+    settings = benchSettings()
+    command  = [argument for argument in arguments if not argument.startswith('-')]
+    if arguments[:1] == ['--version']:
+        print('podman version 5.0.0-bench' if runtime == 'podman' else 'Docker version 27.0.0-bench, build bench')
+        return 0
+    if command[:1] in (['ps'], ['images'], ['inspect'], ['image'], ['container']):
+        time.sleep(settings['latency']/1000)
+    if command[:1] == ['ps']:
+        containers = benchContainers(items=settings['items'], name=settings['name'], seed=settings['seed'], size='--size' in arguments)
+        filters = [argument[3:] for argument in command if argument.startswith('id=')]
+        if filters:
+            containers = [container for container in containers if container['Id'].startswith(filters[0])]
+        sys.stdout.write(json.dumps(containers))
+        return 0
+    if command[:1] == ['images']:
+        sys.stdout.write(json.dumps(benchImages(items=settings['items'], name=settings['name'], seed=settings['seed'])))
+        return 0
+    if command[:1] in (['inspect'], ['image'], ['container']):
+        items = benchContainers(items=settings['items'], name=settings['name'], seed=settings['seed']) + benchImages(items=settings['items'], name=settings['name'], seed=settings['seed'], layers=True)
+        for item in items:
+            item.pop('History', None)
+        wanted = {ID for ID in command[1:] if ID != 'inspect'}
+        found  = [item for item in items if item['Id'] in wanted or wanted.intersection(item['Names'])]       # Full IDs and names, then prefixes
+        if len(found) < len(wanted):
+            found = [item for item in items if any(item['Id'].startswith(ID) or ID in item['Names'] for ID in wanted)]
+        sys.stdout.write(json.dumps(found, indent=4))
+        return 0 if found else 125
+    if command[:1] == ['events']:                       # Nothing ever happens, until forklift closes it
+        sys.stdout.flush()
+        while True:
+            time.sleep(3600)
+    if command[:1] in (['build'], ['bud']) or command[:2] == ['buildx', 'build']:      # Containerfile steps echoed, "RUN exit N" fails
+        return _build(arguments[arguments.index(command[1] if command[0] == 'buildx' else command[0])+1:], settings)
+    if command[:1] == ['history']:                      # Newest first, "--format {{.Size}}"
+        images = [image for image in benchImages(items=settings['items'], name=settings['name'], seed=settings['seed'], layers=True) if image['Id'].startswith(command[-1])]
+        if not images:
+            print(f'Error: {command[-1]}: image not known', file=sys.stderr)
+            return 125
+        print('\n'.join(str(size) for size in reversed(images[0]['History'])))
+        return 0
+    if command[:2] == ['volume', 'ls']:
+        volumes = benchVolumes(items=settings['items'])
+        if 'dangling=true' in command:
+            print('\n'.join(volume['Name'] for volume in volumes if not volume['InUse']))
+        else:
+            sys.stdout.write(json.dumps([{key: value for (key, value) in volume.items() if key != 'InUse'} for volume in volumes]))
+        return 0
+    if command[:2] == ['volume', 'rm']:
+        print('\n'.join(command[2:]))
+        return 0
+    if command[:1] == ['exec']:                         # Images have /bin/sh only, interactive sessions end at once
+        if '-c' in arguments:
+            print('/bin/sh')
+        elif command[2:] != ['/bin/sh']:
+            print(f'Error: crun: executable file `{" ".join(command[2:])}` not found in $PATH', file=sys.stderr)
+            return 127
+        return 0
+    if command[:1] == ['logs']:
+        for line in range(0, 100):
+            print(f'2026-10-17T10:00:{line % 60:02d}Z benchmark log line {line}')
+        return 0
+    if command[:1] in (['stop'], ['kill'], ['rm'], ['restart'], ['rmi'], ['rename'], ['tag'], ['start']):
+        print('\n'.join(command[1:]))
+        return 0
+    print(f'Error: unsupported command {" ".join(arguments)}', file=sys.stderr)
+    return 125
+
+
+# Fake build: each Containerfile instruction is a step taking FORKLIFT_BENCH_BUILD seconds (default: 0)
+def _build(arguments=[], settings={}):
+    (fileName, context, index) = (None, '.', 0)
+    while index < len(arguments):
+        if arguments[index] in ('-f', '--file'):
+            (fileName, index) = (arguments[index+1], index+1)
+        elif arguments[index].startswith('--file='):
+            fileName = arguments[index][7:]
+        elif arguments[index] in ('-t', '--tag', '--build-arg', '--label'):
+            index += 1
+        elif not arguments[index].startswith('-'):
+            context = arguments[index]
+        index += 1
+    fileName = fileName or next((os.path.join(context, name) for name in ['Containerfile', 'Dockerfile'] if os.path.exists(os.path.join(context, name))), os.path.join(context, 'Containerfile'))
+    try:
+        with open(fileName, 'r') as file:
+            steps = [line.strip() for line in file if line.strip() and not line.startswith('#')]
+    except OSError as E:
+        print(f'Error: {str(E)}', file=sys.stderr)
+        return 125
+    for (number, step) in enumerate(steps, start=1):
+        print(f'STEP {number}/{len(steps)}: {step}', flush=True)
+        time.sleep(float(os.getenv('FORKLIFT_BENCH_BUILD', 0)))
+        if step.upper().startswith('RUN EXIT '):
+            return int(step.split()[2])
+    print(f'COMMIT {settings["seed"]:064x}')
+    return 0
+
+
+def main():
+    arguments = sys.argv[1:]
+    if arguments[:1] == ['--install'] and len(arguments) == 2:
+        for fileName in runtimeInstall(arguments[1]):
+            print(fileName)
+        sys.exit(0)
+    runtime = 'podman'
+    if arguments[:1] == ['--runtime'] and len(arguments) > 1:
+        (runtime, arguments) = (arguments[1], arguments[2:])
+    try:
+        sys.exit(runtimeRun(runtime=runtime, arguments=arguments))
+    except (BrokenPipeError, KeyboardInterrupt):
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
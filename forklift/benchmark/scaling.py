@@ -0,0 +1,218 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# @description      forklift scaling benchmark, lists and screens with many containers and images
+#
+# @author           Andrea Benini
+# @date             2026-10-17
+# @license          GNU Affero General Public License v3.0
+# @see              Runtime is the stand-in one (benchmark/fakeruntime.py) installed in a temporary directory,
+#                   screen is a pseudo terminal owned by the benchmark (bless draws on it, nothing is shown).
+#                   For each list size, containers and images report:
+#                       fetch    runtime command ("ps|images -a --format=json"), latency included
+#                       parse    runtime output to items (json), same as the CLI engine backend
+#                       format   items to menu labels (Container.List, Container.imagesList)
+#                       frame    first menu frame (_menu.Display) until it's on the terminal, and its bytes
+#                   then the same labels in a report box (messageBox), its frame time and bytes:
+#                       benchmark/scaling.py --sizes 10,1000,50000 --name 40 --latency 20
+#
+# pyright: reportMissingImports=false
+#
+import os
+import sys
+import pty
+import time
+import fcntl
+import struct
+import termios
+import argparse
+import tempfile
+import threading
+import statistics
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.realpath(__file__))))
+from forkliftlib           import bless
+from forkliftlib.container import Container
+from forkliftlib.engine    import shellExec
+
+sys.path.insert(0, os.path.dirname(os.path.realpath(__file__)))
+from fakeruntime           import runtimeInstall, BENCH_NAME, BENCH_LATENCY, RUNTIMES
+
+
+BENCH_SIZES = [10, 1000, 50000]
+BENCH_RUNS  = 3
+BENCH_SIZE  = (30, 120)                 # Pseudo terminal rows, cols
+
+
+# Engine backend with items already parsed, Container formatting is measured without any runtime call
+class _ItemsEngine(object):
+    def __init__(self, platform='podman', containers=[], images=[]):
+        self.__platform   = platform
+        self.__containers = containers
+        self.__images     = images
+    @property
+    def name(self):
+        return 'benchmark'
+    @property
+    def platform(self):
+        return self.__platform
+    @property
+    def valid(self):
+        return True
+    def close(self):
+        pass
+    def containers(self):
+        return (0, self.__containers)
+    def images(self):
+        return (0, self.__images)
+
+
+# Pseudo terminal replacing stdin/stdout while it's open, output is drained (and counted) in background.
+# A key can be armed: it's typed as soon as the next output shows up (the frame is on the terminal)
+class HeadlessTerminal(object):
+    def __init__(self, rows=BENCH_SIZE[0], cols=BENCH_SIZE[1]):
+        (self.__master, self.__slave) = pty.openpty()
+        fcntl.ioctl(self.__slave, termios.TIOCSWINSZ, struct.pack('HHHH', rows, cols, 0, 0))
+        self.__bytes  = 0
+        self.__armed  = None
+        self.__closed = False
+        self.__saved  = None
+
+    def __enter__(self):
+        sys.stdout.flush()
+        self.__saved = (os.dup(0), os.dup(1), os.environ.get('COLUMNS'), os.environ.get('LINES'))
+        os.environ.pop('COLUMNS', None)                 # Terminal size comes from the pseudo terminal
+        os.environ.pop('LINES', None)
+        os.dup2(self.__slave, 0)
+        os.dup2(self.__slave, 1)
+        self.__thread = threading.Thread(target=self.__drain, daemon=True)
+        self.__thread.start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        sys.stdout.flush()
+        (stdin, stdout, columns, lines) = self.__saved
+        os.dup2(stdin, 0)
+        os.dup2(stdout, 1)
+        os.close(stdin)
+        os.close(stdout)
+        for (variable, value) in [('COLUMNS', columns), ('LINES', lines)]:
+            if value is not None:
+                os.environ[variable] = value
+        self.__closed = True
+        os.close(self.__slave)
+        self.__thread.join()
+        os.close(self.__master)
+
+    def __drain(self):
+        while not self.__closed:
+            try:
+                data = os.read(self.__master, 65536)
+            except OSError:
+                return
+            if not data:
+                return
+            self.__bytes += len(data)
+            if self.__armed:
+                (key, self.__armed) = (self.__armed, None)
+                os.write(self.__master, key.encode())
+
+    @property
+    def bytes(self):                    # Bytes received by the terminal so far
+        return self.__bytes
+
+    # arm() Type [key] as soon as the next output is received, once [written] bytes (all previous output) arrived
+    def arm(self, key='', written=0):
+        timeLimit = time.monotonic()+5
+        while self.__bytes < written and time.monotonic() < timeLimit:
+            time.sleep(0.001)
+        self.__armed = key
+
+
+# Seconds spent by [function], with its result
+def _timed(function, *arguments, **keywords):
+    timeStart = time.perf_counter()
+    result = function(*arguments, **keywords)
+    return (time.perf_counter()-timeStart, result)
+
+# menuFrame() First frame of a menu with [items], closed with <ENTER> once the terminal got it
+# @return (float, int) [seconds, frame bytes]
+def menuFrame(screen=None, terminal=None, items=[]):
+    screen.clear()
+    screen.refresh()                                    # Blank screen on the terminal, every frame starts from there
+    menu = screen.menu(Items=items)
+    bytesStart = screen.stats['bytes']
+    terminal.arm(bless.KEY['ENTER'], written=bytesStart)
+    (elapsed, _) = _timed(menu.Display, X=3, Y=4, Multiple=True, Filter=True, Footer=' benchmark ')
+    return (elapsed, screen.stats['bytes']-bytesStart)
+
+# messageFrame() A report box with [lines], closed with <ENTER> once the terminal got it
+# @return (float, int) [seconds, frame bytes]
+def messageFrame(screen=None, terminal=None, lines=[]):
+    screen.clear()
+    screen.refresh()
+    bytesStart = screen.stats['bytes']
+    terminal.arm(bless.KEY['ENTER'], written=bytesStart)
+    (elapsed, _) = _timed(screen.messageBox, Title='Benchmark', Message='\n'.join(lines)+'\n', Width=screen.cols-4, Height=screen.rows-4)
+    return (elapsed, screen.stats['bytes']-bytesStart)
+
+
+# listMeasure() One run for a list ('containers'|'images') of the current size
+# @return (dict) {items, json, fetch, parse, format, frame, bytes}
+def listMeasure(runtime='podman', kind='containers', screen=None, terminal=None):
+    import json
+    (fetchTime, (errorCode, output)) = _timed(shellExec, f"{runtime} {'ps' if kind == 'containers' else 'images'} -a --format=json")
+    if errorCode != 0:
+        raise RuntimeError(f'{runtime} {kind}: {output.strip()}')
+    (parseTime, items) = _timed(json.loads, output)
+    container = Container(path=tempfile.gettempdir(), engine=_ItemsEngine(platform=runtime, containers=items if kind == 'containers' else [], images=items if kind == 'images' else []))
+    (formatTime, (labels, _)) = _timed(container.List if kind == 'containers' else container.imagesList)
+    (frameTime, frameBytes) = menuFrame(screen=screen, terminal=terminal, items=labels)
+    return {'items': len(items), 'json': len(output), 'fetch': fetchTime, 'parse': parseTime, 'format': formatTime, 'frame': frameTime, 'bytes': frameBytes, 'labels': labels}
+
+def _median(runs, key):
+    return statistics.median(run[key] for run in runs)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Forklift scaling benchmark (stand-in runtime, headless terminal)')
+    parser.add_argument('-s', '--sizes', default=','.join(str(size) for size in BENCH_SIZES), help=f'Comma separated list sizes (default: {",".join(str(size) for size in BENCH_SIZES)})')
+    parser.add_argument('-n', '--runs', type=int, default=BENCH_RUNS, help=f'Runs for each measure, median is reported (default: {BENCH_RUNS})')
+    parser.add_argument('--name', type=int, default=BENCH_NAME, help=f'Containers and images name length (default: {BENCH_NAME})')
+    parser.add_argument('--latency', type=float, default=BENCH_LATENCY, help=f'Runtime latency for each list, ms (default: {BENCH_LATENCY})')
+    parser.add_argument('--runtime', choices=RUNTIMES, default=RUNTIMES[0], help=f'Runtime name (default: {RUNTIMES[0]})')
+    parser.add_argument('--rows', type=int, default=BENCH_SIZE[0], help=f'Terminal rows (default: {BENCH_SIZE[0]})')
+    parser.add_argument('--cols', type=int, default=BENCH_SIZE[1], help=f'Terminal columns (default: {BENCH_SIZE[1]})')
+    argument = parser.parse_args()
+    sizes = [int(size) for size in argument.sizes.split(',') if size.strip()]
+
+    binPath = tempfile.mkdtemp(prefix='forklift-bench-')
+    runtimeInstall(binPath)
+    os.environ['PATH'] = binPath + os.pathsep + os.environ.get('PATH', '')
+    os.environ['FORKLIFT_BENCH_NAME']    = str(argument.name)
+    os.environ['FORKLIFT_BENCH_LATENCY'] = str(argument.latency)
+
+    results = []
+    with HeadlessTerminal(rows=argument.rows, cols=argument.cols) as terminal:
+        screen = bless.bless()
+        screen.init()
+        screen.keyPending()                             # Raw mode and bracketed paste now, not in the first measure
+        for size in sizes:
+            os.environ['FORKLIFT_BENCH_ITEMS'] = str(size)
+            for kind in ['containers', 'images']:
+                runs = [listMeasure(runtime=argument.runtime, kind=kind, screen=screen, terminal=terminal) for _ in range(argument.runs)]
+                messages = [messageFrame(screen=screen, terminal=terminal, lines=[label for (label, *_) in runs[0]['labels']]) for _ in range(argument.runs)]
+                results.append((size, kind, runs, messages))
+        screen.close()
+    for fileName in os.listdir(binPath):
+        os.unlink(os.path.join(binPath, fileName))
+    os.rmdir(binPath)
+
+    print(f'runtime {argument.runtime}, name length {argument.name}, latency {argument.latency:g} ms, terminal {argument.cols}x{argument.rows}, median of {argument.runs} runs')
+    print(f'\n{"items":>7}  {"list":<10} {"json KB":>9} {"fetch ms":>9} {"parse ms":>9} {"format ms":>10} {"frame ms":>9} {"bytes":>7}  {"box ms":>8} {"bytes":>7}')
+    for (size, kind, runs, messages) in results:
+        print(f'{size:>7}  {kind:<10} {_median(runs, "json")/1024:>9.1f} {_median(runs, "fetch")*1000:>9.2f} {_median(runs, "parse")*1000:>9.2f} {_median(runs, "format")*1000:>10.2f} '
+              f'{_median(runs, "frame")*1000:>9.2f} {int(_median(runs, "bytes")):>7}  {statistics.median(elapsed for (elapsed, _) in messages)*1000:>8.2f} {int(statistics.median(frameBytes for (_, frameBytes) in messages)):>7}')
+
+if __name__ == "__main__":
+    main()
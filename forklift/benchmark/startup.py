@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# @description      forklift startup benchmark
+#
+# @author           Andrea Benini
+# @date             2026-10-17
+# @license          GNU Affero General Public License v3.0
+# @see              Measures what short sessions pay before anything useful happens: interpreter startup,
+#                   forklift imports (each module, from "python -X importtime") and time to first frame
+#                   (program started in a pseudo terminal until its first screen is drawn). Works on the
+#                   sources (forklift.py) or on the zipapp (forklift.app). Exit code is 1 when a budget
+#                   is exceeded, regressions can be checked from any CI or shell script:
+#                       benchmark/startup.py --target forklift.app --max-import 60 --max-frame 400
+#
+# pyright: reportMissingImports=false
+#
+import os
+import re
+import sys
+import pty
+import time
+import fcntl
+import struct
+import signal
+import select
+import termios
+import argparse
+import statistics
+import subprocess
+
+
+BENCH_RUNS       = 5
+BENCH_IMPORT_MAX = 100                  # Milliseconds, default budgets
+BENCH_FRAME_MAX  = 500
+BENCH_TIMEOUT    = 10                   # Seconds, max wait for the first frame
+BENCH_MARKER     = rb'Containers|E R R O R'     # First frame: tabs bar or the error box (no engine)
+BENCH_SIZE       = (30, 120)            # Pseudo terminal rows, cols
+IMPORT_LINE      = re.compile(r'^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)$')
+
+
+# importTimes() Modules imported by forklift, each one with its own and cumulative time (microseconds)
+# @return (list) [(module, self, cumulative, depth)] in import order
+def importTimes(target=''):
+    code = f'import sys; sys.path.insert(0, {os.path.dirname(target) if target.endswith(".py") else target!r}); import forklift'
+    process = subprocess.run([sys.executable, '-X', 'importtime', '-c', code], stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, universal_newlines=True)
+    modules = []
+    for line in process.stderr.splitlines():
+        match = IMPORT_LINE.match(line)
+        if match:
+            modules.append((match.group(4), int(match.group(1)), int(match.group(2)), (len(match.group(3))-1)//2))
+    return modules
+
+# interpreterTime() Bare interpreter startup and exit, seconds
+def interpreterTime():
+    timeStart = time.monotonic()
+    subprocess.run([sys.executable, '-c', 'pass'])
+    return time.monotonic()-timeStart
+
+# firstFrame() Seconds from program start to its first frame, None on timeout
+def firstFrame(command=[], marker=BENCH_MARKER, timeout=BENCH_TIMEOUT):
+    timeStart = time.monotonic()
+    (pid, fd) = pty.fork()
+    if pid == 0:
+        fcntl.ioctl(sys.stdout.fileno(), termios.TIOCSWINSZ, struct.pack('HHHH', BENCH_SIZE[0], BENCH_SIZE[1], 0, 0))
+        os.execvp(command[0], command)
+    output  = b''
+    elapsed = None
+    try:
+        while time.monotonic()-timeStart < timeout:
+            (ready, _, _) = select.select([fd], [], [], 0.05)
+            if not ready:
+                continue
+            try:
+                output += os.read(fd, 65536)
+            except OSError:
+                break
+            if re.search(marker, output):
+                elapsed = time.monotonic()-timeStart
+                break
+    finally:
+        os.kill(pid, signal.SIGKILL)
+        os.waitpid(pid, 0)
+        os.close(fd)
+    return elapsed
+
+
+def main():
+    here = os.path.dirname(os.path.dirname(os.path.realpath(__file__)))
+    parser = argparse.ArgumentParser(description='Forklift startup benchmark')
+    parser.add_argument('-t', '--target', default=os.path.join(here, 'forklift.py'), help='forklift.py or forklift.app (default: sources)')
+    parser.add_argument('-n', '--runs', type=int, default=BENCH_RUNS, help=f'Runs for each measure, median is reported (default: {BENCH_RUNS})')
+    parser.add_argument('-m', '--modules', type=int, default=15, help='Slowest modules listed (default: 15)')
+    parser.add_argument('--max-import', type=float, default=BENCH_IMPORT_MAX, help=f'Budget for forklift imports, ms (default: {BENCH_IMPORT_MAX})')
+    parser.add_argument('--max-frame', type=float, default=BENCH_FRAME_MAX, help=f'Budget for the first frame, ms (default: {BENCH_FRAME_MAX})')
+    parser.add_argument('arguments', nargs=argparse.REMAINDER, help='forklift arguments (--path, --socket, ...)')
+    argument = parser.parse_args()
+    target = os.path.realpath(argument.target)
+    if argument.arguments[:1] == ['--']:
+        argument.arguments = argument.arguments[1:]
+
+    interpreter = statistics.median(interpreterTime() for _ in range(argument.runs)) * 1000
+    samples = [importTimes(target) for _ in range(argument.runs)]
+    total   = statistics.median(next((cumulative for (name, _, cumulative, depth) in modules if name == 'forklift' and depth == 0), 0) for modules in samples) / 1000
+    frames  = [firstFrame(command=[sys.executable, target]+argument.arguments) for _ in range(argument.runs)]
+    frame   = statistics.median(frames)*1000 if None not in frames else None
+
+    print(f'target          {target}')
+    print(f'interpreter     {interpreter:8.1f} ms')
+    print(f'imports         {total:8.1f} ms')
+    print('first frame     ' + (f'{frame:8.1f} ms' if frame is not None else 'not drawn'))
+    print(f'\nslowest modules (cumulative ms, median of {argument.runs} runs)')
+    timings = {}
+    for modules in samples:
+        for (name, _, cumulative, depth) in modules:
+            timings.setdefault((name, depth), []).append(cumulative)
+    slowest = sorted(timings.items(), key=lambda item: -statistics.median(item[1]))[:argument.modules]
+    for ((name, depth), values) in slowest:
+        print(f'  {statistics.median(values)/1000:8.2f}  {"  "*depth}{name}')
+
+    failed = []
+    if total > argument.max_import:
+        failed.append(f'imports {total:.1f} ms > {argument.max_import} ms')
+    if frame is None or frame > argument.max_frame:
+        failed.append(f'first frame {"not drawn" if frame is None else f"{frame:.1f} ms"} > {argument.max_frame} ms')
+    for message in failed:
+        print(f'\nOVER BUDGET: {message}')
+    sys.exit(1 if failed else 0)
+
+if __name__ == "__main__":
+    main()
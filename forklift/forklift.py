@@ -17,28 +17,53 @@ CODENAME='Cthulhu'
 import os
 import sys
 try:
-    import argparse
-    import subprocess
+    import types
 
+    # Modules needed by other modes (headless, agent, daemon, hosts, ...) are imported there: faster startup
     from forkliftlib            import bless
     from forkliftlib.container  import Container
+    from forkliftlib.state      import REFRESH_INTERVAL
+    from forkliftlib.stats      import StatsSampler, sparkline, humanBytes, CGROUP_ROOT, STATS_INTERVAL
+    from forkliftlib.protocol   import DAEMON_SOCKET
 except Exception as E:
     print(f"Error while importing modules:\n{str(E)}\nAborting program\n\n")
     sys.exit(1)
 MSG_ANY_KEY=' press any key... '
+MSG_MARK_KEYS=' </>.Filter  <SPACE>.Mark  <+>.Mark matching  <->.Unmark all  <ENTER> on marked items for bulk actions '
+MSG_STATS_KEYS=' Sort by: <c>.CPU  <m>.Memory  <i>.I/O  <p>.PIDs '
+MSG_HOSTS_KEYS=' </>.Filter  <ENTER>.Actions on that host  <\u2190\u2192>.Containers|Images  <ESC>.Exit '
+STATS_SORT=['cpu', 'memory', 'io', 'pids']
 COLOR=(bless.WHITE, bless.BLUE)
 
 class ForkliftSystem(object):
-    def __init__(self, path=''):
+    def __init__(self, path='', socket=None, refresh=REFRESH_INTERVAL, cgroup=CGROUP_ROOT, statsInterval=STATS_INTERVAL, engine=None, buildJobs=None, buildLogs=None):
         self.__Exit = False
+        self.__buildJobs = buildJobs                                    # None: build pipeline defaults
+        self.__buildLogs = buildLogs
         self.__editor = os.getenv('EDITOR')
         if not self.__editor: 
             self.__editor = ''
         self.__screen = bless.bless(init=True)
-        self.__container = Container(path=path)
+        self.__remote = engine
+        self.__container = Container(path=path, socket=socket, engine=engine)
+        if self.__container.valid:                                      # Cached lists first, engine ones in background
+            import threading
+            self.__container.watch(interval=refresh, cached=True).listenerAdd(self.__screen.wakeup)
+            threading.Thread(target=self.__container.Prefetch, name='forklift-prefetch', daemon=True).start()   # Running containers details
+        self.__stats = StatsSampler(root=cgroup, interval=statsInterval)
+        self.__stats.listenerAdd(self.__screen.wakeup)
+        self.__statsSort = 'cpu'
         self.__StatusInit()
+        terminal = self.__container.cache.get('terminal') or {}
+        if terminal.get('tab') in range(len(self.__statusBarPages)):
+            self.__tabCurrent = terminal['tab']
+        if terminal.get('statsSort') in STATS_SORT:
+            self.__statsSort = terminal['statsSort']
 
     def Run(self):
+        if not self.__container.valid and self.__remote:
+            self.__screen.messageBox(Title='E R R O R', Message=f'\n\nCannot connect to the remote agent\n{self.__remote.error}\n\nClosing Application\n\n', Footer=MSG_ANY_KEY, Color=(bless.WHITE, bless.RED))
+            return
         if not self.__container.valid:
             self.__screen.messageBox(Title='E R R O R', Message='\n\nCannot detect container engine\nCurrently supporting: ('+"|".join(self.__container.platformList)+')\n\nClosing Application\n\n', Footer=MSG_ANY_KEY, Color=(bless.WHITE, bless.RED))
             return
@@ -47,12 +72,18 @@ class ForkliftSystem(object):
             self.__StatusBar()
             if self.__tabCurrent == 1:          # Images tab
                 self.__tabImages()
-            elif self.__tabCurrent == 2:        # System tab
+            elif self.__tabCurrent == 2:        # Stats tab
+                self.__tabStats()
+            elif self.__tabCurrent == 3:        # System tab
                 self.__tabSystem()
             else:                               # Containers (default) tab
                 self.__tabContainers()
 
     def Close(self):
+        self.__stats.stop()
+        if self.__container.valid:
+            self.__container.cacheSave(terminal={'tab': self.__tabCurrent, 'statsSort': self.__statsSort})
+        self.__container.close()
         self.__screen.clear()
         self.__screen.close()
 
@@ -63,11 +94,23 @@ class ForkliftSystem(object):
         self.__exec(Command=f"{self.__editor} '{filename}'")
 
     def __exec(self, Command=''):
+        import subprocess
         self.__screen.pause()
         result = subprocess.run(Command, shell=True)
         self.__screen.restore()
         return result.returncode
 
+    # Container logs in the built-in pager, external "logs | less" when the engine cannot stream them
+    def __logs(self, ID, Name, follow=False):
+        logs = self.__container.Logs(containerID=ID, follow=follow, listener=self.__screen.wakeup)
+        if logs is None:
+            self.__exec(Command=self.__container.cmdLog(containerID=ID))
+            return
+        try:
+            self.__screen.pager(Source=logs, Title=f'[{Name}] logs', Color=COLOR)
+        finally:
+            logs.close()
+
     def __containerNew(self):
         cwdMessage = '\n'+str(os.getcwd())+'\n'+(' '*42)+'\n'
         menuSize   = self.__screen.textGetColMax(cwdMessage)
@@ -86,7 +129,7 @@ class ForkliftSystem(object):
             self.__container.LoadContainers()
             return
         if selection == len(menu.items)-2:                          # Free manual input (suggested input)
-            value = self.__container.platform+' run --hostname HOSTNAMEHERE --name NAME -it IMAGENAME /bin/bash'
+            value = self.__container.cmdRuntime()+' run --hostname HOSTNAMEHERE --name NAME -it IMAGENAME /bin/bash'
         else:
             value = list(containers)[selection][1]                  # Command to execute from the list
         # Edit parameters before executing them (msgbox below just for drawing user attention)
@@ -104,6 +147,7 @@ class ForkliftSystem(object):
                 (' Stop',           'stop'),
                 (' Kill',           'kill'),
                 (' Logs',           'log'),
+                (' Logs - Follow',  'logfollow'),
                 (' Inspection',     'inspect'),
                 (' Rename',         'rename'),
                 (' Remove',         'remove'),
@@ -115,25 +159,36 @@ class ForkliftSystem(object):
         (_, action) = menu.items[selection]
         if action == 'custom':                        # custom action, suggesting attach as a sample
             userAction = self.__screen.editBox(Title=f'custom action to execute', Footer='<ENTER>.Confirm <ESC>.Cancel', Size=200, Y=10,
-                                               DefaultValue=self.__container.platform+f' exec -it {ID} /bin/bash')
+                                               DefaultValue=self.__container.cmdAttach(containerID=ID, shell='/bin/bash'))
             if userAction.value:
                 self.__exec(Command=userAction.value)
             return
-        elif action=='log':
-            self.__exec(Command=self.__container.cmdLog(containerID=ID))
+        elif action=='log' or action=='logfollow':
+            self.__logs(ID, Name, follow=(action=='logfollow'))
             return
-        elif action=='inspect':
-            self.__exec(Command=self.__container.cmdInspect(containerID=ID))
+        elif action=='inspect':                         # Tree viewer on cached details, runtime output in a pager when the engine fails
+            (errorCode, details) = self.__container.Inspect(containerID=ID)
+            if errorCode != 0:
+                self.__exec(Command=self.__container.cmdInspect(containerID=ID))
+            elif details:
+                self.__screen.tree(Source=details, Title=f'Inspect {Name}')
+            else:
+                self.__screen.messageBox(Title='E R R O R', Message=f'\nContainer {Name} does not exist anymore\n\n{ID}\n', Footer=MSG_ANY_KEY, Color=(bless.WHITE, bless.RED))
             return
         elif action=='start':
             # Start
             if Status.lower() != 'running':
                 self.__exec(Command=self.__container.cmdStart(containerID=ID))
                 return
-            # Attach
-            for guessedShell in self.__container.containerShellList:
-                result = self.__exec(Command=self.__container.cmdAttach(containerID=ID)+' '+guessedShell)
+            # Attach: shell probed once for each image (cached), a single exec after that
+            shell = self.__container.containerShell(containerID=ID)
+            if shell:
+                self.__exec(Command=self.__container.cmdAttach(containerID=ID, shell=shell))
+                return
+            for guessedShell in self.__container.containerShellList:    # No /bin/sh for the probe, one shell at a time
+                result = self.__exec(Command=self.__container.cmdAttach(containerID=ID, shell=guessedShell))
                 if result == 0:
+                    self.__container.containerShellSet(containerID=ID, shell=guessedShell)
                     return
             self.__screen.messageBox(Title='E R R O R', Message=f'\nCannot detect a suitable shell for attaching to this container\n[{", ".join(self.__container.containerShellList)}]\n\n{ID}\n', Footer=MSG_ANY_KEY, Color=(bless.WHITE, bless.RED))
             return
@@ -172,6 +227,60 @@ class ForkliftSystem(object):
             return
         self.__screen.messageBox(Title=title, Message=f'\n{message}\n', Footer=MSG_ANY_KEY, Color=colors)
 
+    def __containersBulk(self, containers=[]):
+        menu = self.__screen.menu(Color=COLOR, Items=[
+                (' Stop',       'stop'),
+                (' Kill',       'kill'),
+                (' Restart',    'restart'),
+                (' Remove',     'remove'),
+                (' Logs - Follow (merged)', 'logs'),
+        ])
+        selection = menu.Display(Caption=f"[{len(containers)} marked containers]", Footer='<ESC>.Cancel', ItemWidth=50, Lines=7, X=10, Y=8)
+        if selection == -1:
+            return
+        (name, action) = menu.items[selection]
+        if action == 'logs':
+            logs = self.__container.LogsMerged(containers=[(ID, Name) for (_, ID, Name, _) in containers], listener=self.__screen.wakeup)
+            if logs is None:
+                self.__screen.messageBox(Title='E R R O R', Message='\nCannot follow logs for marked containers\n', Footer=MSG_ANY_KEY, Color=(bless.WHITE, bless.RED))
+                return
+            try:
+                self.__screen.pager(Source=logs, Title=f'[{len(containers)} containers] logs', Color=COLOR)
+            finally:
+                logs.close()
+            return
+        if action == 'remove':
+            confirm = self.__screen.confirmBox(Title="Confirm Containers Deletion", Message=f"\nDelete {len(containers)} containers            \n",
+                                               Color=(bless.BLACK, bless.YELLOW), MessageButtons=[' Yes ', ' No '], ButtonSelected=1)
+            if confirm != 0:
+                return
+        self.__bulk(Title=f'{name.strip()} {len(containers)} containers', Action=action, Items=[(ID, Name) for (_, ID, Name, _) in containers])
+
+    # Bulk action on many [Items] [(ID, name)], live progress panel and a final report
+    def __bulk(self, Title='', Action='', Items=[]):
+        names  = dict(Items)
+        lines  = []
+        errors = 0
+        Width  = min(76, self.__screen.cols-4)
+        Height = min(16, self.__screen.rows-2)
+        def progress(result, done, total):
+            nonlocal errors
+            if result.returnCode != 0:
+                errors += 1
+            lines.append(f"{'ok   ' if result.returnCode == 0 else 'ERROR'} {names[result.item][:Width-20]:<{Width-20}} {result.elapsed:6.2f}s")
+            message = '\n'.join([f'Done {done}/{total}   Errors {errors}', ''] + lines[-(Height-4):])
+            self.__screen.messageBox(Title=Title, Message=message, Width=Width, Height=Height, Color=COLOR, Keypress=False)
+            self.__screen.refresh()
+        (results, elapsed) = self.__container.Bulk(action=Action, IDs=[ID for (ID, _) in Items], progress=progress)
+        report = [f'{len(results)} items, {errors} errors, total time {elapsed:.2f}s', '']
+        for result in results:
+            report.append(f"{'ok   ' if result.returnCode == 0 else 'ERROR'} {names[result.item]}  ({result.elapsed:.2f}s)")
+            if result.returnCode != 0 and result.message:
+                report += ['      '+line for line in result.message.splitlines()]
+        self.__screen.clear()
+        self.__screen.messageBox(Title=Title, Message='\n'.join(report)+'\n', Footer=MSG_ANY_KEY, Width=Width, Height=min(len(report)+3, self.__screen.rows-2),
+                                 Color=COLOR if errors == 0 else (bless.WHITE, bless.RED))
+
     def __imageNew(self, dryrun=False):
         cwdMessage = '\n'+str(os.getcwd())+'\n'+(' '*42)+'\n'
         menuSize   = self.__screen.textGetColMax(cwdMessage)
@@ -179,18 +288,24 @@ class ForkliftSystem(object):
         images = self.__container.imageProfilesList()
         for key,_ in images:
             menu.itemAdd(key)
+        if not dryrun and images:
+            menu.itemAdd("<<---"+self.__screen.textCenter(Text="Build all profiles",      Size=menuSize-12)+"--->>")
+            menu.itemAdd("<<---"+self.__screen.textCenter(Text="Build selected profiles", Size=menuSize-12)+"--->>")
         menu.itemAdd("<<---"+self.__screen.textCenter(Text="Manual Input",     Size=menuSize-12)+"--->>")
         menu.itemAdd("<<---"+self.__screen.textCenter(Text="Edit images.yaml", Size=menuSize-12)+"--->>")
         self.__screen.messageBox(Title='Current directory', Message=cwdMessage, X=19, Y=4, Color=(bless.WHITE, bless.BLACK), Height=15, Keypress=False)
         selection = menu.Display(X=21, Y=8, Caption='Create new image from profile', Lines=10, ItemWidth=menuSize, Footer='<ESC>.Cancel')
         if selection == -1:                                         # Abort
             return None
+        elif not dryrun and images and selection in (len(menu.items)-4, len(menu.items)-3):     # Build pipeline, all or selected profiles
+            self.__imagesBuild(selected=selection == len(menu.items)-3)
+            return None
         elif selection == len(menu.items)-1:                        # Edit images.yaml file
             self.__editFile(self.__container.fileimages)
             self.__container.LoadImages()
             return None
         elif selection == len(menu.items)-2:                        # Free manual input
-            value = self.__container.platform+' build -t IMAGENAME_HERE CONTAINERFILE_DIR'
+            value = self.__container.cmdRuntime()+' build -t IMAGENAME_HERE CONTAINERFILE_DIR'
         else:                                                       # Build an image from the list
             value = list(images)[selection][1]
         # Edit image parameters before building it
@@ -198,10 +313,61 @@ class ForkliftSystem(object):
         cliCommand = self.__screen.editBox(Title='Input parameters for image creation (edit and adapt your own)', Color=COLOR, Footer2=os.getcwd(),
                                            DefaultValue=value, Y=15, Size=512, Width=self.__screen.cols-2, Footer='<ENTER>.Confirm <ESC>.Cancel')
         if cliCommand.value:                                        # UI on hold and execute command
-            command = cliCommand.value+'; echo -en "\n\nPress any key to continue..."; read -n 1 junk'
             if not dryrun:
-                self.__exec(command)
-            return command
+                self.__exec(cliCommand.value+'; echo -en "\n\nPress any key to continue..."; read -n 1 junk')
+            return cliCommand.value
+
+    # Profiles built by the pipeline in FROM dependency order, live progress and a final report with durations
+    def __imagesBuild(self, selected=False):
+        from forkliftlib.build     import buildGraph, BuildPipeline, BUILD_JOBS, BUILD_LOGS
+        from forkliftlib.buildhash import profileHashes, DigestCache
+        profiles = list(self.__container.imageProfilesList())
+        if selected:
+            self.__screen.clear()
+            menu = self.__screen.menu(Color=COLOR, Items=[(name, name) for (name, _) in profiles])
+            selection = menu.Display(X=21, Y=6, Caption='Build selected profiles', Lines=min(len(profiles)+2, self.__screen.rows-10), ItemWidth=50,
+                                     Footer='<SPACE>.Mark <ENTER>.Build <ESC>.Cancel', Multiple=True)
+            if selection < 0:
+                return
+            names = {name for (_, name) in menu.marked} or {profiles[selection][0]}
+            profiles = [(name, command) for (name, command) in profiles if name in names]
+        self.__screen.messageBox(Title='Build pipeline', Message='\n  Hashing build contexts...  \n', Color=COLOR, Keypress=False)
+        self.__screen.refresh()
+        graph = buildGraph(profiles)
+        cache = DigestCache(self.__container.path)
+        profileHashes(graph, cache=cache)                           # Images with the same hash are not built again
+        cache.save()
+        pipeline = BuildPipeline(profiles=graph, jobs=self.__buildJobs or BUILD_JOBS, logs=self.__buildLogs or BUILD_LOGS, listener=self.__screen.wakeup,
+                                 labels=self.__container.imageLabels)
+        pipeline.start()
+        Width  = self.__screen.cols-4
+        Height = min(len(pipeline.jobs)+6, self.__screen.rows-2)
+        Title  = f'Building {len(pipeline.jobs)} images'
+        cancelled = False
+        self.__screen.clear()
+        while not pipeline.finished:
+            lines = [f"Done {sum(job.status not in ('waiting', 'building') for job in pipeline.jobs)}/{len(pipeline.jobs)}   Jobs {pipeline.limit}   Elapsed {pipeline.elapsed:.0f}s"
+                     +('   Cancelling...' if cancelled else '   <ESC>.Cancel'), '']
+            for job in pipeline.jobs[:Height-4]:
+                lines.append(f"{job.status:<9} {job.name[:24]:<24} {job.duration():7.1f}s  {job.lastLine() if job.status == 'building' else job.message}")
+            self.__screen.messageBox(Title=Title, Message='\n'.join(line[:Width-4] for line in lines), Width=Width, Height=Height, Color=COLOR, Keypress=False)
+            key = self.__screen.keyGet(timeout=1, wakeup=True)             # Builds progress (listener) or elapsed time
+            if key == bless.KEY['ESCAPE'] and not cancelled:
+                confirm = self.__screen.confirmBox(Title='Cancel builds', Message='\nStop running builds and skip waiting ones?\n', Color=(bless.BLACK, bless.YELLOW),
+                                                   MessageButtons=[' Yes ', ' No '], ButtonSelected=1)
+                if confirm == 0:
+                    pipeline.cancel()
+                    cancelled = True
+                self.__screen.clear()
+        errors = sum(not job.built for job in pipeline.jobs)
+        report = [f'{len(pipeline.jobs)} images, {errors} errors, total time {pipeline.elapsed:.2f}s', f'Logs: {pipeline.path}', '']
+        for job in pipeline.jobs:
+            report.append(f"{'ok   ' if job.built else 'ERROR'} {job.name}  " + ('(unchanged)' if job.status == 'unchanged' else f'({job.elapsed:.2f}s)'))
+            if not job.built:
+                report += ['      '+line for line in (job.message or job.status).splitlines()]
+        self.__screen.clear()
+        self.__screen.messageBox(Title=Title, Message='\n'.join(report)+'\n', Footer=MSG_ANY_KEY, Width=Width, Height=min(len(report)+3, self.__screen.rows-2),
+                                 Color=COLOR if errors == 0 else (bless.WHITE, bless.RED))
 
     def __imageEdit(self, ID=None, name=''):
         if not ID:
@@ -240,38 +406,71 @@ class ForkliftSystem(object):
         elif selection == 2:                                    # Rebuild
             buildImageCommand = self.__imageNew(dryrun=True)
             if buildImageCommand:
+                from forkliftlib.build     import buildGraph
+                from forkliftlib.buildhash import profileHashes, labelCommand, DigestCache, HASH_LABEL
+                graph = buildGraph(list(self.__container.imageProfilesList()) + [('\0rebuild', buildImageCommand)])
+                cache = DigestCache(self.__container.path)
+                value = profileHashes(graph, cache=cache)['\0rebuild']    # Its FROM profiles are hashed too
+                cache.save()
+                if value and self.__container.imageLabels(imageID=ID).get(HASH_LABEL) == value:
+                    confirm = self.__screen.confirmBox(Title='Image unchanged', Message=f'\nContainerfile and build context of\n"{name}"\nare the same of the current image\n',
+                                                       Color=(bless.BLACK, bless.YELLOW), MessageButtons=[' Skip ', ' Rebuild anyway '], ButtonSelected=0)
+                    if confirm != 1:
+                        return
                 (returnCode, message) = self.__container.imageRemove(imageID=ID)
                 if returnCode == 0:
-                    self.__exec(buildImageCommand)
+                    self.__exec(labelCommand(buildImageCommand, value)+'; echo -en "\n\nPress any key to continue..."; read -n 1 junk')
                 else:
                     title   = 'E R R O R'
                     colors  = (bless.WHITE, bless.RED)
                     message = self.__screen.textWrap(Text=message, Max=60)
                     self.__screen.messageBox(Title=title, Message=f'\n{message}\n', Footer=MSG_ANY_KEY, Color=colors)
 
+    def __imagesBulk(self, images=[]):
+        confirm = self.__screen.confirmBox(Title="Confirm Images Deletion", Message=f"\nDelete {len(images)} marked images            \n",
+                                           Color=(bless.BLACK, bless.YELLOW), MessageButtons=[' Yes ', ' No '], ButtonSelected=1)
+        if confirm == 0:
+            self.__bulk(Title=f'Removing {len(images)} images', Action='rmi', Items=[(ID, ID) for (_, ID, _) in images])
+
     def __StatusInit(self):
         self.__tabCurrent  = 0
-        self.__statusBarPages = [('Containers'), ('Images'), ('System')]
+        self.__statusBarPages = [('Containers'), ('Images'), ('Stats'), ('System')]
 
     def __StatusBar(self):
         xPos = 1
         size = 16
-        self.__screen.text(Text='\u2191\u2193\u2190\u2192 to navigate', X=56, Y=1)
+        self.__screen.text(Text='\u2191\u2193\u2190\u2192 to navigate', X=74, Y=1)
+        self.__StatusStale()
         for index, item in enumerate(self.__statusBarPages):
             (name) = item
             color = (bless.BLACK, bless.WHITE) if index==self.__tabCurrent else (bless.BLACK, bless.BLUE)
             self.__screen.label(name, Size=size, Color=color, Center=True, X=xPos)
             xPos += size+2
 
-    def __tabContainers(self):
-        menu = self.__screen.menu()
+    # Cached lists marker, removed as soon as the engine answers
+    def __StatusStale(self):
+        if self.__container.stale:
+            self.__screen.text(Text=' cached ', X=92, Y=1, Color=(bless.BLACK, bless.YELLOW))
+        else:
+            self.__screen.text(Text=' '*8, X=92, Y=1)
+
+    # Containers list and its header, called on each background refresh too
+    def __listContainers(self):
+        self.__StatusStale()
         (menuItems, labelFormat) = self.__container.List()
         menuItems.append(('< Create New Container >', ''))
-        menu.items = menuItems
-        self.__screen.text(Text=labelFormat.format(id='UID', image='Image Name', name='Name', state='Status', createdAt='Created At', command='Shell'), X=3, Y=3)
-        selection = menu.Display(X=3, Y=4, Keys=['RIGHT'])
+        self.__screen.label(Text=labelFormat.format(id='UID', image='Image Name', name='Name', state='Status', createdAt='Created At', command='Shell'), X=3, Y=3, Line=True)
+        return menuItems
+
+    def __tabContainers(self):
+        menu = self.__screen.menu()
+        menu.items = self.__listContainers()
+        selection = menu.Display(X=3, Y=4, Keys=['RIGHT'], Refresh=self.__listContainers, Multiple=True, Filter=True, Footer=MSG_MARK_KEYS)
+        menuItems = menu.items
         if selection == -1:                                                 # <esc>: just reload the container list
             pass
+        elif selection >= 0 and menu.marked:                                # Marked containers, bulk actions
+            self.__containersBulk(menu.marked)
         elif selection == -2:                                               # Tab: Images
             self.__tabCurrent = 1
         elif selection == len(menuItems)-1:                                 # New container
@@ -279,15 +478,23 @@ class ForkliftSystem(object):
         else:                                                               # Existing container, action on it
             self.__containerEdit(menuItems[selection])
 
+    # Images list and its header, called on each background refresh too
+    def __listImages(self):
+        self.__StatusStale()
+        (menuItems, labelFormat) = self.__container.imagesList()
+        menuItems.append(('< Create New Image >', '', ''))
+        self.__screen.label(Text=labelFormat.format(repository='REPOSITORY', tag='TAG', id='IMAGE ID', created='CREATED', size='SIZE Mb'), X=3, Y=3, Line=True)
+        return menuItems
+
     def __tabImages(self):
         menu = self.__screen.menu()
-        (menuItems, labelFormat) = self.__container.imagesList()
-        menuItems.append(('< Create New Image >', 'newimage', ''))
-        menu.items = menuItems
-        self.__screen.text(Text=labelFormat.format(repository='REPOSITORY', tag='TAG', id='IMAGE ID', created='CREATED', size='SIZE Mb'), X=3, Y=3)
-        selection = menu.Display(X=3, Y=4, Keys=['LEFT', 'RIGHT'])
+        menu.items = self.__listImages()
+        selection = menu.Display(X=3, Y=4, Keys=['LEFT', 'RIGHT'], Refresh=self.__listImages, Multiple=True, Filter=True, Footer=MSG_MARK_KEYS)
+        menuItems = menu.items
         if selection == -1:                                                 # <Escape>
             pass
+        elif selection >= 0 and menu.marked:                                # Marked images, bulk removal
+            self.__imagesBulk(menu.marked)
         elif selection == -2:                                               # <Left>
             self.__tabCurrent = 0
         elif selection == -3:                                               # <Right>
@@ -298,14 +505,58 @@ class ForkliftSystem(object):
             (_, ID, name) = menuItems[selection]
             self.__imageEdit(ID=ID, name=name)
 
+    # Running containers resources usage, highest [self.__statsSort] values first, called on each new sample too
+    def __listStats(self):
+        listed = self.__container.List()
+        running = {record.ID: record.name for record in (listed[0] if listed else []) if str(record.state).lower() == 'running'}     # Fields only, labels aren't formatted
+        self.__stats.track(running.keys())
+        header = ' {name:<24}  {cpu:>7} {cpuChart:<12}  {memory:>7} {memoryChart:<12}  {io:>8} {ioChart:<12}  {pids:>5}'
+        titles = {'cpu': 'CPU%', 'memory': 'MEM', 'io': 'I/O/s', 'pids': 'PIDS'}
+        titles[self.__statsSort] += '\u25bc'
+        self.__screen.label(Text=header.format(name='NAME', cpuChart='', memoryChart='', ioChart='', **titles), X=3, Y=3, Line=True)
+        if not self.__stats.valid:
+            return [(f'cgroup v2 is not available in "{self.__stats.root}"', '')]
+        menuItems = []
+        for item in self.__stats.top(field=self.__statsSort, count=self.__screen.rows-4, IDs=list(running)):
+            (cpu, memory, io, pids) = (item.last('cpu'), item.last('memory'), item.last('io'), item.last('pids'))
+            menuItems.append((header.format(
+                name        = running[item.ID][:24],
+                cpu         = '-' if cpu is None else f'{cpu:.1f}',
+                cpuChart    = sparkline(item.cpu, width=12),
+                memory      = humanBytes(memory),
+                memoryChart = sparkline(item.memory, width=12),
+                io          = humanBytes(io),
+                ioChart     = sparkline(item.io, width=12),
+                pids        = '-' if pids is None else pids,
+            ), item.ID))
+        if not menuItems:
+            menuItems.append((f'No running containers found in "{self.__stats.root}"' if running else 'No running containers', ''))
+        return menuItems
+
+    def __tabStats(self):
+        self.__stats.start()
+        menu = self.__screen.menu()
+        menu.items = self.__listStats()
+        selection = menu.Display(X=3, Y=4, Keys=['LEFT', 'RIGHT'], freeKeys=['c', 'm', 'i', 'p'], Refresh=self.__listStats, Footer=MSG_STATS_KEYS)
+        if selection == -2:                                                 # <Left>
+            self.__tabCurrent = 1
+        elif selection == -3:                                               # <Right>
+            self.__tabCurrent = 3
+        elif selection <= -4:                                               # Sorting field
+            self.__statsSort = STATS_SORT[-4-selection]
+        if self.__tabCurrent != 2:                                          # Sampling only while it's displayed
+            self.__stats.stop()
+
     def __tabSystem(self):
         self.__screen.text(Text=f'Forklift v              '+'"'*(len(CODENAME)+2), X=6, Y=3)
         self.__screen.text(Text=VERSION,  X=16, Y=3, Color=(bless.CYAN,   (1,1)))
         self.__screen.text(Text=CODENAME, X=31, Y=3, Color=(bless.YELLOW, (1,1)))
         self.__screen.text(Text=f'System $EDITOR var      "{(self.__editor if self.__editor!="" else "is not set")}"', X=6, Y=5)
-        self.__screen.text(Text=f'Container runtime       "{self.__container.platform}"', X=6, Y=6)
+        self.__screen.text(Text=f'Container runtime       "{self.__container.platform}" ({self.__container.engine})', X=6, Y=6)
         menu = self.__screen.menu(Items=[
-            ('Storage Information',                                 'storageinfo'),
+            ('Storage Analyzer                 <layers, prune plan>', 'storage'),
+            ('Storage Information              <system df>',        'storageinfo'),
+            ('Runtime Calls                    <timings histogram>', 'timings'),
             ('Edit container build profiles    <containers.yaml>',  'containers'),
             ('Edit image build profiles        <images.yaml>',      'images'),
             ('Exit Program', 'exit'),
@@ -314,24 +565,287 @@ class ForkliftSystem(object):
         if selection == -1:             # Escape, reload menu
             pass
         elif selection == -2:           # Left (goto tab left)
-            self.__tabCurrent = 1
-        elif selection == 0:            # Display Storage Information
+            self.__tabCurrent = 2
+        elif selection == 0:            # Storage analyzer
+            self.__storage()
+        elif selection == 1:            # Display Storage Information
             self.__exec(Command=self.__container.cmdStorageInformation()+'; echo -en "\nPress any key to continue..."; read -n 1 junk')
-        elif selection == 1:            # Edit containers.yaml
+        elif selection == 2:            # Runtime calls timings
+            self.__timings()
+        elif selection == 3:            # Edit containers.yaml
             self.__editFile(self.__container.filecontainers)
             self.__container.LoadContainers()
-        elif selection == 2:            # Edit images.yaml
+        elif selection == 4:            # Edit images.yaml
             self.__editFile(self.__container.fileimages)
             self.__container.LoadImages()
-        elif selection == 3:            # Exit
+        elif selection == 5:            # Exit
             self.__Exit = True
 
+    # Runtime calls and engine API requests since startup, slowest overall first: <ENTER> durations histogram of a command
+    def __timings(self):
+        from forkliftlib.execute import execStats
+        from forkliftlib.storage import storageBytes
+        while True:
+            (stats, total) = (execStats.snapshot(), execStats.total())
+            self.__screen.clear()
+            self.__screen.text(Text=f'Calls {total.calls}, errors {total.errors}, total time {total.elapsed:.2f}s, output {storageBytes(total.size)}  '
+                                    f'(engine {self.__container.engine})', X=3, Y=1)
+            self.__screen.text(Text=f"{'COMMAND':<36} {'CALLS':>7} {'ERRORS':>6} {'TOTAL s':>9} {'MEAN ms':>9} {'P50 ms':>9} {'P95 ms':>9} {'MAX ms':>9} {'OUTPUT':>10}",
+                               X=3, Y=3, Color=(bless.CYAN, (1,1)))
+            menu = self.__screen.menu(Items=[(f'{stat.name[:36]:<36} {stat.calls:>7} {stat.errors:>6} {stat.elapsed:>9.2f} {stat.mean*1000:>9.1f} {stat.percentile(50)*1000:>9.1f} '
+                                              f'{stat.percentile(95)*1000:>9.1f} {stat.longest*1000:>9.1f} {storageBytes(stat.size):>10}', stat.name) for stat in stats]
+                                      or [('No runtime calls yet', '')])
+            selection = menu.Display(X=3, Y=4, Filter=True, freeKeys=['a', 'r'], Footer=' </>.Filter  <ENTER>.Histogram  <a>.All calls histogram  <r>.Reset  <ESC>.Exit ')
+            if selection == -1:
+                return
+            elif selection == -2:
+                self.__timingsHistogram(total)
+            elif selection == -3:
+                execStats.reset()
+            elif stats:
+                self.__timingsHistogram(stats[selection])
+
+    # Durations histogram of [stat] (forkliftlib.execute.ExecStat), one bar for each bucket
+    def __timingsHistogram(self, stat=None):
+        from forkliftlib.execute import EXEC_BUCKETS
+        labels = [f'< {bound*1000:g}ms' if bound < 1 else f'< {bound:g}s' for bound in EXEC_BUCKETS] + [f'>= {EXEC_BUCKETS[-1]:g}s']
+        (width, most) = (min(50, self.__screen.cols-36), max(stat.buckets) or 1)
+        lines = [f'{stat.calls} calls, mean {stat.mean*1000:.1f}ms, p95 {stat.percentile(95)*1000:.1f}ms, max {stat.longest*1000:.1f}ms', '']
+        lines += [f'{label:>8} {calls:>7} {"█"*round(calls*width/most)}' for (label, calls) in zip(labels, stat.buckets)]
+        self.__screen.clear()
+        self.__screen.messageBox(Title=stat.name, Message='\n'.join(lines)+'\n', Footer=MSG_ANY_KEY, Width=width+22, Height=min(len(lines)+3, self.__screen.rows-2), Color=COLOR)
+
+    # Storage analyzer: images shared and unique bytes (<p> switches to the prune plan), reclaimable items to remove
+    def __storage(self):
+        from forkliftlib.storage import storageBytes
+        (view, analyze) = ('images', True)
+        while True:
+            if analyze:
+                self.__screen.clear()
+                self.__screen.messageBox(Title='Storage Analyzer', Message='\n  Reading images layers...  \n', Color=COLOR, Keypress=False)
+                self.__screen.refresh()
+                (returnCode, report) = self.__container.Storage()
+                if returnCode != 0:
+                    self.__screen.messageBox(Title='E R R O R', Message=f'\n{self.__screen.textWrap(Text=str(report), Max=60)}\n', Footer=MSG_ANY_KEY, Color=(bless.WHITE, bless.RED))
+                    return
+                analyze = False
+            self.__screen.clear()
+            self.__screen.text(Text=f'Images {len(report.images)}, on disk {storageBytes(report.disk)} (sum of their sizes {storageBytes(report.virtual)}), '
+                                    f'shared {storageBytes(report.shared)}, {len(report.layers)} layers'+(', some sizes estimated' if report.estimated else ''), X=3, Y=1)
+            reclaimable = [(f'{label} {len(items)} ({storageBytes(report.total(kind))}' + ('+?' if any(item.size is None for item in items) else '') + ')')
+                           for (kind, label) in [('image', 'dangling images'), ('container', 'stopped containers'), ('volume', 'unused volumes')]
+                           for items in [[item for item in report.reclaimable if item.kind == kind]]]
+            self.__screen.text(Text=f"Reclaimable: {', '.join(reclaimable)}   ({report.elapsed:.2f}s)", X=3, Y=2)
+            if view == 'images':
+                self.__screen.text(Text=f"{'IMAGE':<48} {'ID':<12} {'SIZE':>10} {'SHARED':>10} {'UNIQUE':>10}  CONTAINERS", X=3, Y=4, Color=(bless.CYAN, (1,1)))
+                menu = self.__screen.menu(Items=[(f'{image.name[:48]:<48} {image.ID[:12]:<12} {storageBytes(image.size):>10} {storageBytes(image.shared):>10} '
+                                                  f'{storageBytes(image.unique):>10}  {len(image.containers) or ""}', image.ID) for image in report.images])
+                selection = menu.Display(X=3, Y=5, Filter=True, freeKeys=['p', 'r'], Footer=' </>.Filter  <p>.Prune plan  <r>.Analyze again  <ESC>.Exit ')
+                if selection == -1:
+                    return
+                (view, analyze) = ('plan' if selection == -2 else view, selection == -3)
+                continue
+            if not report.reclaimable:
+                self.__screen.messageBox(Title='Prune plan', Message='\n  Nothing to reclaim  \n', Footer=MSG_ANY_KEY, Color=COLOR)
+                view = 'images'
+                continue
+            self.__screen.text(Text=f"{'KIND':<10} {'NAME':<40} {'SIZE':>10}  NOTE", X=3, Y=4, Color=(bless.CYAN, (1,1)))
+            menu = self.__screen.menu(Items=[(f'{item.kind:<10} {item.name[:40]:<40} {storageBytes(item.size):>10}  {item.note}', f'{item.kind}:{item.ID}') for item in report.reclaimable])
+            selection = menu.Display(X=3, Y=5, Multiple=True, Filter=True, freeKeys=['i'],
+                                     Footer=' </>.Filter  <SPACE>.Mark  <+>.Mark matching  <ENTER>.Remove marked  <i>.Images  <ESC>.Exit ')
+            if selection == -1:
+                return
+            elif selection == -2:
+                view = 'images'
+                continue
+            marked = {key for (_, key) in menu.marked}
+            items  = [item for item in report.reclaimable if f'{item.kind}:{item.ID}' in marked] or [report.reclaimable[selection]]
+            confirm = self.__screen.confirmBox(Title='Confirm prune plan', Message=f'\nRemove {len(items)} items, about {storageBytes(report.freed(items))} freed\n',
+                                               Color=(bless.BLACK, bless.YELLOW), MessageButtons=[' Yes ', ' No '], ButtonSelected=1)
+            if confirm == 0:
+                self.__storagePrune(report, items)
+                analyze = True
+
+    # Prune plan execution, live progress and a report with bytes freed and elapsed time
+    def __storagePrune(self, report=None, items=[]):
+        from forkliftlib.storage import storageBytes
+        Width  = min(96, self.__screen.cols-4)
+        Height = min(16, self.__screen.rows-2)
+        lines  = []
+        def progress(result, done, total):
+            lines.append(f"{'ok   ' if result.returnCode == 0 else 'ERROR'} {result.item.kind:<10} {result.item.name[:Width-42]:<{Width-42}} {storageBytes(result.item.size):>10} {result.elapsed:6.2f}s")
+            self.__screen.messageBox(Title='Prune plan', Message='\n'.join([f'Done {done}/{total}', ''] + lines[-(Height-4):]), Width=Width, Height=Height, Color=COLOR, Keypress=False)
+            self.__screen.refresh()
+        self.__screen.clear()
+        (results, elapsed) = self.__container.StoragePrune(items=items, progress=progress)
+        removed = [result.item for result in results if result.returnCode == 0]
+        errors  = [result for result in results if result.returnCode != 0]
+        lines   = [f'{len(removed)} items removed, {len(errors)} errors, {storageBytes(report.freed(removed))} freed, total time {elapsed:.2f}s', '']
+        for result in errors:
+            lines.append(f'ERROR {result.item.kind} {result.item.name}')
+            lines += ['      '+line for line in result.message.splitlines()]
+        self.__screen.clear()
+        self.__screen.messageBox(Title='Prune plan', Message='\n'.join(lines)+'\n', Footer=MSG_ANY_KEY, Width=Width, Height=min(len(lines)+3, self.__screen.rows-2),
+                                 Color=COLOR if not errors else (bless.WHITE, bless.RED))
+
+# Multi-host dashboard: containers and images of all [hosts] in the same table, each host is reached through SSH
+class ForkliftHosts(object):
+    def __init__(self, hosts=[], ssh=None, refresh=REFRESH_INTERVAL):
+        from forkliftlib.hosts import HostPool
+        self.__screen = bless.bless(init=True)
+        self.__pool   = HostPool(hosts=hosts, ssh=ssh, interval=refresh, listener=self.__screen.wakeup)
+        self.__images = False
+        self.__pool.start()
+
+    def Run(self):
+        while True:
+            self.__screen.clear()
+            menu = self.__screen.menu()
+            menu.items = self.__list()
+            selection = menu.Display(X=3, Y=len(self.__pool.hosts)+5, Keys=['LEFT', 'RIGHT'], Refresh=self.__list, Filter=True, Footer=MSG_HOSTS_KEYS)
+            menuItems = menu.items
+            if selection == -1:                                             # <ESC>
+                return
+            elif selection in (-2, -3):                                     # <Left>|<Right>, containers or images
+                self.__images = selection == -3
+            elif menuItems[selection][1]:
+                self.__actions(*menuItems[selection][1:])
+
+    def Close(self):
+        self.__pool.stop()
+        self.__screen.clear()
+        self.__screen.close()
+
+    # Hosts status and merged containers|images list, called on each host update too
+    def __list(self):
+        self.__screen.label(Text=' Hosts', X=1, Y=1, Color=(bless.BLACK, bless.WHITE))
+        self.__screen.text(Text='Containers' if not self.__images else 'Images', X=10, Y=1, Color=(bless.CYAN, (1,1)))
+        for (index, host) in enumerate(self.__pool.hosts):
+            latency = '-' if host.latency is None else f'{host.latency*1000:.0f}ms'
+            status  = host.error or f'{len(host.containers())} containers, {len(host.images())} images'
+            line = f' {host.name[:24]:<24} {host.platform or "-":<8} {latency:>8}  {status}'
+            self.__screen.text(Text=line+' '*max(0, self.__screen.cols-len(line)-2), X=2, Y=3+index, Color=(bless.RED, (1,1)) if host.error else None)
+        width = max([len(host.name) for host in self.__pool.hosts] + [4])
+        if self.__images:
+            items = [(host, item, self.__imageLabel(item)) for (host, item) in self.__pool.images()]
+            header = f"{'HOST':<{width}}  {'IMAGE ID':<12}  {'SIZE Mb':>8}  REPOSITORY:TAG"
+        else:
+            items = [(host, item, self.__containerLabel(item)) for (host, item) in self.__pool.containers()]
+            header = f"{'HOST':<{width}}  {'UID':<12}  {'Status':<8}  {'Name':<24}  Image"
+        self.__screen.label(Text=header, X=3, Y=len(self.__pool.hosts)+4, Line=True)
+        menuItems = [(f'{host:<{width}}  {label}', host, item['Id'], name) for (host, item, (label, name)) in sorted(items, key=lambda item: (item[0], item[2][1]))]
+        return menuItems or [('No containers' if not self.__images else 'No images', '')]
+
+    @staticmethod
+    def __containerLabel(item):
+        names = item.get('Names') or [item['Id'][:12]]
+        name  = names[0] if isinstance(names, list) else names
+        return (f"{item['Id'][:12]:<12}  {str(item.get('State', '')):<8}  {name[:24]:<24}  {item.get('Image', '')}", name)
+
+    @staticmethod
+    def __imageLabel(item):
+        name = (item.get('Names') or ['<none>'])[0]
+        return (f"{item['Id'][:12]:<12}  {(item.get('Size') or 0)//1000000:>8}  {name}", name)
+
+    # Actions on a container (image) of a single [host]
+    def __actions(self, host, ID, name):
+        host = self.__pool.host(host)
+        if not host or not host.engine:
+            return
+        items = [(' Remove', 'imageRemove')] if self.__images else [(' Stop', 'stop'), (' Kill', 'kill'), (' Restart', 'restart'), (' Remove', 'remove')]
+        menu = self.__screen.menu(Color=COLOR, Items=items)
+        selection = menu.Display(Caption=f'[{host.name}] {name}'[:46], Footer='<ESC>.Cancel', ItemWidth=50, Lines=len(items)+2, X=10, Y=8)
+        if selection == -1:
+            return
+        (errorCode, output) = getattr(host.engine, items[selection][1])(ID)
+        if errorCode != 0:
+            self.__screen.messageBox(Title='E R R O R', Message=f'\n{self.__screen.textWrap(Text=output.strip(), Max=60)}\n', Footer=MSG_ANY_KEY, Color=(bless.WHITE, bless.RED))
+
+# argumentsParse() Command line options, argparse is not even imported without arguments (plain text UI startup)
+def argumentsParse(pathDefault=''):
+    defaults = {'path': pathDefault, 'socket': None, 'refresh': REFRESH_INTERVAL, 'cgroup': CGROUP_ROOT, 'interval': STATS_INTERVAL, 'hosts': None, 'remote': None,
+                'ssh': None, 'agent': False, 'daemon': False, 'daemonSocket': DAEMON_SOCKET, 'agentCommand': None, 'jobs': None, 'buildLogs': None, 'operation': []}
+    if len(sys.argv) <= 1:
+        return types.SimpleNamespace(**defaults)
+    import argparse
+    from forkliftlib.agent import AGENT_COMMAND
+    from forkliftlib.batch import BATCH_HELP
+    from forkliftlib.build import BUILD_JOBS, BUILD_LOGS
+    parser = argparse.ArgumentParser(description='Forklift: friendly utility for dealing with containers', epilog=BATCH_HELP, formatter_class=argparse.RawTextHelpFormatter)
+    parser.add_argument('-p', '--path',  dest='path',  default=pathDefault,  help=f"System and user configuration files path (default: {pathDefault})")
+    parser.add_argument('-s', '--socket', dest='socket', default=None,       help=f"Container engine API socket (default: autodetected, CLI when not available)")
+    parser.add_argument('-r', '--refresh', dest='refresh', default=REFRESH_INTERVAL, type=float, help=f"Background refresh interval in seconds, without engine events (default: {REFRESH_INTERVAL})")
+    parser.add_argument('-c', '--cgroup', dest='cgroup', default=CGROUP_ROOT, help=f"cgroup v2 root, source for the Stats tab (default: {CGROUP_ROOT})")
+    parser.add_argument('-i', '--interval', dest='interval', default=STATS_INTERVAL, type=float, help=f"Stats tab sampling interval in seconds (default: {STATS_INTERVAL})")
+    parser.add_argument('-H', '--hosts', dest='hosts', default=None, help="Multi-host dashboard, comma separated SSH hosts ([user@]host,...)")
+    parser.add_argument('-R', '--remote', dest='remote', default=None, help="Remote host ([user@]host), text UI here and forklift agent there (see --agent)")
+    parser.add_argument('--ssh', dest='ssh', default=None, help="Command used to reach --hosts|--remote, host name is appended (default: multiplexed ssh)")
+    parser.add_argument('--agent', dest='agent', action='store_true', help="Agent mode, state changes and actions as frames on stdin/stdout (used by --remote)")
+    parser.add_argument('--daemon', dest='daemon', action='store_true', help="Shared state daemon, forklift instances on this host attach to it (see --daemon-socket)")
+    parser.add_argument('--daemon-socket', dest='daemonSocket', metavar='DAEMON_SOCKET', default=DAEMON_SOCKET, help=f"Daemon UNIX socket, direct engine connection when it's not there (default: {DAEMON_SOCKET})")
+    parser.add_argument('--agent-command', dest='agentCommand', metavar='AGENT_COMMAND', default=AGENT_COMMAND, help=f"Agent command executed on --remote host (default: {AGENT_COMMAND})")
+    parser.add_argument('-j', '--jobs', dest='jobs', default=BUILD_JOBS, type=int, help=f"Max concurrent image builds, build pipeline (default: {BUILD_JOBS})")
+    parser.add_argument('--build-logs', dest='buildLogs', metavar='BUILD_LOGS', default=BUILD_LOGS, help=f"Build pipeline logs directory, one subdirectory for each run (default: {BUILD_LOGS})")
+    parser.add_argument('operation', nargs=argparse.REMAINDER, help="Headless operation and its arguments, see below (text UI when not set)")
+    return parser.parse_args()
+
 def main():                             # Entry point for the package (when installed from pip)
     pathDefault = os.path.dirname(os.path.realpath(__file__+os.path.sep+'..' if __file__.endswith('__main__.py') else __file__))
-    parser = argparse.ArgumentParser(description='Forklift: friendly utility for dealing with containers', epilog=f" ", formatter_class=argparse.RawTextHelpFormatter)
-    parser.add_argument('-p', '--path',  dest='path',  default=pathDefault,  help=f"System and user configuration files path (default: {pathDefault})")
-    argument = parser.parse_args()
-    App = ForkliftSystem(path=argument.path)
+    argument = argumentsParse(pathDefault)
+    if argument.operation:                                          # Headless mode, no UI
+        import json
+        from forkliftlib.batch import BatchSession
+        container = Container(path=argument.path, socket=argument.socket)
+        if not container.valid:
+            print(json.dumps({'op': argument.operation[0], 'id': None, 'rc': -1, 'message': 'Cannot detect container engine'}))
+            sys.exit(1)
+        session = BatchSession(container=container, jobs=argument.jobs, logs=argument.buildLogs)
+        session.execute(argument.operation)
+        container.close()
+        sys.exit(1 if session.errors else 0)
+    if argument.agent:                                              # Agent mode, no UI: frames on stdin/stdout
+        from forkliftlib.agent    import AgentServer
+        from forkliftlib.protocol import frameEncode
+        container = Container(path=argument.path, socket=argument.socket)
+        if not container.valid:
+            sys.stdout.buffer.write(frameEncode({'t': 'hello', 'error': 'Cannot detect container engine'}))
+            sys.exit(1)
+        agent = AgentServer(engine=container.backend, state=container.watch(interval=argument.refresh))
+        agent.serve(input=sys.stdin.buffer, output=sys.stdout.buffer)
+        agent.close()
+        container.close()
+        return
+    if argument.daemon:                                             # Daemon mode, no UI: agent for many clients on a UNIX socket
+        from forkliftlib.agent  import AgentServer
+        from forkliftlib.daemon import daemonRun
+        container = Container(path=argument.path, socket=argument.socket)
+        if not container.valid:
+            print('Cannot detect container engine')
+            sys.exit(1)
+        agent = AgentServer(engine=container.backend, state=container.watch(interval=argument.refresh))
+        (errorCode, output) = daemonRun(agent=agent, path=argument.daemonSocket)
+        agent.close()
+        container.close()
+        if errorCode != 0:
+            print(output)
+            sys.exit(1)
+        return
+    if argument.hosts:
+        App = ForkliftHosts(hosts=[host.strip() for host in argument.hosts.split(',') if host.strip()], ssh=argument.ssh, refresh=argument.refresh)
+        App.Run()
+        App.Close()
+        return
+    engine = None
+    if argument.remote:                                             # Remote engine through its agent, single ssh session
+        from forkliftlib.agent import agentSpawn
+        from forkliftlib.hosts import sshCommand
+        ssh = argument.ssh or sshCommand()
+        engine = agentSpawn(command=f'{ssh} {argument.remote} {argument.agentCommand}', prefix=f'{ssh} -n {argument.remote}', terminal=f'{ssh} -t {argument.remote}')
+    elif not argument.socket and os.path.exists(argument.daemonSocket):     # Shared daemon when it's running, direct connection otherwise
+        from forkliftlib.daemon import daemonAttach
+        engine = daemonAttach(path=argument.daemonSocket)
+    App = ForkliftSystem(path=argument.path, socket=argument.socket, refresh=argument.refresh, cgroup=argument.cgroup, statsInterval=argument.interval, engine=engine,
+                         buildJobs=argument.jobs, buildLogs=argument.buildLogs)
     App.Run()
     App.Close()
 
@@ -0,0 +1,446 @@
+# -*- coding: utf-8 -*-
+#
+# @description      resident agent next to the engine, delta synchronized clients
+#
+# @author           Andrea Benini
+# @date             2026-10-17
+# @license          GNU Affero General Public License v3.0
+# @see              AgentServer runs where the engine is (forklift --agent), it keeps containers and
+#                   images in its StateStore and pushes only their changes to clients, engine actions
+#                   requested by clients are executed there. EngineAgent is the client side: an engine
+#                   backend for Container whose state is a local mirror, the text UI is painted locally
+#                   and only state changes cross the link (one ssh session, see forkliftlib.protocol)
+#
+# pyright: reportMissingImports=false
+#
+import tempfile
+import threading
+import subprocess
+import concurrent.futures
+
+from forkliftlib.bulk      import bulkRun, BULK_WORKERS
+from forkliftlib.container import BULK_ACTIONS
+from forkliftlib.engine    import EngineCLI
+from forkliftlib.protocol  import frameEncode, frameRead, itemsDelta, PROTOCOL_VERSION
+
+
+AGENT_COMMAND = 'forklift --agent'      # Remote command started by the client, through ssh
+AGENT_TIMEOUT = 30                      # Seconds, max wait for the agent first state
+AGENT_CALL_TIMEOUT = 120                # Seconds, max wait for a single engine action
+AGENT_PLATFORMS = ['podman', 'docker']  # Runtimes an agent may report, they're run in user commands
+# Engine methods clients can call
+AGENT_CALLS = ['stop', 'kill', 'rename', 'remove', 'restart', 'batch', 'imageTag', 'imageRemove', 'inspect',
+               'imageLayers', 'imageHistory', 'containersSize', 'volumes', 'volumeRemove']
+
+
+# Single client connection, frames are written atomically from any thread
+class _AgentSession(object):
+    __slots__ = ('output', 'closer', 'lock', 'alive')
+    def __init__(self, output=None, closer=None):
+        self.output = output
+        self.closer = closer
+        self.lock   = threading.Lock()
+        self.alive  = True
+
+    def send(self, frame=b''):
+        with self.lock:
+            if not self.alive:
+                return
+            try:
+                self.output.write(frame)
+                self.output.flush()
+            except (OSError, ValueError):
+                self.alive = False
+                if self.closer:                                 # Reader is waiting for this client too
+                    self.closer()
+
+
+class AgentServer(object):
+    # @param engine  (EngineSocket|EngineCLI) Engine executing clients actions
+    # @param state   (StateStore) Containers and images source, its changes are pushed to clients
+    # @param workers (int) Max concurrent engine actions
+    def __init__(self, engine=None, state=None, workers=BULK_WORKERS):
+        self.__engine     = engine
+        self.__state      = state
+        self.__workers    = workers
+        self.__lock       = threading.Lock()
+        self.__sessions   = []
+        self.__containers = {}          # State already sent to clients, deltas are computed against it
+        self.__images     = {}
+        self.__pool       = concurrent.futures.ThreadPoolExecutor(max_workers=workers, thread_name_prefix='forklift-agent')
+        self.__publish()
+        state.listenerAdd(self.__publish)
+
+    @property
+    def sessions(self):
+        return len(self.__sessions)
+
+    # serve() Single client on [input]/[output] (binary file objects), blocks until the client goes away
+    # @param closer (callable) [optional] Drops the client connection when it cannot keep up with writes
+    def serve(self, input=None, output=None, closer=None):
+        session = _AgentSession(output=output, closer=closer)
+        with self.__lock:                                   # Snapshot and registration are atomic, next deltas follow it
+            session.send(frameEncode({'t': 'hello', 'v': PROTOCOL_VERSION, 'platform': self.__engine.platform, 'engine': self.__engine.name}))
+            session.send(frameEncode({'t': 'snap', 'c': list(self.__containers.values()), 'i': list(self.__images.values())}))
+            self.__sessions.append(session)
+        try:
+            while session.alive:
+                message = frameRead(input)
+                if message is None:
+                    break
+                if message.get('t') == 'call':
+                    self.__pool.submit(self.__call, session, message)
+        except (OSError, ValueError):
+            pass
+        finally:
+            with self.__lock:
+                self.__sessions.remove(session)
+
+    def close(self):
+        self.__pool.shutdown(wait=False)
+
+    def __call(self, session, message):
+        method = message.get('m')
+        try:
+            if method == 'batch' and not hasattr(self.__engine, 'batch'):
+                result = self.__batch(**(message.get('a') or {}))
+            elif method not in AGENT_CALLS or not hasattr(self.__engine, method):
+                result = (-1, f'Unsupported action: {method}')
+            else:
+                result = getattr(self.__engine, method)(**(message.get('a') or {}))
+        except Exception as E:
+            result = (-1, str(E))
+        session.send(frameEncode({'t': 'ret', 'n': message.get('n'), 'r': result}))
+
+    # Batch calls on engines without batch() (API socket): one engine call for each item, concurrently
+    def __batch(self, action='', IDs=[]):
+        methods = {command: method for (method, command) in BULK_ACTIONS.values()}
+        if action not in methods or not hasattr(self.__engine, methods[action]):
+            return (-1, f'Unsupported action: batch {action}')
+        engineMethod = getattr(self.__engine, methods[action])
+        (results, _) = bulkRun(function=lambda ID: engineMethod(ID), items=IDs, workers=self.__workers)
+        return [(result.returnCode, result.message) for result in results]
+
+    # Changes since the last publication, a single frame encoded once for all clients
+    def __publish(self):
+        with self.__lock:
+            containers = {item['Id']: item for item in self.__state.containers()}
+            images     = {item['Id']: item for item in self.__state.images()}
+            (containersChanged, containersRemoved) = itemsDelta(self.__containers, containers)
+            (imagesChanged, imagesRemoved)         = itemsDelta(self.__images, images)
+            if not (containersChanged or containersRemoved or imagesChanged or imagesRemoved):
+                return
+            (self.__containers, self.__images) = (containers, images)
+            message = {'t': 'delta'}
+            for (key, value) in (('c', containersChanged), ('cd', containersRemoved), ('i', imagesChanged), ('id', imagesRemoved)):
+                if value:
+                    message[key] = value
+            frame = frameEncode(message)
+            sessions = list(self.__sessions)
+        for session in sessions:
+            session.send(frame)
+
+
+# Local mirror of the agent state, same interface of StateStore (Container.watch() uses it as it is)
+class AgentState(object):
+    def __init__(self):
+        self.__lock       = threading.Lock()
+        self.__containers = {}
+        self.__images     = {}
+        self.__listeners  = []
+        self.__watchers   = []
+        self.__ready      = False
+        self.__live       = False
+
+    @property
+    def live(self):
+        return self.__live
+    @property
+    def ready(self):
+        return self.__ready
+
+    def start(self):                    # Followed by EngineAgent already
+        pass
+    def stop(self):
+        pass
+    def resync(self):
+        return self.__live
+
+    def listenerAdd(self, callback=None):
+        if callback:
+            self.__listeners.append(callback)
+
+    # eventListenerAdd() Same as StateStore.eventListenerAdd(), containers in agent deltas are the events here
+    def eventListenerAdd(self, callback=None):
+        if callback:
+            self.__watchers.append(callback)
+
+    def containers(self):
+        with self.__lock:
+            return list(self.__containers.values())
+
+    def images(self):
+        with self.__lock:
+            return list(self.__images.values())
+
+    def container(self, ID=''):
+        with self.__lock:
+            return self.__containers.get(ID)
+
+    def image(self, ID=''):
+        with self.__lock:
+            return self.__images.get(ID)
+
+    # apply() State message (snap|delta) from the agent
+    def apply(self, message={}):
+        with self.__lock:
+            if message['t'] == 'snap':
+                self.__containers = {item['Id']: item for item in message.get('c', [])}
+                self.__images     = {item['Id']: item for item in message.get('i', [])}
+            else:
+                self.__containers.update({item['Id']: item for item in message.get('c', [])})
+                self.__images.update({item['Id']: item for item in message.get('i', [])})
+                for ID in message.get('cd', []):
+                    self.__containers.pop(ID, None)
+                for ID in message.get('id', []):
+                    self.__images.pop(ID, None)
+        (self.__ready, self.__live) = (True, True)
+        if message['t'] == 'snap':
+            self.__event(None, None)
+        else:
+            for ID in [item['Id'] for item in message.get('c', [])] + message.get('cd', []):
+                self.__event('container', ID)
+        self.__notify()
+
+    # disconnected() Agent is gone, last known state is kept
+    def disconnected(self):
+        self.__live = False
+        self.__event(None, None)
+        self.__notify()
+
+    def __notify(self):
+        for callback in self.__listeners:
+            callback()
+
+    def __event(self, itemType, ID):
+        for callback in self.__watchers:
+            callback(itemType, ID)
+
+
+# Engine backend talking with an agent, same interface of EngineSocket|EngineCLI
+class EngineAgent(object):
+    # @param input    (file) Binary stream with agent messages
+    # @param output   (file) Binary stream for calls
+    # @param closer   (callable) Drops the connection
+    # @param prefix   (string) [optional] Command prefix reaching the agent host (logs are streamed through it),
+    #                 empty string when the agent is on this host (logs from the local runtime)
+    # @param terminal (string) [optional] Same as [prefix], interactive commands (attach, start -ai, ...)
+    # @param errors   (file) [optional] Agent diagnostics, last line is the error reported when it doesn't start
+    # @param kind     (string) Backend name, agent or daemon
+    def __init__(self, input=None, output=None, closer=None, prefix=None, terminal=None, errors=None, kind='agent'):
+        self.__input    = input
+        self.__output   = output
+        self.__closer   = closer
+        self.__prefix   = prefix
+        self.__terminal = terminal
+        self.__errors   = errors
+        self.__kind     = kind
+        self.__platform = None
+        self.__remote   = None
+        self.__error    = ''
+        self.__logs     = None
+        self.__state    = AgentState()
+        self.__lock     = threading.Lock()
+        self.__sequence = 0
+        self.__pending  = {}            # Sequence -> [threading.Event, result]
+        self.__started  = threading.Event()
+        self.__thread   = None
+
+    @property
+    def name(self):
+        return f'{self.__kind}, {self.__remote}' if self.__remote else self.__kind
+    @property
+    def platform(self):
+        return self.__platform
+    @property
+    def valid(self):
+        return self.__platform is not None and self.__state.ready
+    @property
+    def error(self):
+        return self.__error
+    @property
+    def state(self):                    # AgentState, used by Container.watch()
+        return self.__state
+    @property
+    def terminal(self):                 # Command prefix reaching the runtime host for interactive commands, None on this host
+        return self.__terminal
+    @property
+    def runtime(self):                  # Runtime command for interactive commands
+        return f'{self.__terminal} {self.__platform}' if self.__terminal else self.__platform
+
+    # start() Follow the agent, blocks until its first state has been received
+    # @return (bool) True when the agent is up and running
+    def start(self, timeout=AGENT_TIMEOUT):
+        self.__thread = threading.Thread(target=self.__run, name='forklift-agent', daemon=True)
+        self.__thread.start()
+        if not self.__started.wait(timeout) and not self.__error:
+            self.__error = 'Agent is not answering'
+        if not self.valid:
+            self.close()
+            self.__error = self.__error or 'Agent closed the connection'
+            if self.__errors:
+                self.__errors.seek(0)
+                lines = self.__errors.read().decode('utf-8', errors='replace').strip().splitlines()
+                self.__error = lines[-1] if lines else self.__error
+        return self.valid
+
+    def close(self):
+        if self.__closer:
+            self.__closer()
+            self.__closer = None
+
+    def containers(self):
+        return (0, self.__state.containers()) if self.__state.ready else (-1, [])
+
+    def images(self):
+        return (0, self.__state.images()) if self.__state.ready else (-1, [])
+
+    def container(self, containerID=''):
+        return (0, self.__state.container(containerID))
+
+    def image(self, imageID=''):
+        return (0, self.__state.image(imageID))
+
+    def inspect(self, containerID=''):
+        return tuple(self.__call('inspect', containerID=containerID))
+
+    def events(self):                   # State is pushed by the agent, no events here
+        return None
+
+    def logs(self, containerID='', follow=False, tail=None, timestamps=False):
+        if not self.__logs:
+            return None
+        return self.__logs.logs(containerID=containerID, follow=follow, tail=tail, timestamps=timestamps)
+
+    def stop(self, containerID=''):
+        return tuple(self.__call('stop', containerID=containerID))
+
+    def kill(self, containerID=''):
+        return tuple(self.__call('kill', containerID=containerID))
+
+    def rename(self, containerID='', nameNew=''):
+        return tuple(self.__call('rename', containerID=containerID, nameNew=nameNew))
+
+    def remove(self, containerID=''):
+        return tuple(self.__call('remove', containerID=containerID))
+
+    def restart(self, containerID=''):
+        return tuple(self.__call('restart', containerID=containerID))
+
+    def batch(self, action='', IDs=[]):
+        result = self.__call('batch', action=action, IDs=IDs)
+        if result and isinstance(result[0], int):           # Call failed, same error for all items
+            return [tuple(result)] * len(IDs)
+        return [tuple(item) for item in result]
+
+    def imageTag(self, imageID='', imageName=''):
+        return tuple(self.__call('imageTag', imageID=imageID, imageName=imageName))
+
+    def imageRemove(self, imageID=''):
+        return tuple(self.__call('imageRemove', imageID=imageID))
+
+    # Storage analysis calls (see forkliftlib.storage), failed calls return their [empty] value as engines do
+    def __data(self, method, empty, **arguments):
+        (errorCode, data) = self.__call(method, **arguments)
+        return (errorCode, data) if isinstance(data, type(empty)) else (errorCode or -1, empty)
+
+    def imageLayers(self, IDs=[]):
+        return self.__data('imageLayers', {}, IDs=IDs)
+
+    def imageHistory(self, imageID=''):
+        return self.__data('imageHistory', [], imageID=imageID)
+
+    def containersSize(self):
+        return self.__data('containersSize', {})
+
+    # volumes() Mount points are on the agent host: they're left out for remote agents (no local directory is measured)
+    def volumes(self):
+        (errorCode, volumes) = self.__data('volumes', [])
+        if self.__terminal:
+            volumes = [dict(volume, Mountpoint='') for volume in volumes]
+        return (errorCode, volumes)
+
+    def volumeRemove(self, volumeName=''):
+        return tuple(self.__call('volumeRemove', volumeName=volumeName))
+
+    # Engine [method] executed by the agent, waits for its result
+    def __call(self, method, **arguments):
+        event = threading.Event()
+        with self.__lock:
+            self.__sequence += 1
+            sequence = self.__sequence
+            self.__pending[sequence] = [event, (-1, 'Agent disconnected')]
+            try:
+                self.__output.write(frameEncode({'t': 'call', 'n': sequence, 'm': method, 'a': arguments}))
+                self.__output.flush()
+            except (OSError, ValueError):
+                event.set()
+        answered = event.wait(AGENT_CALL_TIMEOUT)
+        with self.__lock:                                   # Reader thread walks pending calls when the agent is gone
+            result = self.__pending.pop(sequence)[1]
+        return result if answered else (-1, 'Agent is not answering')
+
+    def __run(self):
+        try:
+            while True:
+                message = frameRead(self.__input)
+                if message is None:
+                    break
+                kind = message.get('t')
+                if kind == 'ret':
+                    with self.__lock:
+                        pending = self.__pending.get(message.get('n'))
+                    if pending:
+                        pending[1] = message.get('r')
+                        pending[0].set()
+                elif kind in ('snap', 'delta'):
+                    self.__state.apply(message)
+                    self.__started.set()
+                elif kind == 'hello':
+                    if message.get('error'):
+                        self.__error = message['error']
+                        break
+                    if message.get('platform') not in AGENT_PLATFORMS:      # It's run in user commands, known runtimes only
+                        self.__error = f"Unsupported runtime: {message.get('platform')}"
+                        break
+                    self.__platform = message.get('platform')
+                    self.__remote   = message.get('engine')
+                    if self.__prefix is not None:
+                        self.__logs = EngineCLI(platform=self.__platform, prefix=self.__prefix or None)
+        except (OSError, ValueError) as E:
+            self.__error = str(E)
+        self.__started.set()
+        self.__state.disconnected()
+        with self.__lock:
+            for pending in self.__pending.values():
+                pending[0].set()
+
+
+# agentSpawn() Agent started by [command] (usually "ssh host forklift --agent"), messages on its stdin/stdout
+# @return EngineAgent, check its [valid] and [error]
+def agentSpawn(command='', prefix=None, terminal=None, timeout=AGENT_TIMEOUT):
+    errors  = tempfile.TemporaryFile()
+    process = subprocess.Popen("exec "+command, shell=True, stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=errors)
+    def closer():                                           # End of input first, the agent quits by itself
+        try:
+            process.stdin.close()
+        except OSError:
+            pass
+        process.terminate()
+        try:
+            process.wait(timeout=1)
+        except subprocess.TimeoutExpired:
+            process.kill()
+    engine = EngineAgent(input=process.stdout, output=process.stdin, closer=closer, prefix=prefix, terminal=terminal, errors=errors)
+    engine.start(timeout=timeout)
+    return engine
@@ -0,0 +1,107 @@
+# -*- coding: utf-8 -*-
+#
+# @description      asyncio Container API, concurrent engine calls
+#
+# @author           Andrea Benini
+# @date             2026-10-17
+# @license          GNU Affero General Public License v3.0
+# @see              Container operations as coroutines: callers gather as many of them as they like and at
+#                   most [limit] engine calls run at the same time (semaphore). Engine backends are blocking
+#                   (socket requests, runtime processes, agent round trips), each call runs in the loop default
+#                   executor: calls overlap and a batch of them takes the slowest one, not their sum. The sync
+#                   Container API is unchanged, its concurrent operations (first snapshot, containers details)
+#                   are thin wrappers running these coroutines through asyncio.run()
+#
+# pyright: reportMissingImports=false
+#
+import time
+import asyncio
+
+from forkliftlib.bulk    import BulkResult, BULK_WORKERS
+from forkliftlib.records import containerRecords, imageRecords
+
+
+ASYNC_LIMIT = BULK_WORKERS              # Max concurrent engine calls, same bound of bulk actions
+
+
+class AsyncContainer(object):
+    # @param engine (object) Engine backend (Container.backend)
+    # @param limit  (int) Max concurrent engine calls
+    def __init__(self, engine=None, limit=ASYNC_LIMIT):
+        self.__engine    = engine
+        self.__limit     = max(1, limit)
+        self.__semaphore = None
+        self.__loop      = None
+
+    # Semaphore of the running loop, each asyncio.run() has a loop of its own
+    def __gate(self):
+        loop = asyncio.get_running_loop()
+        if self.__loop is not loop:
+            (self.__semaphore, self.__loop) = (asyncio.Semaphore(self.__limit), loop)
+        return self.__semaphore
+
+    # call() Engine [method] with its [arguments], in a worker thread as soon as a slot is free
+    # @return Engine method result, (returnCode, ...) tuples
+    async def call(self, method='', *arguments, **keywords):
+        async with self.__gate():
+            return await asyncio.to_thread(getattr(self.__engine, method), *arguments, **keywords)
+
+    # gather() Run [coroutines] concurrently
+    # @return (list) Results in the same order
+    async def gather(self, *coroutines):
+        return list(await asyncio.gather(*coroutines))
+
+    # Containers and images as they come from the engine (ps|images --format=json layout)
+    # @return (int, list) [returnCode, items]
+    async def containersRaw(self):
+        return await self.call('containers')
+    async def imagesRaw(self):
+        return await self.call('images')
+
+    # List() Containers list rows, see Container.List()
+    async def List(self):
+        (errorCode, items) = await self.containersRaw()
+        return containerRecords(items) if errorCode == 0 else []
+
+    # imagesList() Images list rows, see Container.imagesList()
+    async def imagesList(self):
+        (errorCode, items) = await self.imagesRaw()
+        return imageRecords(items) if errorCode == 0 else []
+
+    # inspect() Container details ("inspect" output)
+    # @return (int, dict|None) [returnCode, details (None when it does not exist anymore)]
+    async def inspect(self, containerID=''):
+        return await self.call('inspect', containerID=containerID)
+
+    # inspectMany() Details of all containers in [IDs], concurrently
+    # @return (dict) {ID: details}, missing and failed ones are left out
+    async def inspectMany(self, IDs=[]):
+        results = await asyncio.gather(*[self.inspect(ID) for ID in IDs], return_exceptions=True)
+        return {ID: result[1] for (ID, result) in zip(IDs, results) if isinstance(result, tuple) and result[0] == 0 and result[1]}
+
+    # Bulk() [action] (see forkliftlib.container.BULK_ACTIONS) on all [IDs], one concurrent engine call for each of them
+    # @return (list, float) [BulkResult list in the same order of [IDs], total elapsed seconds]
+    async def Bulk(self, action='stop', IDs=[]):
+        from forkliftlib.container import BULK_ACTIONS
+        method = BULK_ACTIONS[action][0]
+        async def single(ID):
+            timeStart = time.monotonic()
+            try:
+                (returnCode, message) = await self.call(method, ID)
+            except Exception as E:
+                (returnCode, message) = (-1, str(E))
+            return BulkResult(item=ID, returnCode=returnCode, message=str(message).strip(), elapsed=time.monotonic()-timeStart)
+        timeStart = time.monotonic()
+        results = await asyncio.gather(*[single(ID) for ID in IDs])
+        return (list(results), time.monotonic()-timeStart)
+
+
+# engineGather() Sync wrapper, engine [calls] ([(method, {arguments})]) at the same time
+# @return (list) Results in the same order of [calls]
+def engineGather(engine=None, calls=[], limit=ASYNC_LIMIT):
+    client = AsyncContainer(engine=engine, limit=limit)
+    return asyncio.run(client.gather(*[client.call(method, **arguments) for (method, arguments) in calls]))
+
+# inspectGather() Sync wrapper, details of all containers in [IDs] (see AsyncContainer.inspectMany())
+def inspectGather(engine=None, IDs=[], limit=ASYNC_LIMIT):
+    return asyncio.run(AsyncContainer(engine=engine, limit=limit).inspectMany(IDs))
@@ -0,0 +1,202 @@
+# -*- coding: utf-8 -*-
+#
+# @description      headless mode, operations executed without the text UI
+#
+# @author           Andrea Benini
+# @date             2026-10-17
+# @license          GNU Affero General Public License v3.0
+# @see              Operations are given on the command line (forklift stop ID...) or read from stdin,
+#                   one for each line (forklift batch), results are written as JSON lines on stdout.
+#                   All operations share the same Container, engine detection and connection are made
+#                   only once for each invocation
+#
+# pyright: reportMissingImports=false
+#
+import sys
+import json
+import time
+import shlex
+import subprocess
+
+from forkliftlib.engine import shellExec
+
+
+BATCH_HELP = """headless operations (JSON lines output, no text UI):
+  list [containers|images]          containers (default) or images
+  stop|kill|restart|rm|rmi ID...    same action on many containers (images for rmi)
+  rename ID NAME                    rename a container
+  inspect ID...                     containers details ("inspect" output), fetched concurrently
+  profiles                          containers.yaml and images.yaml profiles
+  build-profile NAME...             build images from images.yaml profiles
+  build [--force] [NAME...]         build all (or NAME...) images.yaml profiles in FROM dependency order,
+                                    independent ones concurrently (--jobs), logs in --build-logs.
+                                    Images with the same content hash are skipped, unless --force
+  run-profile NAME...               create containers from containers.yaml profiles
+  storage                           images shared and unique bytes (layers accounting), reclaimable items
+  batch                             operations from stdin, one for each line (# comments)"""
+
+# Bulk operations: operation -> Container.Bulk() action
+BATCH_BULK = {
+    'stop':     'stop',
+    'kill':     'kill',
+    'restart':  'restart',
+    'rm':       'remove',
+    'rmi':      'rmi',
+}
+
+
+class BatchSession(object):
+    # @param container (Container) Engine session shared by all operations
+    # @param output    (file) JSON lines destination
+    # @param jobs      (int)  [optional] Max concurrent builds (build operation)
+    # @param logs      (str)  [optional] Build logs directory (build operation)
+    def __init__(self, container=None, output=sys.stdout, jobs=None, logs=None):
+        self.__container = container
+        self.__output    = output
+        self.__errors    = 0
+        self.__jobs      = jobs
+        self.__logs      = logs
+
+    # Operations failed so far
+    @property
+    def errors(self):
+        return self.__errors
+
+    # execute() Single operation
+    # @param arguments (list) Operation and its arguments: ['stop', 'ID1', 'ID2']
+    def execute(self, arguments=[]):
+        if not arguments:
+            return
+        (operation, parameters) = (arguments[0], arguments[1:])
+        if operation == 'list':
+            self.__list(operation, parameters)
+        elif operation in BATCH_BULK:
+            self.__bulk(operation, parameters)
+        elif operation == 'rename' and len(parameters) == 2:
+            timeStart = time.monotonic()
+            output = self.__container.Rename(containerID=parameters[0], nameNew=parameters[1])
+            self.__result(operation, parameters[0], -1 if output else 0, output, time.monotonic()-timeStart)
+        elif operation == 'inspect' and parameters:
+            self.__inspect(operation, parameters)
+        elif operation == 'profiles':
+            for (name, command) in self.__container.containerProfilesList():
+                self.__emit({'op': operation, 'type': 'container', 'name': name, 'command': command})
+            for (name, command) in self.__container.imageProfilesList():
+                self.__emit({'op': operation, 'type': 'image', 'name': name, 'command': command})
+        elif operation in ('build-profile', 'run-profile'):
+            self.__profile(operation, parameters)
+        elif operation == 'build':
+            self.__build(operation, parameters)
+        elif operation == 'storage':
+            self.__storage(operation)
+        elif operation == 'batch':
+            self.run(sys.stdin)
+        else:
+            self.__result(operation, None, -1, f'Unknown operation or wrong arguments: {shlex.join(arguments)}')
+
+    # run() Operations from [lines], one for each line with shell like quoting. Empty lines and comments are skipped
+    def run(self, lines=[]):
+        for line in lines:
+            try:
+                arguments = shlex.split(line, comments=True)
+            except ValueError as E:
+                self.__result('parse', None, -1, f'{str(E)}: {line.strip()}')
+                continue
+            if arguments and arguments[0] != 'batch':
+                self.execute(arguments)
+
+    def __list(self, operation, parameters):
+        kind = parameters[0] if parameters else 'containers'
+        if kind not in ('containers', 'images'):
+            self.__result(operation, None, -1, f'Unknown list: {kind}')
+            return
+        (errorCode, items) = self.__container.containersRaw() if kind == 'containers' else self.__container.imagesRaw()
+        if errorCode != 0:
+            self.__result(operation, None, errorCode, str(items))
+            return
+        for item in items:
+            self.__emit({'op': operation, 'type': kind[:-1], **item})
+
+    def __bulk(self, operation, IDs):
+        if not IDs:
+            self.__result(operation, None, -1, 'No items')
+            return
+        (results, _) = self.__container.Bulk(action=BATCH_BULK[operation], IDs=IDs)
+        for result in results:
+            self.__result(operation, result.item, result.returnCode, result.message, result.elapsed)
+
+    def __inspect(self, operation, IDs):
+        timeStart = time.monotonic()
+        details = self.__container.InspectMany(IDs=IDs)
+        elapsed = time.monotonic()-timeStart
+        for ID in IDs:
+            if ID in details:
+                self.__result(operation, ID, 0, elapsed=elapsed, inspect=details[ID])
+            else:
+                self.__result(operation, ID, -1, f'No such container: {ID}', elapsed)
+
+    def __profile(self, operation, names):
+        profiles = dict(self.__container.imageProfilesList() if operation == 'build-profile' else self.__container.containerProfilesList())
+        if not names:
+            self.__result(operation, None, -1, 'No profiles')
+        for name in names:
+            if name not in profiles:
+                self.__result(operation, name, -1, 'Unknown profile')
+                continue
+            timeStart = time.monotonic()
+            (errorCode, output) = shellExec(f'( {profiles[name]} ) </dev/null', stderr=subprocess.STDOUT)     # stdin might be the operations list
+            self.__result(operation, name, errorCode, output, time.monotonic()-timeStart)
+
+    # Profiles built by the pipeline, one result for each of them in completion order and a final summary
+    def __build(self, operation, names):
+        from forkliftlib.build     import buildGraph, BuildPipeline, BUILD_JOBS, BUILD_LOGS
+        from forkliftlib.buildhash import profileHashes, DigestCache
+        force = '--force' in names
+        names = [name for name in names if name != '--force']
+        profiles = list(self.__container.imageProfilesList())
+        for name in names:
+            if name not in dict(profiles):
+                self.__result(operation, name, -1, 'Unknown profile')
+        selected = [(name, command) for (name, command) in profiles if not names or name in names]
+        if not selected:
+            self.__result(operation, None, -1, 'No profiles')
+            return
+        graph = buildGraph(selected)
+        cache = DigestCache(self.__container.path)
+        profileHashes(graph, cache=cache)
+        cache.save()
+        pipeline = BuildPipeline(profiles=graph, jobs=self.__jobs or BUILD_JOBS, logs=self.__logs or BUILD_LOGS, labels=None if force else self.__container.imageLabels)
+        pipeline.start()
+        pipeline.wait()
+        errors = 0
+        for job in sorted(pipeline.jobs, key=lambda job: (job.started is None, (job.started or 0)+job.elapsed)):
+            errors += 0 if job.built else 1
+            self.__result(operation, job.name, 0 if job.built else (job.returnCode or -1), job.message, job.elapsed, status=job.status, log=job.log if job.started else None)
+        self.__emit({'op': operation, 'id': None, 'rc': 1 if errors else 0, 'message': f'{len(pipeline.jobs)} images, {errors} errors', 'elapsed': round(pipeline.elapsed, 3), 'logs': pipeline.path})
+
+    # Storage analyzer report: one record for each image, one for each reclaimable item and a summary
+    def __storage(self, operation):
+        (errorCode, report) = self.__container.Storage()
+        if errorCode != 0:
+            self.__result(operation, None, errorCode, report)
+            return
+        for image in report.images:
+            self.__emit({'op': operation, 'type': 'image', 'id': image.ID, 'name': image.name, 'size': image.size, 'shared': image.shared,
+                         'unique': image.unique, 'layers': len(image.layers), 'containers': len(image.containers)})
+        for item in report.reclaimable:
+            self.__emit({'op': operation, 'type': 'reclaimable', 'kind': item.kind, 'id': item.ID, 'name': item.name, 'size': item.size, 'note': item.note})
+        self.__emit({'op': operation, 'id': None, 'rc': 0, 'images': len(report.images), 'layers': len(report.layers), 'disk': report.disk, 'virtual': report.virtual,
+                     'shared': report.shared, 'reclaimable': report.total(), 'estimated': report.estimated, 'elapsed': round(report.elapsed, 3)})
+
+    def __result(self, operation, item, returnCode, message='', elapsed=None, **fields):
+        if returnCode != 0:
+            self.__errors += 1
+        record = {'op': operation, 'id': item, 'rc': returnCode, 'message': str(message).strip()}
+        if elapsed is not None:
+            record['elapsed'] = round(elapsed, 3)
+        record.update(fields)
+        self.__emit(record)
+
+    def __emit(self, record):
+        self.__output.write(json.dumps(record, separators=(',', ':'))+'\n')
+        self.__output.flush()
@@ -22,8 +22,11 @@ import os
 import sys
 import tty
 import math
-import shutil
+import time
+import codecs
 import termios
+import selectors
+import collections
 
 
 # Colors
@@ -37,6 +40,10 @@ CYAN            = (36,  46)
 WHITE           = (97, 107)
 GREY_LIGHT      = (37,  47)
 GREY_DARK       = (90,  40)
+PAGER_PREFIX    = [GREEN, YELLOW, CYAN, MAGENTA, RED, WHITE]     # Pager line prefixes (sources with many origins)
+
+# Empty screen cell: (character, color), None stands for terminal default colors
+CELL_BLANK      = (' ', None)
 
 # Keys
 KEY = {
@@ -72,6 +79,19 @@ KEY_REMAP = {       # KEY set remapping for specific terminals
         "END":          '\x1b[4~',
     }
 }
+ESCAPE_TIMEOUT  = 0.03                  # Seconds, a lone <esc> is a key when no sequence follows it in time
+PASTE_START     = '\x1b[200~'           # Bracketed paste markers
+PASTE_END       = '\x1b[201~'
+
+# Text pasted in the terminal, delivered as a single key
+class KeyPaste(str):
+    pass
+
+# Menu item formatted on demand, menus ask for [label] of visible rows only (and of all rows when filtering)
+# @see Subclasses provide: label (string), width (int, label length without formatting it), key (item identity)
+class MenuRecord(object):
+    __slots__ = ()
+
 def KEYname(key=None):
     for item in KEY:
         if KEY[item] == key:
@@ -82,6 +102,13 @@ def KEYname(key=None):
 class bless():
     def __init__(self, init=False):
         self.__cursor = True
+        self.__cursorTerminal = True    # Cursor visibility on the real terminal
+        self.__cursorPos      = None    # Cursor position requested with cursorMove(), applied on refresh()
+        self.__stats = {'frames': 0, 'bytes': 0, 'syscalls': 0, 'frameBytes': 0, 'frameSyscalls': 0}
+        (self.__wakeRead, self.__wakeWrite) = os.pipe()
+        os.set_blocking(self.__wakeRead,  False)
+        os.set_blocking(self.__wakeWrite, False)
+        self.__input = _input()
         self.__screenGetInfo()
         self.__screenKeyRemap()
         self.color(Foreground=WHITE, Background=BLACK)
@@ -90,11 +117,23 @@ class bless():
 
     # Getting screen information
     def __screenGetInfo(self):
-        terminal = shutil.get_terminal_size()
+        (self.__X, self.__Y) = self.__screenSize()
         self.__posX = self.__posY = 1
-        self.__X    = terminal.columns
-        self.__Y    = terminal.lines
         self.__term = os.environ.get("TERM")
+        self.__frameInit()
+    # Terminal size like shutil.get_terminal_size() (not imported, it's not cheap at startup): $COLUMNS and $LINES first
+    @staticmethod
+    def __screenSize():
+        try:
+            (columns, lines) = os.get_terminal_size(sys.__stdout__.fileno())
+        except (AttributeError, ValueError, OSError):
+            (columns, lines) = (80, 24)
+        try:
+            columns = int(os.environ['COLUMNS']) if int(os.environ.get('COLUMNS', 0)) > 0 else columns
+            lines   = int(os.environ['LINES'])   if int(os.environ.get('LINES', 0)) > 0   else lines
+        except ValueError:
+            pass
+        return (columns or 80, lines or 24)
     # Remap keys when dealing with different $TERM terminals
     def __screenKeyRemap(self):
         for term in KEY_REMAP:
@@ -110,27 +149,99 @@ class bless():
     def clear(self, cursorHide=False):        # Clear screen and cursor at [1:1]
         if cursorHide:
             self.cursorHide()
-        print("\033[2J\033[H", end='')
+        self.__back = [[CELL_BLANK]*self.__X for _ in range(0, self.__Y)]
+        self.__dirty.update(range(0, self.__Y))
+        self.__cursorPos = None
     # Close screen
     def close(self):
         if not self.cursorVisible():
             self.clear()
+            self.__frontValid = False
             self.cursorShow()
+        self.refresh()
+        self.__inputStop()
     # Class context manager (destructor-like method)
     def __exit__(self, exc_type, exc_value, traceback):
         self.close()
 
+    # Screen back buffer (where widgets draw) and front buffer (what the terminal is showing)
+    # Each cell is a (character, color) tuple, color is None for terminal default colors
+    def __frameInit(self):
+        self.__back       = [[CELL_BLANK]*self.__X for _ in range(0, self.__Y)]
+        self.__front      = [[CELL_BLANK]*self.__X for _ in range(0, self.__Y)]
+        self.__frontValid = False       # Unknown terminal content, screen is cleared on next refresh()
+        self.__dirty      = set(range(0, self.__Y))
+
+    # refresh() Send a frame to the terminal: only changed cells since last frame, single write()
     def refresh(self):
-        print("", end="", flush=True)
+        output = []
+        if not self.__frontValid:
+            output.append('\033[0m\033[2J\033[H')
+            self.__front = [[CELL_BLANK]*self.__X for _ in range(0, self.__Y)]
+            self.__frontValid = True
+        colorCurrent = None
+        (xCurrent, yCurrent) = (None, None)
+        for y in sorted(self.__dirty):
+            back  = self.__back[y]
+            front = self.__front[y]
+            if back == front:
+                continue
+            for x in range(0, self.__X):
+                cell = back[x]
+                if cell == front[x]:
+                    continue
+                if x != xCurrent or y != yCurrent:
+                    output.append(f'\033[{y+1};{x+1}H')
+                (character, color) = cell
+                if color != colorCurrent:       # SGR only when colors are really changing
+                    output.append('\033[0m' if color is None else f'\033[{color[0]};{color[1]}m')
+                    colorCurrent = color
+                output.append(character)
+                front[x] = cell
+                (xCurrent, yCurrent) = (x+1, y)
+        self.__dirty.clear()
+        if colorCurrent is not None:
+            output.append('\033[0m')
+        if self.__cursor != self.__cursorTerminal:
+            output.append('\033[?25h' if self.__cursor else '\033[?25l')
+            self.__cursorTerminal = self.__cursor
+        if self.__cursor and self.__cursorPos:
+            output.append(f'\033[{self.__cursorPos[1]};{self.__cursorPos[0]}H')
+        self.__write(''.join(output))
+
+    # Write [data] to the terminal, partial writes are completed
+    def __write(self, data=''):
+        data = data.encode()
+        self.__stats['frameBytes']    = len(data)
+        self.__stats['frameSyscalls'] = 0
+        if not data:
+            return
+        sys.stdout.flush()
+        fd = sys.stdout.fileno()
+        while data:
+            written = os.write(fd, data)
+            data = data[written:]
+            self.__stats['frameSyscalls'] += 1
+        self.__stats['frames']   += 1
+        self.__stats['bytes']    += self.__stats['frameBytes']
+        self.__stats['syscalls'] += self.__stats['frameSyscalls']
+
+    # Output counters: last frame (frameBytes, frameSyscalls) and totals (frames, bytes, syscalls)
+    @property
+    def stats(self):
+        return dict(self.__stats)
 
     # Pause/Restore system for external program exec()
     def pause(self):
         self.__cursorPause = self.cursorVisible()
-        self.clear()
-        self.cursorShow()
         self.refresh()
+        self.__inputStop()
+        self.__write('\033[0m\033[2J\033[H\033[?25h')
+        self.__cursor = self.__cursorTerminal = True
+        self.__frontValid = False
     def restore(self):
         self.clear()
+        self.__frontValid = False
         if not self.__cursorPause:
             self.cursorHide()
         self.refresh()
@@ -155,6 +266,7 @@ class bless():
     # keyGetSimple() Get a key from stdin, ANSI escape sequences are not properly detected, use keyGet() instead
     # @return (int) Pressed key, special keys are handled
     def keyGetSimple(self):
+        self.refresh()
         oldSettings = termios.tcgetattr(sys.stdin)
         tty.setcbreak(sys.stdin.fileno())
         try:
@@ -169,44 +281,47 @@ class bless():
             termios.tcsetattr(sys.stdin, termios.TCSADRAIN, oldSettings)
     
     # keyGet() Get key from stdin. Ordinary keys, F-Keys, Esc, cursor keys are fully tested and supported
-    # @see Special keys detection method, raw stream input, works on all *nix systems, don't care about win
-    def keyGet(self):
-        fd = sys.stdin.fileno()
-        oldSettings = termios.tcgetattr(fd)
+    # @param timeout (float) [optional] Max seconds to wait for a key, None waits forever
+    # @param wakeup  (bool)  Return as soon as another thread calls wakeup()
+    # @return (string|KeyPaste|None) Pressed key, pasted text, None on timeout or wakeup
+    # @see Raw mode is kept for the whole session (see _input), works on all *nix systems, don't care about win
+    def keyGet(self, timeout=None, wakeup=False):
+        self.refresh()
+        self.__inputStart()
+        return self.__input.get(timeout=timeout, wakeFd=self.__wakeRead if wakeup else None)
+
+    # keyPending() True when keys are already waiting to be read, screen updates might be delayed until they're consumed
+    def keyPending(self):
+        self.__inputStart()
+        return self.__input.pending()
+
+    # Terminal raw mode and bracketed paste, enabled on first key request until close() or pause()
+    def __inputStart(self):
+        if not self.__input.active:
+            self.__input.start()
+            self.__write('\033[?2004h')
+    def __inputStop(self):
+        if self.__input.active:
+            self.__write('\033[?2004l')
+            self.__input.stop()
+
+    # wakeup() Interrupt a pending keyGet(wakeup=True), safe to be called from any thread
+    def wakeup(self):
         try:
-            key = None
-            tty.setraw(fd)
-            key = sys.stdin.read(1)
-            if key == '\x1b':           # <esc> key or escape sequence
-                os.set_blocking(fd, False)
-                extraKey = sys.stdin.read(2)
-                isNumber = False
-                if len(extraKey) >= 2:
-                    key += extraKey
-                    isNumber = True if ord(extraKey[1]) >= 48 and ord(extraKey[1]) <= 57 else False     # \x1b[`1`..`9`
-                if isNumber:
-                    loopMax = 5         # Avoid possible loops or weird sequences without trailing '~'
-                    while extraKey != '~' and loopMax > 0:
-                        extraKey = sys.stdin.read(1)
-                        loopMax -= 1
-                        key += extraKey
-            return key
-        finally:
-            os.set_blocking(fd, True)
-            termios.tcsetattr(fd, termios.TCSADRAIN, oldSettings)
+            os.write(self.__wakeWrite, b'.')
+        except (BlockingIOError, OSError):
+            pass
 
     def cursorHide(self):
         self.__cursor = False
-        print("\033[?25l", end='')
     def cursorShow(self):
         self.__cursor = True
-        print("\033[?25h", end='')
     def cursorVisible(self):
         return self.__cursor
     def cursorMove(self, X=1, Y=1):
         if not X or not Y or X>self.cols or Y>self.rows:
             return
-        print(f"\033[{Y};{X}H", end='', flush=True)
+        self.__cursorPos = (X, Y)
 
     # @param Foreground (tuple) (foreground(),background()) Colors expressed in a tuple, 2nd param will be ignored
     # @param Background (tuple|None) Background color (from the above table)
@@ -249,13 +364,18 @@ class bless():
     # @param Color (tuple)  (Foreground|Background) color for the text
     #              (tuple,tuple) -> (Foreground(FOREGROUND,_), Background(_,BACKGROUND))  [example: (bless.WHITE, bless.BLUE)]
     #              (None)   Defaults colors to (self.__colorForeground, self.__colorBackground)
+    # @see Text is drawn in the screen back buffer, it reaches the terminal on next refresh() (or keyGet())
     def text(self, Text='', X=1, Y=1, Color=None):
-        Color = self.colorGet(Color=Color)
-        if X>self.cols or Y>self.rows:
+        Color = tuple(self.colorGet(Color=Color))
+        if X>self.cols or Y>self.rows or Y<1:
             return
         if X+len(Text) > self.cols+1:
             Text = Text[0 : self.cols-X-len(Text)+1]
-        print(f"\033[{Y};{X}H\033[{Color[0]};{Color[1]}m{Text}\033[0m", end='', flush=True)
+        if X < 1:
+            Text = Text[1-X:]
+            X = 1
+        self.__back[Y-1][X-1:X-1+len(Text)] = [(character, Color) for character in Text]
+        self.__dirty.add(Y-1)
 
     # Return a multiline string from a oneliner, word splitting
     def textWrap(self, Text='', Max=0):
@@ -478,6 +598,146 @@ class bless():
             Color = ((self.__colorForeground, self.__colorForeground2), (self.__colorBackground2, self.__colorBackground))
         return _menu(screen=self, Color=Color, Items=Items)
 
+    # pager() Full screen scrollable viewer, keys: arrows, <PAGE_UP|PAGE_DOWN>, <HOME|END>, </> search, <n|N> next/previous match
+    # @param Source (object) Lines provider (see forkliftlib.logview): first, len(), line(n), search(text, start, backward), done, follow
+    # @param Title  (string) Window title
+    def pager(self, Source=None, Title=None, Color=None):
+        if not Color:
+            Color = ((self.__colorForeground, self.__colorForeground2), (self.__colorBackground2, self.__colorBackground))
+        _pager(screen=self, Source=Source, Title=Title, Color=Color).Display()
+
+    # tree() Full screen collapsible tree of a JSON like document, keys: arrows (<LEFT|RIGHT> collapse, expand),
+    #        <SPACE|ENTER> expand|collapse, </> path search (NetworkSettings.Ports, Mounts[0].Source), <n|N> next/previous match
+    # @param Source (dict|list) Document, nodes are expanded on demand
+    # @param Title  (string) Window title
+    def tree(self, Source=None, Title=None, Color=None):
+        if not Color:
+            Color = ((self.__colorForeground, self.__colorForeground2), (self.__colorBackground2, self.__colorBackground))
+        _tree(screen=self, Source=Source, Title=Title, Color=Color).Display()
+
+
+# Session scoped terminal input: raw mode is set once, bytes are decoded incrementally (CSI, SS3 sequences,
+# bracketed paste) in a queue of keys, multiple keys read at once are delivered one by one without extra reads
+# @see Do NOT use this class directly, keys are available from bless.keyGet()
+class _input():
+    def __init__(self):
+        self.__fd       = None
+        self.__settings = None
+        self.__keys     = collections.deque()
+        self.__decoder  = codecs.getincrementaldecoder('utf-8')(errors='replace')
+        self.__state    = 'ground'      # ground, escape, csi, ss3, paste
+        self.__sequence = ''
+
+    @property
+    def active(self):
+        return self.__settings is not None
+
+    # Raw input mode, output post processing is left untouched
+    def start(self):
+        if self.__settings:
+            return
+        self.__fd = sys.stdin.fileno()
+        self.__settings = termios.tcgetattr(self.__fd)
+        tty.setraw(self.__fd)
+        mode = termios.tcgetattr(self.__fd)
+        mode[1] |= termios.OPOST
+        termios.tcsetattr(self.__fd, termios.TCSANOW, mode)
+    def stop(self):
+        if not self.__settings:
+            return
+        termios.tcsetattr(self.__fd, termios.TCSADRAIN, self.__settings)
+        self.__settings = None
+
+    # pending() Keys already available (queued or readable right now)
+    def pending(self):
+        if not self.__keys:
+            self.__fill(timeout=0)
+        return len(self.__keys) > 0
+
+    # get() Next key, waiting at most [timeout] seconds or until [wakeFd] is readable
+    # @return (string|KeyPaste|None) None on timeout or wakeup
+    def get(self, timeout=None, wakeFd=None):
+        timeLimit = None if timeout is None else time.monotonic()+timeout
+        while not self.__keys:
+            remaining = None if timeLimit is None else max(0, timeLimit-time.monotonic())
+            if not self.__fill(timeout=remaining, wakeFd=wakeFd):
+                return None
+        return self.__keys.popleft()
+
+    # Wait for input and decode everything available
+    # @return (bool) False on timeout or wakeup
+    def __fill(self, timeout=None, wakeFd=None):
+        if not self.__wait(timeout=timeout, wakeFd=wakeFd):
+            return False
+        self.__feed(os.read(self.__fd, 4096))
+        while self.__state in ['escape', 'csi', 'ss3']:         # Incomplete sequence or just an <esc> key
+            if not self.__wait(timeout=ESCAPE_TIMEOUT):
+                self.__flush()
+                break
+            self.__feed(os.read(self.__fd, 4096))
+        return True
+
+    # @return (bool) True when input is ready, [wakeFd] is drained when it wakes us up
+    def __wait(self, timeout=None, wakeFd=None):
+        with selectors.DefaultSelector() as selector:
+            selector.register(self.__fd, selectors.EVENT_READ)
+            if wakeFd is not None:
+                selector.register(wakeFd, selectors.EVENT_READ)
+            ready = [key.fd for (key, _) in selector.select(timeout)]
+        if self.__fd in ready:
+            return True
+        if wakeFd in ready:             # Multiple wakeups are coalesced in a single one
+            try:
+                while os.read(wakeFd, 512):
+                    pass
+            except BlockingIOError:
+                pass
+        return False
+
+    # Escape sequences state machine
+    def __feed(self, data=b''):
+        for character in self.__decoder.decode(data):
+            if self.__state == 'ground':
+                if character == '\x1b':
+                    (self.__state, self.__sequence) = ('escape', character)
+                else:
+                    self.__keys.append(character)
+            elif self.__state == 'escape':
+                if character == '[':
+                    (self.__state, self.__sequence) = ('csi', self.__sequence+character)
+                elif character == 'O':
+                    (self.__state, self.__sequence) = ('ss3', self.__sequence+character)
+                elif character == '\x1b':                       # <esc><esc>, first one is a key
+                    self.__keys.append(self.__sequence)
+                else:                                           # <alt>+key
+                    self.__keys.append(self.__sequence+character)
+                    self.__state = 'ground'
+            elif self.__state == 'csi':
+                self.__sequence += character
+                if '\x40' <= character <= '\x7e':               # Final byte
+                    if self.__sequence == PASTE_START:
+                        (self.__state, self.__sequence) = ('paste', '')
+                        continue
+                    self.__keys.append(self.__sequence)
+                    self.__state = 'ground'
+                elif not ('\x20' <= character <= '\x3f') or len(self.__sequence) > 16:    # Malformed
+                    self.__keys.append(self.__sequence)
+                    self.__state = 'ground'
+            elif self.__state == 'ss3':
+                self.__keys.append(self.__sequence+character)
+                self.__state = 'ground'
+            elif self.__state == 'paste':
+                self.__sequence += character
+                if character == '~' and self.__sequence.endswith(PASTE_END):
+                    self.__keys.append(KeyPaste(self.__sequence[:-len(PASTE_END)]))
+                    self.__state = 'ground'
+
+    # Timeout on an incomplete sequence: <esc> key followed by ordinary keys
+    def __flush(self):
+        self.__keys.append('\x1b')
+        self.__keys.extend(self.__sequence[1:])
+        self.__state = 'ground'
+
 
 # @see Do NOT use this class directly, use bless.menu() method as a wrapper instead
 class _menu():
@@ -486,7 +746,9 @@ class _menu():
             return None
         self.__screen   = screen
         self.__Colors   = Color
-        self.__selected = 0
+        self.__selected = 0             # Position in the view (filtered items)
+        self.__rows     = {}            # Row -> (text, color) currently on screen
+        self.__marked   = set()         # Marked items keys (multiple selection)
         del self.items
         if Items:
             self.items  = Items
@@ -497,59 +759,205 @@ class _menu():
     @items.setter
     def items(self, value):
         self.__items = value
+        self.__indexReset()
     @items.deleter
     def items(self):
         self.__items = []
+        self.__indexReset()
     def itemAdd(self, value):
         self.__items.append(value)
+        if self.__width is not None:
+            self.__width = max(self.__width, self.__elementWidth(value))
+        if self.__labels is not None:
+            self.__labels.append(self.__element(value).lower())
+        if self.__query:
+            self.__filter(self.__query, refine=False)
+    # Marked items (multiple selection), in the same order of the list
+    @property
+    def marked(self):
+        return [item for item in self.__items if self.__itemKey(item) in self.__marked]
+    # Mark/unmark a single item, items without a key (empty identity) cannot be marked
+    def __mark(self, item, value=None):
+        key = self.__itemKey(item)
+        if not key:
+            return
+        if value is None:
+            value = key not in self.__marked
+        if value:
+            self.__marked.add(key)
+        else:
+            self.__marked.discard(key)
+    # Ask for a text and mark all items containing it
+    def __markMatching(self, X, Y, Width):
+        Width = min(max(Width, 40), self.__screen.cols-X)
+        match = self.__screen.editBox(Title='Mark items matching', Footer='<ENTER>.Confirm <ESC>.Cancel', Size=Width-4, Width=Width, X=X, Y=Y, Color=self.__Colors)
+        for row in range(Y, Y+3):                       # editBox cleanup, menu rows are printed again
+            self.__screen.text(Text=' '*Width, X=X, Y=row, Color=self.__screen.colorGet(Color=self.__Colors))
+        self.__rows = {}
+        if match.value:
+            text   = match.value.lower()
+            labels = self.__labelsGet()
+            for index in self.__viewIndexes():
+                if text in labels[index]:
+                    self.__mark(self.__items[index], True)
 
     def __element(self, item):
-        if type(item) == tuple or type(item)==list:
+        if isinstance(item, MenuRecord):
+            return item.label
+        elif type(item) == tuple or type(item)==list:
             return str(item[0])
         elif type(item) == dict:
             return next(iter(item.items()))
         return item
+    def __elementWidth(self, item):
+        return item.width if isinstance(item, MenuRecord) else len(self.__element(item))
+
+    # Item identity, used for keeping the cursor on the same item when the list is refreshed
+    def __itemKey(self, item):
+        if isinstance(item, MenuRecord):
+            return item.key
+        if (type(item) == tuple or type(item)==list) and len(item) > 1:
+            return item[1]
+        return self.__element(item)
+
+    # Items derived data (width, lowercase labels, filtered view) is dropped when items change
+    def __indexReset(self):
+        self.__width  = None            # Longest label, computed once per items list
+        self.__labels = None            # Lowercase labels for the filter, built on first use
+        self.__query  = ''              # Current filter
+        self.__view   = None            # Items indexes matching the filter, None: all of them
+        self.__history = []             # [(query, view)] filter steps, <backspace> goes back without scanning again
+
+    def __labelsGet(self):
+        if self.__labels is None:
+            self.__labels = [self.__element(item).lower() for item in self.__items]
+        return self.__labels
+
+    # The view is the list of items indexes currently shown (all items or the filtered ones)
+    def __viewLength(self):
+        return len(self.__items) if self.__view is None else len(self.__view)
+    def __viewIndexes(self):
+        return range(0, len(self.__items)) if self.__view is None else self.__view
+    def __viewItem(self, position):
+        return self.__items[position if self.__view is None else self.__view[position]]
+
+    # Filter items with [query], every space separated term must be found in the label (any order, case insensitive).
+    # A query extending the previous one only scans the previous matches
+    def __filter(self, query, refine=True):
+        terms = query.lower().split()
+        if not terms:
+            (self.__query, self.__view, self.__history) = ('', None, [])
+            return
+        if refine and self.__query and query.startswith(self.__query):
+            self.__history.append((self.__query, self.__view))
+            candidates = self.__view
+        else:
+            self.__history = []
+            candidates = range(0, len(self.__items))
+        labels = self.__labelsGet()
+        for term in terms:
+            candidates = [index for index in candidates if term in labels[index]]
+        (self.__query, self.__view) = (query, candidates)
+
+    # Shorter query, back to a previous step when available
+    def __filterBack(self, query):
+        while self.__history and not query.startswith(self.__history[-1][0]):
+            self.__history.pop()
+        if self.__history and self.__history[-1][0] == query:
+            (self.__query, self.__view) = self.__history.pop()
+        else:
+            self.__filter(query, refine=False)
+
+    # Keep the cursor on [item] after the view changed, first item when it's gone
+    def __select(self, item):
+        self.__selected = 0
+        if item is None:
+            return
+        key = self.__itemKey(item)
+        for position, index in enumerate(self.__viewIndexes()):
+            if self.__itemKey(self.__items[index]) == key:
+                self.__selected = position
+                return
+
+    # Replace items with [items] keeping the cursor on the selected one (when it's still there)
+    def __itemsReplace(self, items):
+        selected = self.__viewItem(self.__selected) if self.__selected < self.__viewLength() else None
+        query = self.__query
+        self.items = items
+        if self.__marked:                               # Vanished items are not marked anymore
+            self.__marked &= {self.__itemKey(item) for item in items}
+        if query:
+            self.__filter(query, refine=False)
+        self.__select(selected)
 
     def __itemsCalculate(self):
-        width = 0
-        items = 0
-        for i in self.__items:
-            elementLength = len(self.__element(i))
-            if elementLength > width:
-                width = elementLength
-            items += 1
-        return (items, width)
-
-    def __displayItems(self, X, Y, Lines, ItemWidth, FirstItem):
+        if self.__width is None:
+            self.__width = max((self.__elementWidth(item) for item in self.__items), default=0)
+        return (len(self.__items), self.__width)
+
+    # Only the visible window is formatted, whatever the number of items is
+    def __displayItems(self, X, Y, Lines, ItemWidth, FirstItem, Multiple=False):
         # Detecting first item
         if FirstItem > self.__selected:                         # scroll up management
             FirstItem = self.__selected
         if FirstItem+Lines-1 < self.__selected:                 # scroll down management
-            FirstItem += 1
+            FirstItem = self.__selected-Lines+1
+        viewLength = self.__viewLength()
         # Display elements in a window
         for key in range(0, Lines):
-            color = self.__screen.colorGet(Color=self.__Colors)
-            if FirstItem+key < len(self.__items):               # Items to display
-                value = self.__items[FirstItem+key]
+            color  = self.__screen.colorGet(Color=self.__Colors)
+            marker = ' '
+            if FirstItem+key < viewLength:                      # Items to display
+                value = self.__viewItem(FirstItem+key)
                 element = self.__element(value)
                 element += (ItemWidth-len(element))*' '
                 element = element[:ItemWidth]
+                if Multiple and self.__itemKey(value) in self.__marked:
+                    marker = '*'
+                    color  = (YELLOW[0], color[1])
                 if FirstItem+key == self.__selected:
                     color = self.__screen.colorGetReversed(Color=self.__Colors)
-                self.__screen.text(Text=element, X=X, Y=Y+key, Color=color)
+                    if marker != ' ':
+                        color = (color[0], YELLOW[1])
             else:
-                self.__screen.text(Text=ItemWidth*' ', X=X, Y=Y+key, Color=color)
+                element = ItemWidth*' '
+            if self.__rows.get(Y+key) != (element, color, marker):     # Unchanged rows are not printed again
+                self.__rows[Y+key] = (element, color, marker)
+                if Multiple and X > 1:
+                    self.__screen.text(Text=marker, X=X-1, Y=Y+key, Color=(YELLOW[0], self.__screen.colorGet(Color=self.__Colors)[1]))
+                self.__screen.text(Text=element, X=X, Y=Y+key, Color=color)
         return FirstItem
 
+    # Bottom line: filter prompt while filtering, [Footer] otherwise
+    def __displayFooter(self, X, Footer, typing):
+        width = self.__screen.cols - X + 1
+        color = self.__screen.colorGet(Color=self.__Colors)
+        if typing or self.__query:
+            text = f" /{self.__query}{'_' if typing else ''}  [{self.__viewLength()}/{len(self.__items)}]  <ESC>.Clear filter "
+            color = (YELLOW[0], color[1])
+        else:
+            text = Footer or ''
+        if self.__rows.get('footer') != (text, color):
+            self.__rows['footer'] = (text, color)
+            self.__screen.text(Text=(text+' '*width)[:width], X=X, Y=self.__screen.rows, Color=color)
+
     def __navigate(self, n):
         self.__selected += n
+        if self.__selected >= self.__viewLength() - 1:
+            self.__selected = self.__viewLength() - 1
         if self.__selected < 0:
             self.__selected = 0
-        elif self.__selected >= len(self.__items) - 1:
-            self.__selected = len(self.__items) - 1
 
     # Display() Show the menu
-    def Display(self, X=1, Y=1, FirstItem=0, Caption=None, Footer=None, Lines=None, ItemWidth=None, Keys=[], freeKeys=[]):
+    # @param Footer   (str) Box footer, printed on the last screen row for menus without [Caption]
+    # @param Refresh  (callable) [optional] Background refresh, called when the screen is woken up (bless.wakeup()),
+    #                 returns the new items list (cursor is kept on the selected item) or None when nothing changed
+    # @param Multiple (bool) Multiple selection: <space> mark/unmark, <+> mark matching items, <-> unmark all.
+    #                 Marked items are available from the [marked] property once the menu is closed
+    # @param Filter   (bool) Type to filter, menus without [Caption] only: </> starts typing the filter (shown on the
+    #                 last screen row), <ENTER> stops typing, <ESC> clears it. Item indexes returned are always
+    #                 [items] indexes, not filtered positions
+    def Display(self, X=1, Y=1, FirstItem=0, Caption=None, Footer=None, Lines=None, ItemWidth=None, Keys=[], freeKeys=[], Refresh=None, Multiple=False, Filter=False):
         if not self.__items or len(self.__items) == 0:
             return -1
         (itemsNumber, itemsMaxWidth) = self.__itemsCalculate()
@@ -565,6 +973,7 @@ class _menu():
                 Lines = self.__screen.rows - Y
             else:
                 Lines = itemsNumber
+        Filter = Filter and not Caption
         # Menu Box, if any
         if Caption:
             self.__screen.box(Title=Caption, Footer=Footer, X=X, Y=Y, Width=ItemWidth, Height=Lines, Color=self.__Colors)
@@ -575,32 +984,342 @@ class _menu():
         # Init vars
         X = 0 if X<0 else X
         Y = 0 if Y<0 else Y
+        self.__filter('')
         self.__selected = FirstItem
+        self.__rows     = {}
+        typing          = False
         while True:
-            # Display elements
-            FirstItem = self.__displayItems(X, Y, Lines, ItemWidth, FirstItem)
+            # Display elements, skipped while keys are queued (held arrow keys, a single repaint)
+            if not self.__screen.keyPending():
+                FirstItem = self.__displayItems(X, Y, Lines, ItemWidth, FirstItem, Multiple=Multiple)
+                if Filter or (Footer and not Caption):
+                    self.__displayFooter(X, Footer, typing)
             # Cursor movement
-            key = self.__screen.keyGet()
-            if key == KEY['ENTER']:                             # Item Selection
-                return self.__selected
+            key = self.__screen.keyGet(wakeup=Refresh is not None)
+            if key is None:                                     # Background refresh
+                items = Refresh()
+                if items is not None and items != self.__items:
+                    self.__itemsReplace(items)
+                    if FirstItem > max(0, self.__viewLength()-Lines):
+                        FirstItem = max(0, self.__viewLength()-Lines)
+                if not self.__items:
+                    return -1
+            elif typing and key == KEY['BACKSPACE']:            # Filter, shorter query
+                selected = self.__viewItem(self.__selected) if self.__viewLength() else None
+                self.__filterBack(self.__query[:-1])
+                self.__select(selected)
+            elif typing and (isinstance(key, KeyPaste) or not key.startswith('\x1b')) and key != KEY['ENTER']:
+                self.__filter(self.__query + ''.join(' ' if character in '\r\n\t' else character for character in key))
+                (self.__selected, FirstItem) = (0, 0)
+            elif key == KEY['ESCAPE'] and (typing or self.__query): # Clear filter, back to the whole list
+                selected = self.__viewItem(self.__selected) if self.__viewLength() else None
+                self.__filter('')
+                self.__select(selected)
+                typing = False
+            elif Filter and key == '/':                         # Start typing the filter, labels index ready before the first key
+                typing = True
+                self.__labelsGet()
+            elif key == KEY['ENTER']:                           # Item Selection
+                if typing:
+                    typing = False
+                elif self.__viewLength():
+                    return self.__viewIndexes()[self.__selected]
             elif key == KEY['ESCAPE']:                          # Escape
                 return -1
             elif key == KEY['UP']:                              # Cursor UP
                 self.__navigate(-1)
             elif key == KEY['DOWN']:                            # Cursor DOWN
                 self.__navigate(1)
+            elif key == KEY['PAGE_UP']:
+                self.__navigate(-Lines)
+            elif key == KEY['PAGE_DOWN']:
+                self.__navigate(Lines)
             elif key == KEY['HOME']:                            # First item
                 self.__selected = 0
             elif key == KEY['END']:                             # Last item
-                self.__selected = len(self.__items) - 1
+                self.__selected = max(0, self.__viewLength() - 1)
                 FirstItem = self.__selected - Lines
                 if FirstItem < 0:
                     FirstItem = 0
+            elif Multiple and key == ' ':                       # Mark/unmark, next item
+                if self.__viewLength():
+                    self.__mark(self.__viewItem(self.__selected))
+                    self.__navigate(1)
+            elif Multiple and key == '+':                       # Mark matching items
+                self.__markMatching(X, Y, ItemWidth)
+            elif Multiple and key == '-':                       # Unmark all
+                self.__marked = set()
             elif KEYname(key=key) in Keys:
                 return (-2 - Keys.index(KEYname(key)))
             elif key in freeKeys:
                 return (-2 - len(Keys) - freeKeys.index(key))
 
+# Full screen viewer for big or growing texts, lines are fetched from [Source] for the visible window only
+# @see Use bless.pager(), Source interface: first, len(), line(n), search(text, start, backward), done, follow
+#      and optionally prefix(n) -> (text, index), a fixed column colored by [index] (merged logs origin)
+class _pager():
+    def __init__(self, screen=None, Source=None, Title=None, Color=None):
+        self.__screen  = screen
+        self.__source  = Source
+        self.__title   = Title or ''
+        self.__Colors  = Color
+        self.__search  = ''
+        self.__message = ''
+
+    def __display(self, top, column, found, total):
+        (width, height) = (self.__screen.cols, self.__screen.rows)
+        color = self.__screen.colorGet(Color=self.__Colors)
+        status = f' {top+1}-{min(top+height-2, total)}/{total} '
+        if self.__source.first > 0:
+            status += f'({self.__source.first} older lines dropped) '
+        if not self.__source.done:
+            status += '[following] ' if self.__source.follow else '[loading] '
+        if self.__message:
+            status += f'{self.__message} '
+        self.__screen.box(Title=f'{self.__title}  </>.Search <n|N>.Next|Previous <END>.Tail <ESC>.Exit', Footer=status,
+                          X=1, Y=1, Width=width, Height=height, Color=color)
+        prefixed = hasattr(self.__source, 'prefix')
+        for row in range(0, height-2):
+            number = top + row
+            if number >= total:
+                break
+            (X, size) = (2, width-2)
+            if prefixed:                                        # Line origin, not scrolled horizontally
+                (prefix, index) = self.__source.prefix(number)
+                self.__screen.text(Text=prefix[:size], X=X, Y=2+row, Color=(PAGER_PREFIX[index % len(PAGER_PREFIX)][0], color[1]))
+                (X, size) = (X+len(prefix)+1, size-len(prefix)-1)
+                if size <= 0:
+                    continue
+            text = self.__source.line(number)[column:column+size]
+            if number == found:
+                self.__screen.text(Text=text+' '*(size-len(text)), X=X, Y=2+row, Color=self.__screen.colorGetReversed(Color=self.__Colors))
+            elif text:
+                self.__screen.text(Text=text, X=X, Y=2+row, Color=color)
+
+    # Search [self.__search] after (before) line [start], the found line is moved on top of the window
+    def __find(self, start, backward=False):
+        found = self.__source.search(text=self.__search, start=start, backward=backward)
+        self.__message = '' if found >= 0 else f'"{self.__search}" not found'
+        return found
+
+    # Display() Show [Source] until <ESC> (or <q>), the screen is updated when new lines are available (bless.wakeup())
+    # @see Scrolling works like messageBox(), the window sticks on the last line after <END> (or DOWN on it)
+    def Display(self):
+        source = self.__source
+        lines  = self.__screen.rows - 2
+        (top, column, found, tail) = (source.first, 0, -1, source.follow)
+        while True:
+            (first, total) = (source.first, source.first + len(source))
+            if tail:
+                top = total - lines
+            top = max(first, min(top, total - lines))
+            if not self.__screen.keyPending():
+                self.__display(top, column, found, total)
+            key = self.__screen.keyGet(wakeup=True)
+            if key is None:                                     # New lines
+                continue
+            self.__message = ''
+            if key == KEY['ESCAPE'] or key == 'q':
+                return
+            elif key == KEY['UP']:
+                (top, tail) = (top-1, False)
+            elif key == KEY['DOWN']:
+                top += 1
+                tail = top >= total - lines
+            elif key == KEY['PAGE_UP']:
+                (top, tail) = (top-lines, False)
+            elif key == KEY['PAGE_DOWN']:
+                top += lines
+                tail = top >= total - lines
+            elif key == KEY['HOME']:
+                (top, tail) = (first, False)
+            elif key == KEY['END']:
+                tail = True
+            elif key == KEY['LEFT']:
+                column = max(0, column-8)
+            elif key == KEY['RIGHT']:
+                column += 8
+            elif key == '/':
+                search = self.__screen.editBox(Title='Search', Footer='<ENTER>.Confirm <ESC>.Cancel', DefaultValue=self.__search,
+                                               Size=self.__screen.cols//2, Color=self.__Colors)
+                if search.value:
+                    self.__search = search.value
+                    found = self.__find(top-1)
+            elif key in ('n', 'N') and self.__search:
+                found = self.__find(found if found >= first else top-1, backward=(key == 'N'))
+            if found >= 0 and key in ('/', 'n', 'N'):
+                (top, tail) = (found, False)
+
+# Visible rows of a document, [depth, key, value, expanded]: children rows are added when their parent is expanded
+# (and dropped when it's collapsed), collapsed subtrees are never walked and only rows on screen are formatted
+class _tree():
+    def __init__(self, screen=None, Source=None, Title=None, Color=None):
+        self.__screen  = screen
+        self.__source  = Source
+        self.__title   = Title or ''
+        self.__Colors  = Color
+        self.__rows    = self.__children(Source, -1)
+        self.__search  = ''
+        self.__matches = []
+        self.__match   = -1
+        self.__message = ''
+
+    @staticmethod
+    def __children(value, depth):
+        items = value.items() if isinstance(value, dict) else enumerate(value) if isinstance(value, list) else []
+        return [[depth+1, key, child, False] for (key, child) in items]
+
+    @staticmethod
+    def __expandable(value):
+        return isinstance(value, (dict, list)) and len(value) > 0
+
+    def __label(self, row):
+        (depth, key, value, expanded) = row
+        marker = ('▾' if expanded else '▸') if self.__expandable(value) else ' '
+        if isinstance(value, dict):
+            text = f'{{…}} {len(value)} keys' if value else '{}'
+        elif isinstance(value, list):
+            text = f'[…] {len(value)} items' if value else '[]'
+        elif isinstance(value, str):
+            text = '"' + value.replace('\n', '\\n') + '"'
+        elif isinstance(value, bool) or value is None:
+            text = {True: 'true', False: 'false', None: 'null'}[value]
+        else:
+            text = str(value)
+        return f"{'  '*depth}{marker} {f'[{key}]' if isinstance(key, int) else key}: {text}"
+
+    # Row after the last (visible) descendant of row [index]
+    def __end(self, index):
+        (depth, end) = (self.__rows[index][0], index+1)
+        while end < len(self.__rows) and self.__rows[end][0] > depth:
+            end += 1
+        return end
+
+    # Parent row of row [index], -1 for top level rows
+    def __parent(self, index):
+        depth = self.__rows[index][0]
+        while index >= 0 and self.__rows[index][0] >= depth:
+            index -= 1
+        return index
+
+    # Keys from the document root to row [index], as a path: NetworkSettings.Ports["80/tcp"][0].HostPort
+    def __path(self, index):
+        path = ''
+        while index >= 0:
+            key = self.__rows[index][1]
+            path = (f'[{key}]' if isinstance(key, int) else f'.{key}' if key.isidentifier() else f'["{key}"]') + path
+            index = self.__parent(index)
+        return path.lstrip('.')
+
+    def __expand(self, index):
+        row = self.__rows[index]
+        if not row[3] and self.__expandable(row[2]):
+            row[3] = True
+            self.__rows[index+1:index+1] = self.__children(row[2], row[0])
+
+    def __collapse(self, index):
+        row = self.__rows[index]
+        if row[3]:
+            row[3] = False
+            del self.__rows[index+1:self.__end(index)]
+
+    # Paths (keys lists) matching [text], the whole path or its last keys, in document order and case insensitive.
+    # The document is walked, not rendered: keys with dots in them ("io.podman.label") are matched too
+    def __find(self, text):
+        query = text.replace('["', '.').replace('"]', '').replace('[', '.').replace(']', '').strip('.').lower()
+        (matches, stack) = ([], [((), '', self.__source)])
+        while query and stack:
+            (path, dotted, value) = stack.pop()
+            if path and (dotted == query or dotted.endswith('.'+query)):
+                matches.append(path)
+            items = value.items() if isinstance(value, dict) else enumerate(value) if isinstance(value, list) else []
+            stack.extend(reversed([(path+(key,), f'{dotted}.{key}'.lower() if path else str(key).lower(), child) for (key, child) in items]))
+        return matches
+
+    # Expand rows down to [path] (keys list)
+    # @return (int) Row of its last key
+    def __reveal(self, path):
+        (start, end, index) = (0, len(self.__rows), -1)
+        for (depth, key) in enumerate(path):
+            if index >= 0:
+                self.__expand(index)
+                (start, end) = (index+1, self.__end(index))
+            index = next(row for row in range(start, end) if self.__rows[row][0] == depth and self.__rows[row][1] == key)
+        return index
+
+    def __display(self, top, cursor):
+        (width, height) = (self.__screen.cols, self.__screen.rows)
+        color = self.__screen.colorGet(Color=self.__Colors)
+        status = f' {cursor+1}/{len(self.__rows)} {self.__path(cursor)} ' if self.__rows else ' empty '
+        if self.__message:
+            status += f'{self.__message} '
+        self.__screen.box(Title=f'{self.__title}  <←→>.Collapse|Expand </>.Path search <n|N>.Next|Previous <ESC>.Exit', Footer=status[-(width-4):],
+                          X=1, Y=1, Width=width, Height=height, Color=color)
+        for (row, number) in enumerate(range(top, min(top+height-2, len(self.__rows)))):
+            text = self.__label(self.__rows[number])[:width-2]
+            if number == cursor:
+                self.__screen.text(Text=text+' '*(width-2-len(text)), X=2, Y=2+row, Color=self.__screen.colorGetReversed(Color=self.__Colors))
+            else:
+                self.__screen.text(Text=text, X=2, Y=2+row, Color=color)
+
+    # Display() Show [Source] until <ESC> (or <q>), cursor row is kept on screen
+    def Display(self):
+        (top, cursor) = (0, 0)
+        while True:
+            lines  = self.__screen.rows - 2
+            cursor = max(0, min(cursor, len(self.__rows)-1))
+            top    = max(0, min(top, cursor, len(self.__rows)-lines), cursor-lines+1)
+            if not self.__screen.keyPending():
+                self.__display(top, cursor)
+            key = self.__screen.keyGet()
+            self.__message = ''
+            if key == KEY['ESCAPE'] or key == 'q':
+                return
+            elif not self.__rows:
+                continue
+            elif key == KEY['UP']:
+                cursor -= 1
+            elif key == KEY['DOWN']:
+                cursor += 1
+            elif key == KEY['PAGE_UP']:
+                (top, cursor) = (top-lines, cursor-lines)
+            elif key == KEY['PAGE_DOWN']:
+                (top, cursor) = (top+lines, cursor+lines)
+            elif key == KEY['HOME']:
+                cursor = 0
+            elif key == KEY['END']:
+                cursor = len(self.__rows)-1
+            elif key == KEY['RIGHT']:                       # Expand, first child when it's already expanded
+                if self.__rows[cursor][3]:
+                    cursor += 1
+                self.__expand(cursor)
+            elif key == KEY['LEFT']:                        # Collapse, parent when it's already collapsed
+                if self.__rows[cursor][3]:
+                    self.__collapse(cursor)
+                else:
+                    cursor = max(0, self.__parent(cursor))
+            elif key in (KEY['ENTER'], ' '):
+                if self.__rows[cursor][3]:
+                    self.__collapse(cursor)
+                else:
+                    self.__expand(cursor)
+            elif key == '/':
+                search = self.__screen.editBox(Title='Path search', Footer='<ENTER>.Confirm <ESC>.Cancel', DefaultValue=self.__search,
+                                               Size=self.__screen.cols//2, Color=self.__Colors)
+                if search.value:
+                    self.__search  = search.value
+                    self.__matches = self.__find(self.__search)
+                    self.__match   = -1
+                    key = 'n'
+            if key in ('n', 'N') and self.__search:
+                if not self.__matches:
+                    self.__message = f'"{self.__search}" not found'
+                    continue
+                self.__match = (self.__match + (-1 if key == 'N' else 1)) % len(self.__matches)
+                cursor = self.__reveal(self.__matches[self.__match])
+                top = cursor
+                self.__message = f'match {self.__match+1}/{len(self.__matches)}'
+
 class _editBox():
     def __init__(self, screen=None, Title=None, Footer=None, Footer2=None, DefaultValue='', Size=100, Width=None, Height=None, X=1, Y=1, Color=None):
         self.__screen = screen
@@ -667,11 +1386,12 @@ class _editBox():
             elif key == KEY['END']:                 # End
                 cursorPos = len(self.__value)
                 (xCursor, yCursor) = self.__fieldMove(posCursor=cursorPos, clear=False)
-            else:                                   # Any key
-                if len(self.__value) < Size:
+            elif isinstance(key, KeyPaste) or not key.startswith('\x1b'):   # Any key, pasted text (unknown sequences are skipped)
+                key = ''.join(' ' if character in '\r\n\t' else character for character in key)[:Size-len(self.__value)]
+                if key:
                     self.__value = self.__value[:cursorPos] + key + self.__value[cursorPos:]
                     self.__fieldPrint(X=xCursor, Y=yCursor, Text=self.__value[cursorPos:])
-                    cursorPos += 1
+                    cursorPos += len(key)
                     (xCursor, yCursor) = self.__fieldMove(posCursor=cursorPos, clear=False)
             self.__screen.cursorMove(X=xCursor, Y=yCursor)
 
@@ -0,0 +1,337 @@
+# -*- coding: utf-8 -*-
+#
+# @description      images build pipeline, images.yaml profiles built in dependency order
+#
+# @author           Andrea Benini
+# @date             2026-10-17
+# @license          GNU Affero General Public License v3.0
+# @see              Each profile command is parsed (podman|docker|buildah build ... -t TAG -f FILE CONTEXT)
+#                   and so is its Containerfile: a profile depends on the profiles tagging its FROM images.
+#                   Independent profiles are built concurrently (at most [jobs] at once), each one with its
+#                   own log file (the logs directory must be owned by the user and not writable by others).
+#                   A failed build skips the profiles depending on it, other commands (scripts, ...) have no
+#                   dependencies and are simply executed. Commands are executed in the current directory,
+#                   like the ones started from the text UI. Profiles with a content hash (see
+#                   forkliftlib.buildhash) store it in the image and are not built when their image has it
+#
+# pyright: reportMissingImports=false
+#
+import os
+import re
+import time
+import shlex
+import signal
+import tempfile
+import threading
+
+from forkliftlib.buildhash import labelCommand, HASH_LABEL
+from forkliftlib.execute   import pathPrivate
+
+
+BUILD_JOBS     = 4                      # Max concurrent builds
+BUILD_LOGS     = os.path.join(tempfile.gettempdir(), f'forklift-build-{os.getuid()}')
+BUILD_FILES    = ['Containerfile', 'Dockerfile']
+BUILD_RUNTIMES = ['podman', 'docker', 'buildah']
+BUILD_VERBS    = ['build', 'bud']
+BUILD_OPTIONS  = ['-t', '--tag', '-f', '--file', '--build-arg', '--target', '--platform', '--label', '--annotation', '--secret', '--ssh',
+                  '--network', '--build-context', '--cache-from', '--cache-to', '--iidfile', '-o', '--output', '--format', '--arch', '--os',
+                  '--env', '-v', '--volume', '--cpus', '-m', '--memory', '--shm-size', '--ulimit', '--add-host', '--dns', '--userns', '--isolation']
+BUILD_STATES   = ['waiting', 'building', 'done', 'unchanged', 'failed', 'skipped', 'cancelled']
+IMAGE_PREFIXES = ['localhost/', 'docker.io/library/', 'docker.io/']
+
+
+# Single profile: its command and what has been inferred from it
+class BuildProfile(object):
+    __slots__ = ('name', 'command', 'tags', 'containerfile', 'context', 'bases', 'depends', 'hash')
+    def __init__(self, name='', command=''):
+        self.name          = name
+        self.command       = command
+        self.tags          = []         # Images tagged by the build, normalized (see imageReference())
+        self.containerfile = None       # Containerfile path, None for commands that are not builds
+        self.context       = None
+        self.bases         = []         # FROM images, normalized
+        self.depends       = []         # Profiles names building [bases]
+        self.hash          = None       # Content hash (see forkliftlib.buildhash.profileHashes()), None: always built
+
+
+# Single profile build, status is one of BUILD_STATES
+class BuildJob(object):
+    __slots__ = ('profile', 'status', 'returnCode', 'message', 'log', 'started', 'elapsed', 'process')
+    def __init__(self, profile=None, log=''):
+        self.profile    = profile
+        self.status     = 'waiting'
+        self.returnCode = None
+        self.message    = ''
+        self.log        = log
+        self.started    = None
+        self.elapsed    = 0.0
+        self.process    = None
+
+    @property
+    def name(self):
+        return self.profile.name
+    @property
+    def built(self):                    # Image is there: built now or unchanged
+        return self.status in ('done', 'unchanged')
+
+    # Seconds spent building so far (or in total, once done)
+    def duration(self):
+        if self.status == 'building' and self.started:
+            return time.monotonic()-self.started
+        return self.elapsed
+
+    # lastLine() Last line written in the build log, live progress
+    def lastLine(self):
+        try:
+            with open(self.log, 'rb') as file:
+                file.seek(0, os.SEEK_END)
+                file.seek(max(0, file.tell()-4096))
+                lines = file.read().decode('utf-8', errors='replace').replace('\r', '\n').splitlines()
+        except OSError:
+            return ''
+        return next((line.strip() for line in reversed(lines) if line.strip()), '')
+
+
+# imageReference() Image name in a comparable form: default registry prefixes removed, ":latest" when there's no tag
+def imageReference(name=''):
+    for prefix in IMAGE_PREFIXES:
+        if name.startswith(prefix):
+            name = name[len(prefix):]
+            break
+    if '@' not in name and ':' not in name.rsplit('/', 1)[-1]:
+        name += ':latest'
+    return name
+
+# Replace $NAME and ${NAME} with [variables] values, unknown ones are left as they are
+def _expand(text='', variables={}):
+    return re.sub(r'\$\{(\w+)\}|\$(\w+)', lambda match: variables.get(match.group(1) or match.group(2), match.group(0)), text)
+
+# containerfileBases() External images used by FROM in Containerfile [path] (build stages and scratch excluded)
+# @param arguments (dict) Build arguments (--build-arg), they override ARG defaults before the first FROM
+# @return (list) Normalized image names, empty when the file cannot be read
+def containerfileBases(path='', arguments={}):
+    try:
+        with open(path, 'r', errors='replace') as file:
+            text = file.read()
+    except OSError:
+        return []
+    (variables, stages, bases) = ({}, set(), [])
+    for line in re.sub(r'\\[ \t]*\r?\n', ' ', text).splitlines():
+        words = line.split()
+        if not words or words[0].startswith('#'):
+            continue
+        instruction = words[0].upper()
+        if instruction == 'ARG' and not stages and len(words) > 1:
+            (name, _, value) = words[1].partition('=')
+            variables[name] = arguments.get(name, value.strip('"\''))
+        elif instruction == 'FROM':
+            words = [word for word in words[1:] if not word.startswith('--')]
+            if not words:
+                continue
+            image = _expand(words[0], {**variables, **arguments})
+            if image.lower() != 'scratch' and image not in stages and imageReference(image) not in bases:
+                bases.append(imageReference(image))
+            if len(words) >= 3 and words[1].upper() == 'AS':
+                stages.add(words[2])
+    return bases
+
+# buildProfile() Profile [name] with its [command] parsed, relative paths start from [cwd]
+def buildProfile(name='', command='', cwd=''):
+    profile = BuildProfile(name=name, command=command)
+    try:
+        lexer = shlex.shlex(command, posix=True, punctuation_chars=';&|()<>')
+        lexer.whitespace_split = True
+        words = list(lexer)
+    except ValueError:
+        return profile
+    start = None
+    for index in range(0, len(words)-1):                # runtime build|bud, docker buildx build
+        if os.path.basename(words[index]) in BUILD_RUNTIMES:
+            verb = index+2 if words[index+1] == 'buildx' else index+1
+            if verb < len(words) and words[verb] in BUILD_VERBS:
+                start = verb+1
+                break
+    if start is None:                                   # Not a build, just a command
+        return profile
+    (positional, arguments, containerfile) = ([], {}, None)
+    index = start
+    while index < len(words) and words[index][0] not in ';&|()<>':
+        word = words[index]
+        (option, separator, value) = word.partition('=')
+        if option in BUILD_OPTIONS:
+            if not separator:
+                index += 1
+                value = words[index] if index < len(words) else ''
+            if option in ('-t', '--tag'):
+                profile.tags.append(imageReference(value))
+            elif option in ('-f', '--file'):
+                containerfile = value
+            elif option == '--build-arg':
+                (argument, assigned, argumentValue) = value.partition('=')
+                arguments[argument] = argumentValue if assigned else os.getenv(argument, '')
+        elif not word.startswith('-'):
+            positional.append(word)
+        index += 1
+    profile.context = os.path.join(cwd, positional[-1]) if positional else cwd
+    if containerfile:
+        profile.containerfile = os.path.join(cwd, containerfile)
+    else:
+        profile.containerfile = next((os.path.join(profile.context, fileName) for fileName in BUILD_FILES if os.path.exists(os.path.join(profile.context, fileName))), os.path.join(profile.context, BUILD_FILES[0]))
+    profile.bases = containerfileBases(profile.containerfile, arguments)
+    return profile
+
+# buildGraph() Profiles from [profiles] (name, command), each one with the profiles it depends on
+# @return (list) BuildProfile items in the same order
+def buildGraph(profiles=[], cwd=None):
+    cwd = cwd or os.getcwd()
+    parsed = [buildProfile(name=name, command=command, cwd=cwd) for (name, command) in profiles]
+    builders = {}
+    for profile in parsed:
+        for tag in profile.tags:
+            builders.setdefault(tag, profile.name)
+    for profile in parsed:
+        profile.depends = sorted({builders[base] for base in profile.bases if base in builders and builders[base] != profile.name})
+    return parsed
+
+
+# Profiles built in dependency order, at most [jobs] concurrently. Everything happens in background threads,
+# [listener] is called (from them) each time a build changes its status
+class BuildPipeline(object):
+    # @param profiles (list) BuildProfile items (see buildGraph()), dependencies outside this list are already there
+    # @param jobs     (int)  Max concurrent builds
+    # @param logs     (str)  Logs directory, this run writes [logs]/<date-time>/<profile>.log
+    # @param labels   (callable) [optional] Image labels (dict) by image name, profiles whose images all have their hash
+    #                 are not built. Not set: every profile is built
+    def __init__(self, profiles=[], jobs=BUILD_JOBS, logs=BUILD_LOGS, listener=None, labels=None):
+        self.__path     = os.path.join(logs, time.strftime('%Y%m%d-%H%M%S'))
+        self.__jobs     = [BuildJob(profile=profile, log=os.path.join(self.__path, re.sub(r'[^\w.-]', '_', profile.name)+'.log')) for profile in profiles]
+        self.__limit    = max(1, jobs)
+        self.__listener = listener
+        self.__changed  = threading.Condition()
+        self.__thread   = None
+        self.__started  = None
+        self.__elapsed  = 0.0
+        self.__finished = False
+        self.__cancel   = False
+        self.__labels   = labels
+
+    @property
+    def jobs(self):
+        return self.__jobs
+    @property
+    def limit(self):                    # Max concurrent builds
+        return self.__limit
+    @property
+    def path(self):                     # Logs directory of this run
+        return self.__path
+    @property
+    def finished(self):
+        return self.__finished
+    # Total wall time, so far or in total once finished
+    @property
+    def elapsed(self):
+        if self.__started and not self.__finished:
+            return time.monotonic()-self.__started
+        return self.__elapsed
+
+    # start() Start building in background
+    def start(self):
+        if self.__thread:
+            return
+        self.__started = time.monotonic()
+        self.__thread  = threading.Thread(target=self.__run, daemon=True)
+        self.__thread.start()
+
+    # wait() Wait for all builds
+    # @return (bool) True when all of them succeeded
+    def wait(self, timeout=None):
+        if self.__thread:
+            self.__thread.join(timeout)
+        return self.__finished and all(job.built for job in self.__jobs)
+
+    # cancel() Stop running builds (their whole process group), waiting ones are not started anymore
+    def cancel(self):
+        with self.__changed:
+            self.__cancel = True
+            for job in self.__jobs:
+                if job.status == 'building' and job.process:
+                    try:
+                        os.killpg(job.process.pid, signal.SIGTERM)
+                    except OSError:
+                        pass
+            self.__changed.notify_all()
+
+    def __notify(self):
+        if self.__listener:
+            self.__listener()
+
+    def __run(self):
+        (errorCode, message) = pathPrivate(os.path.dirname(self.__path), mask=0o022)     # Nobody else can plant symlinks to log files there
+        if errorCode == 0:
+            try:
+                os.makedirs(self.__path, mode=0o700, exist_ok=True)
+            except OSError as E:
+                (errorCode, message) = (-1, str(E))
+        if errorCode != 0:
+            for job in self.__jobs:
+                (job.status, job.returnCode, job.message) = ('failed', -1, f'Cannot create logs directory: {message}')
+            self.__finish()
+            return
+        for job in self.__jobs:                         # Images already carrying their hash, before anything starts
+            if self.__labels and job.profile.hash and job.profile.tags and all((self.__labels(tag) or {}).get(HASH_LABEL) == job.profile.hash for tag in job.profile.tags):
+                (job.status, job.returnCode, job.message) = ('unchanged', 0, 'Unchanged, not rebuilt')
+        self.__notify()
+        status = {job.name: job for job in self.__jobs}
+        with self.__changed:
+            while True:
+                changed = True
+                while changed:                          # Until skipped builds have skipped their dependents too
+                    changed = False
+                    running = len([job for job in self.__jobs if job.status == 'building'])
+                    for job in [job for job in self.__jobs if job.status == 'waiting']:
+                        failed = [name for name in job.profile.depends if name in status and status[name].status in ('failed', 'skipped', 'cancelled')]
+                        if self.__cancel:
+                            (job.status, job.message) = ('cancelled', 'Cancelled')
+                        elif failed:
+                            (job.status, job.message, changed) = ('skipped', f'Dependency not built: {", ".join(failed)}', True)
+                        elif running < self.__limit and all(status[name].built for name in job.profile.depends if name in status):
+                            self.__start(job)
+                            running += 1 if job.status == 'building' else 0
+                            changed = changed or job.status != 'building'
+                if not running:
+                    for job in [job for job in self.__jobs if job.status == 'waiting']:     # Nothing can start: they're waiting for each other
+                        (job.status, job.returnCode, job.message) = ('failed', -1, 'Dependency cycle')
+                    break
+                self.__changed.wait()
+        self.__finish()
+
+    def __finish(self):
+        self.__elapsed  = time.monotonic()-self.__started
+        self.__finished = True
+        self.__notify()
+
+    # Single build, started with the lock held: process and its waiting thread
+    def __start(self, job):
+        import subprocess               # Lazy, builds are the only reason for it here
+        (job.status, job.started) = ('building', time.monotonic())
+        try:
+            with open(job.log, 'wb') as log:
+                job.process = subprocess.Popen(labelCommand(job.profile.command, job.profile.hash), shell=True, stdin=subprocess.DEVNULL, stdout=log, stderr=subprocess.STDOUT, start_new_session=True)
+        except OSError as E:
+            (job.status, job.returnCode, job.message) = ('failed', -1, str(E))
+            return
+        threading.Thread(target=self.__wait, args=(job,), daemon=True).start()
+        self.__notify()
+
+    def __wait(self, job):
+        returnCode = job.process.wait()
+        with self.__changed:
+            job.elapsed    = time.monotonic()-job.started
+            job.returnCode = returnCode
+            if returnCode == 0:
+                job.status = 'done'
+            else:
+                (job.status, job.message) = ('cancelled' if self.__cancel else 'failed', 'Cancelled' if self.__cancel else f'Exit code {returnCode}: {job.lastLine()}')
+            job.process = None
+            self.__changed.notify_all()
+        self.__notify()
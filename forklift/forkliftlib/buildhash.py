@@ -0,0 +1,225 @@
+# -*- coding: utf-8 -*-
+#
+# @description      images build content hash, unchanged images are not rebuilt
+#
+# @author           Andrea Benini
+# @date             2026-10-17
+# @license          GNU Affero General Public License v3.0
+# @see              A profile hash covers its command, its Containerfile, every file of its build context
+#                   (path, permissions and content, .containerignore or .dockerignore rules applied) and the
+#                   hashes of the profiles building its FROM images. It's stored in the image as a label
+#                   (HASH_LABEL): an image carrying the same hash is up to date. File digests are kept in
+#                   a cache file in the user cache directory, keyed by (mtime, size): only changed files are
+#                   read again. Images pulled from registries (FROM not built here) are not tracked
+#
+# pyright: reportMissingImports=false
+#
+import os
+import re
+import json
+import stat
+import time
+import hashlib
+
+from forkliftlib.cache import cacheDirectory
+
+
+HASH_LABEL   = 'io.forklift.hash'       # Image label with the profile hash
+HASH_CACHE   = '.forklift.hashes'       # File digests cache, in the cache directory of the configuration path
+HASH_VERSION = 1
+HASH_IGNORE  = ['.containerignore', '.dockerignore']
+HASH_RECENT  = 2                        # Files modified in the last seconds are not cached (same mtime, new content)
+HASH_BLOCK   = 1048576
+
+
+# File digests by path, valid while file mtime and size are the same
+class DigestCache(object):
+    # @param path (str) Configuration path (see cacheDirectory()), None for a cache in memory only
+    def __init__(self, path=None):
+        self.__fileName = os.path.join(cacheDirectory(path), HASH_CACHE) if path is not None else None
+        self.__files    = {}
+        self.__changed  = False
+        if self.__fileName:
+            try:
+                with open(self.__fileName, 'r') as file:
+                    data = json.load(file)
+                if isinstance(data, dict) and data.get('version') == HASH_VERSION and isinstance(data.get('files'), dict):
+                    self.__files = data['files']
+            except (OSError, ValueError):
+                pass
+
+    # digest() Content digest of [fileName], read again only when [status] (os.lstat()) differs from the cached one
+    # @return (str) Hex digest, None when it cannot be read
+    def digest(self, fileName='', status=None):
+        cached = self.__files.get(fileName)
+        if cached and cached[0] == status.st_mtime_ns and cached[1] == status.st_size:
+            return cached[2]
+        digest = hashlib.sha256()
+        try:
+            with open(fileName, 'rb') as file:
+                for block in iter(lambda: file.read(HASH_BLOCK), b''):
+                    digest.update(block)
+        except OSError:
+            return None
+        if time.time()-status.st_mtime > HASH_RECENT:
+            self.__files[fileName] = [status.st_mtime_ns, status.st_size, digest.hexdigest()]
+            self.__changed = True
+        return digest.hexdigest()
+
+    # prune() Forget files under [directory] not in [seen] (removed or ignored ones)
+    def prune(self, directory='', seen=set()):
+        prefix = directory.rstrip(os.sep)+os.sep
+        for fileName in [fileName for fileName in self.__files if fileName.startswith(prefix) and fileName not in seen]:
+            del self.__files[fileName]
+            self.__changed = True
+
+    # save() Write the cache file when something changed, replaced atomically
+    # @return (bool) True when it has been written (or there was nothing to write)
+    def save(self):
+        if not self.__fileName or not self.__changed:
+            return True
+        fileTemp = f'{self.__fileName}.{os.getpid()}'
+        try:
+            with open(fileTemp, 'w') as file:
+                json.dump({'version': HASH_VERSION, 'files': self.__files}, file, separators=(',', ':'))
+            os.replace(fileTemp, self.__fileName)
+            self.__changed = False
+            return True
+        except OSError:
+            try:
+                os.unlink(fileTemp)
+            except OSError:
+                pass
+            return False
+
+
+# Ignore file pattern to a regex, docker syntax: *, ?, [...], ** (any number of directories), a pattern
+# matching a directory matches everything inside it
+def _patternRegex(pattern=''):
+    (regex, index) = ('', 0)
+    while index < len(pattern):
+        if pattern.startswith('**/', index):
+            (regex, index) = (regex+'(?:.*/)?', index+3)
+            continue
+        if pattern.startswith('**', index):
+            (regex, index) = (regex+'.*', index+2)
+            continue
+        character = pattern[index]
+        end = pattern.find(']', index+2) if character == '[' else -1
+        if character == '*':
+            regex += '[^/]*'
+        elif character == '?':
+            regex += '[^/]'
+        elif end > 0:
+            members = pattern[index+1:end]
+            regex += '[' + ('^'+members[1:] if members[0] in '!^' else members).replace('\\', '\\\\') + ']'
+            index = end
+        elif character == '\\' and index+1 < len(pattern):
+            (regex, index) = (regex+re.escape(pattern[index+1]), index+1)
+        else:
+            regex += re.escape(character)
+        index += 1
+    return re.compile(regex+r'(?:/.*)?\Z')
+
+# ignorePatterns() Rules from [context] .containerignore (or .dockerignore), in file order
+# @return (list) [(exclusion (bool), regex)], empty when there's no ignore file
+def ignorePatterns(context=''):
+    for fileName in HASH_IGNORE:
+        try:
+            with open(os.path.join(context, fileName), 'r', errors='replace') as file:
+                lines = file.read().splitlines()
+        except OSError:
+            continue
+        patterns = []
+        for line in lines:
+            line = line.strip()
+            if not line or line.startswith('#'):
+                continue
+            exclusion = line.startswith('!')
+            line = os.path.normpath(line[1:].strip() if exclusion else line).lstrip('/')
+            if line and line != '.':
+                patterns.append((exclusion, _patternRegex(line)))
+        return patterns
+    return []
+
+# ignored() True when [path] (relative to the context, '/' separated) is ignored by [patterns], last match wins
+def ignored(path='', patterns=[]):
+    result = False
+    for (exclusion, regex) in patterns:
+        if regex.match(path):
+            result = not exclusion
+    return result
+
+
+# contextHash() Hash of a build [profile] (see forkliftlib.build.BuildProfile): command, Containerfile and context
+# @param cache   (DigestCache) File digests cache
+# @param depends (list) Hashes of the profiles building its FROM images
+# @return (str) Hex digest, None when it cannot be computed (missing Containerfile or context)
+def contextHash(profile=None, cache=None, depends=[]):
+    cache = cache or DigestCache()
+    digest = hashlib.sha256(f'forklift {HASH_VERSION}\0{profile.command}\0'.encode())
+    try:
+        containerfile = cache.digest(profile.containerfile, os.stat(profile.containerfile))
+    except OSError:
+        return None
+    if containerfile is None or not os.path.isdir(profile.context):
+        return None
+    digest.update(f'containerfile\0{containerfile}\0'.encode())
+    for value in depends:
+        digest.update(f'from\0{value}\0'.encode())
+    context  = os.path.realpath(profile.context)
+    patterns = ignorePatterns(context)
+    prune    = not any(exclusion for (exclusion, _) in patterns)   # Ignored directories are skipped, unless files inside them can be included again
+    seen     = set()
+    for (directory, directories, files) in os.walk(context):
+        relative = os.path.relpath(directory, context).replace(os.sep, '/')
+        relative = '' if relative == '.' else relative+'/'
+        directories.sort()
+        if prune:
+            directories[:] = [name for name in directories if not ignored(relative+name, patterns)]
+        for name in sorted(files+[name for name in directories if os.path.islink(os.path.join(directory, name))]):
+            path = relative+name
+            if ignored(path, patterns):
+                continue
+            fileName = os.path.join(directory, name)
+            try:
+                status = os.lstat(fileName)
+            except OSError:
+                continue
+            if stat.S_ISLNK(status.st_mode):
+                value = 'link:'+os.readlink(fileName)
+            elif stat.S_ISREG(status.st_mode):
+                (value, _) = (cache.digest(fileName, status), seen.add(fileName))
+            else:
+                continue                                            # Sockets, pipes, devices
+            digest.update(f'{path}\0{stat.S_IMODE(status.st_mode):o}\0{value}\0'.encode())
+        if relative and not ignored(relative[:-1], patterns):      # Empty directories are part of the image too
+            digest.update(f'{relative}\0'.encode())
+    cache.prune(context, seen)
+    return digest.hexdigest()
+
+# profileHashes() Hash of each build profile in [profiles] (forkliftlib.build.buildGraph() items), stored in profile.hash
+# @return (dict) {name: hash}, None for commands that are not builds, for unreadable contexts and their dependents
+def profileHashes(profiles=[], cache=None):
+    byName = {profile.name: profile for profile in profiles}
+    hashes = {}
+    def visit(profile, visiting):
+        if profile.name in hashes:
+            return hashes[profile.name]
+        value = None
+        if profile.containerfile and profile.name not in visiting:  # Profiles in a dependency cycle have no hash
+            depends = [visit(byName[name], visiting | {profile.name}) for name in profile.depends if name in byName]
+            if None not in depends:
+                value = contextHash(profile=profile, cache=cache, depends=depends)
+        hashes[profile.name] = profile.hash = value
+        return value
+    for profile in profiles:
+        visit(profile, set())
+    return hashes
+
+# labelCommand() Build [command] storing [value] in the image label, unchanged when there's no build in it
+def labelCommand(command='', value=None):
+    match = re.search(r'\b(?:podman|docker|buildah)\s+(?:buildx\s+)?(?:build|bud)\b', command) if value else None
+    if not match:
+        return command
+    return f'{command[:match.end()]} --label {HASH_LABEL}={value}{command[match.end():]}'
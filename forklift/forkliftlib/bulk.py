@@ -0,0 +1,86 @@
+# -*- coding: utf-8 -*-
+#
+# @description      bulk actions on containers and images
+#
+# @author           Andrea Benini
+# @date             2026-10-17
+# @license          GNU Affero General Public License v3.0
+# @see              Same action executed on many items concurrently through a bounded pool of
+#                   workers, results are collected in the caller thread (UI updates are safe there)
+#
+# pyright: reportMissingImports=false
+#
+import time
+
+
+BULK_WORKERS = 8                        # Max concurrent engine calls
+
+
+# Single item outcome
+class BulkResult(object):
+    __slots__ = ('item', 'returnCode', 'message', 'elapsed')
+    def __init__(self, item=None, returnCode=0, message='', elapsed=0.0):
+        self.item       = item
+        self.returnCode = returnCode
+        self.message    = message
+        self.elapsed    = elapsed
+
+
+# bulkRun() Run [function] on each item of [items] with at most [workers] concurrent calls
+# @param function (callable) function(item) -> (returnCode, message), executed in a worker thread
+# @param items    (list)     Items to work on
+# @param workers  (int)      Pool size
+# @param progress (callable) [optional] progress(BulkResult, done, total), called in the caller thread
+# @return (list, float) [BulkResult list in the same order of [items], total elapsed seconds]
+def bulkRun(function=None, items=[], workers=BULK_WORKERS, progress=None):
+    def worker(item):
+        timeStart = time.monotonic()
+        try:
+            (returnCode, message) = function(item)
+        except Exception as E:
+            (returnCode, message) = (-1, str(E))
+        return BulkResult(item=item, returnCode=returnCode, message=str(message).strip(), elapsed=time.monotonic()-timeStart)
+    import concurrent.futures           # Lazy, only bulk actions need it (faster startup)
+    timeStart = time.monotonic()
+    results = [None] * len(items)
+    if not items:
+        return (results, 0.0)
+    with concurrent.futures.ThreadPoolExecutor(max_workers=max(1, min(workers, len(items)))) as pool:
+        futures = {pool.submit(worker, item): index for index, item in enumerate(items)}
+        for done, future in enumerate(concurrent.futures.as_completed(futures), start=1):
+            result = future.result()
+            results[futures[future]] = result
+            if progress:
+                progress(result, done, len(items))
+    return (results, time.monotonic()-timeStart)
+
+
+# bulkBatch() Like bulkRun() for engines able to act on many items with a single call, [items] are split
+#             in [workers] slices executed concurrently, each item still gets its own BulkResult
+# @param function (callable) function(items) -> [(returnCode, message)] one for each item
+def bulkBatch(function=None, items=[], workers=BULK_WORKERS, progress=None):
+    def worker(chunk):
+        timeStart = time.monotonic()
+        try:
+            outcomes = function(chunk)
+        except Exception as E:
+            outcomes = [(-1, str(E))] * len(chunk)
+        return (outcomes, time.monotonic()-timeStart)
+    import concurrent.futures
+    timeStart = time.monotonic()
+    results = [None] * len(items)
+    if not items:
+        return (results, 0.0)
+    size = max(1, -(-len(items) // max(1, workers)))
+    chunks = [list(range(i, min(i+size, len(items)))) for i in range(0, len(items), size)]
+    done = 0
+    with concurrent.futures.ThreadPoolExecutor(max_workers=len(chunks)) as pool:
+        futures = {pool.submit(worker, [items[i] for i in chunk]): chunk for chunk in chunks}
+        for future in concurrent.futures.as_completed(futures):
+            (outcomes, elapsed) = future.result()
+            for index, (returnCode, message) in zip(futures[future], outcomes):
+                results[index] = BulkResult(item=items[index], returnCode=returnCode, message=str(message).strip(), elapsed=elapsed)
+                done += 1
+                if progress:
+                    progress(results[index], done, len(items))
+    return (results, time.monotonic()-timeStart)
@@ -0,0 +1,78 @@
+# -*- coding: utf-8 -*-
+#
+# @description      startup cache, last known state painted before the engine answers
+#
+# @author           Andrea Benini
+# @date             2026-10-17
+# @license          GNU Affero General Public License v3.0
+# @see              A small JSON file in the user cache directory keeps: detected runtime (valid while
+#                   its executable has the same path and mtime), last containers and images snapshot,
+#                   text UI state (current tab, ...). The snapshot is shown as stale at startup and
+#                   replaced as soon as the engine answers. Errors are ignored, it's only a cache
+#
+# pyright: reportMissingImports=false
+#
+import os
+import time
+
+from forkliftlib.execute import pathWhich
+
+
+CACHE_FILE    = '.forklift.cache'
+CACHE_VERSION = 1
+
+
+# cacheDirectory() Cache directory of configuration [path], $XDG_CACHE_HOME/forklift/<path with % for />:
+#                  nothing is written next to the configuration (often a checkout), one directory for each one
+# @return (string) Directory name, it's created when missing (errors are ignored, it's only a cache)
+def cacheDirectory(path=''):
+    root      = os.getenv('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache')
+    directory = os.path.join(root, 'forklift', os.path.realpath(path or '.').strip('/').replace('/', '%') or '%')
+    try:
+        os.makedirs(directory, mode=0o700, exist_ok=True)
+    except OSError:
+        pass
+    return directory
+
+# cacheLoad() Cache of configuration [path]
+# @return (dict) Cache content, empty when it's missing, broken or from another version
+def cacheLoad(path=''):
+    import json                         # Lazy, no cache file no json module (first startup)
+    try:
+        with open(os.path.join(cacheDirectory(path), CACHE_FILE), 'r') as file:
+            data = json.load(file)
+    except (OSError, ValueError):
+        return {}
+    if not isinstance(data, dict) or data.get('version') != CACHE_VERSION:
+        return {}
+    return data
+
+# cacheSave() Store [data] for configuration [path], replaced atomically (concurrent instances never read half a file)
+# @return (bool) True when it has been written
+def cacheSave(path='', data={}):
+    import json
+    fileName = os.path.join(cacheDirectory(path), CACHE_FILE)
+    fileTemp = f'{fileName}.{os.getpid()}'
+    try:
+        with open(fileTemp, 'w') as file:
+            json.dump({**data, 'version': CACHE_VERSION, 'saved': time.time()}, file, separators=(',', ':'))
+        os.replace(fileTemp, fileName)
+        return True
+    except (OSError, TypeError, ValueError):
+        try:
+            os.unlink(fileTemp)
+        except OSError:
+            pass
+        return False
+
+
+# runtimeStamp() Identity of runtime [name] executable, None when it's not in $PATH
+# @return (dict|None) {name, path, mtime}
+def runtimeStamp(name=''):
+    binary = pathWhich(name)
+    if not binary:
+        return None
+    try:
+        return {'name': name, 'path': binary, 'mtime': os.stat(binary).st_mtime}
+    except OSError:
+        return None
@@ -9,34 +9,90 @@
 #
 # pyright: reportMissingImports=false
 #
-import math
 import os
-import csv
-import json
-import subprocess
+import time
+import shlex
+import threading
+
+from forkliftlib.bulk    import bulkRun, bulkBatch, BULK_WORKERS
+from forkliftlib.cache   import cacheLoad, cacheSave, runtimeStamp
+from forkliftlib.engine  import engineOpen
+from forkliftlib.execute import argvExec
+from forkliftlib.records import containerRecords, imageRecords
+from forkliftlib.state   import StateStore, REFRESH_INTERVAL
+
+# Bulk actions: name -> (engine method, runtime command for a single batch call)
+BULK_ACTIONS = {
+    'stop':     ('stop',        'stop'),
+    'kill':     ('kill',        'kill'),
+    'restart':  ('restart',     'restart'),
+    'remove':   ('remove',      'rm'),
+    'rmi':      ('imageRemove', 'rmi'),
+    'volume':   ('volumeRemove','volume rm'),
+}
+SHELLS_CACHED = 1000                    # Images in the attach shells cache, oldest ones dropped first
+INSPECT_PREFETCH = 50                   # Running containers details loaded by Prefetch()
 
 
 class Container(object):
-    def __init__(self, path=''):
+    # @param path   (string) System and user configuration files path
+    # @param socket (string) [optional] Explicit engine API socket, autodetected when not set
+    # @param engine (EngineAgent) [optional] Engine backend already connected, no local detection (remote agent)
+    def __init__(self, path='', socket=None, engine=None):
+        self.__path            = path
         self.__file_containers = path+os.path.sep+'containers.yaml'
         self.__file_images     = path+os.path.sep+'images.yaml'
-        self.__detectPlatform(self.platformList)
+        self.__cache           = cacheLoad(path)
+        if engine:
+            (self.__engine, self.__platform) = (engine if engine.valid else None, None)
+        else:
+            if not self.__detectPlatformCached(self.platformList):
+                self.__detectPlatform(self.platformList)
+                self.__cache['platform'] = runtimeStamp(self.__platform) if self.__platform else None
+            self.__engine = engineOpen(platform=self.__platform, socketPath=socket)
+        if self.__engine and not self.__platform:       # API socket without the runtime executable
+            self.__isValid  = True
+            self.__platform = self.__engine.platform
+        elif not self.__engine:
+            self.__isValid  = False
+        self.__state = None
+        self.__inspected    = {}        # Container ID -> (state, details), replaced (never changed in place) under __inspectLock
+        self.__inspectLock  = threading.Lock()
+        self.__inspectEpoch = 0         # Incremented by events dropping details
         self.LoadContainers()
         self.LoadImages()
 
     @property
+    def path(self):                     # System and user configuration files path
+        return self.__path
+    @property
     def platform(self):
         return self.__platform
     @property
+    def runtime(self):                  # Runtime command line for user commands, it may reach a remote host
+        return getattr(self.__engine, 'runtime', None) or self.__platform
+    @property
     def platformList(self):             # Currently supported container engines
         return ['podman', 'docker']
     @property
     def containerShellList(self):
         return ['/bin/bash', '/bin/ksh', '/bin/dash', '/bin/sh']
     @property
+    def engine(self):                   # Engine backend in use (socket, cli)
+        return self.__engine.name if self.__engine else None
+    @property
+    def backend(self):                  # Engine backend object (agents forward calls to it)
+        return self.__engine
+    @property
     def valid(self):
         return self.__isValid
     @property
+    def cache(self):                    # Startup cache content (see forkliftlib.cache), text UI state is in ['terminal']
+        return self.__cache
+    @property
+    def stale(self):                    # True while lists come from the startup cache
+        return bool(self.__state and getattr(self.__state, 'stale', False))
+    @property
     def filecontainers(self):
         return self.__file_containers
     @property
@@ -48,7 +104,7 @@ class Container(object):
         if platforms:
             element = platforms[0]
             tail = platforms[1:]
-            (errorCode, _) = self.__exec(f"{element} --version")
+            (errorCode, _) = argvExec([element, '--version'])
             if errorCode == 0:
                 self.__isValid = True
                 self.__platform = element
@@ -58,23 +114,74 @@ class Container(object):
             self.__isValid = False
             self.__platform = None
 
+    # Runtime detected last time, still valid when its executable has the same path and mtime (no forks)
+    def __detectPlatformCached(self, platforms):
+        cached = self.__cache.get('platform') or {}
+        if cached.get('name') not in platforms or runtimeStamp(cached['name']) != cached:
+            return False
+        (self.__isValid, self.__platform) = (True, cached['name'])
+        return True
 
-    # @return (int, string) [returnCode, outputMessage]
-    def __exec(self, command=None, stderr=None):
-        try:
-            process = subprocess.Popen(command, stdout=subprocess.PIPE, stderr=stderr, shell=True, universal_newlines=True)
-            outputStream, errorStream = process.communicate()
-            if not errorStream:
-                errorStream=''
-            return (process.returncode, outputStream+errorStream)
-        except subprocess.CalledProcessError as E:
-            return (-1, str(E))
+    # watch() Keep containers and images in memory, following engine events instead of asking for them each time
+    # @param interval (float) Seconds between background refreshes when engine events are not available
+    # @param cached   (bool) Start from the cached snapshot (stale) and load the real one in background
+    # @return StateStore|None
+    def watch(self, interval=REFRESH_INTERVAL, cached=False):
+        if not self.__state and self.__engine:
+            self.__state = getattr(self.__engine, 'state', None)
+            if self.__state:                                # Remote state, already followed by its engine
+                self.__state.eventListenerAdd(self.__inspectForget)
+                self.__state.start()
+                return self.__state
+            self.__state = StateStore(engine=self.__engine, interval=interval)
+            self.__state.eventListenerAdd(self.__inspectForget)
+            snapshot = self.__cache.get('snapshot') or {}
+            if cached and snapshot.get('platform') == self.__platform:
+                self.__state.seed(containers=snapshot.get('containers', []), images=snapshot.get('images', []))
+            self.__state.start(wait=not self.__state.ready)
+        return self.__state
+
+    # cacheSave() Store detected runtime, last snapshot and text UI state ([terminal], dict) for the next startup
+    def cacheSave(self, terminal=None):
+        if terminal is not None:
+            self.__cache['terminal'] = terminal
+        if self.__state and not hasattr(self.__engine, 'state') and self.__state.ready and not self.__state.stale:
+            self.__cache['snapshot'] = {'platform': self.__platform, 'containers': self.__state.containers(), 'images': self.__state.images()}
+        if self.__cache.get('shells') and self.__state and self.__state.ready and not self.__state.stale:      # Images gone, their shells too
+            images = {image['Id'] for image in self.__state.images()}
+            self.__cache['shells'] = {ID: shell for (ID, shell) in self.__cache['shells'].items() if ID in images}
+        return cacheSave(self.__path, self.__cache)
+
+    def close(self):
+        if self.__state:
+            self.__state.stop()
+            self.__state = None
+        if self.__engine:
+            self.__engine.close()
+
+    def __containers(self):
+        if self.__state and self.__state.ready:
+            return (0, self.__state.containers())
+        return self.__engine.containers()
+
+    def __images(self):
+        if self.__state and self.__state.ready:
+            return (0, self.__state.images())
+        return self.__engine.images()
+
+    # Containers and images as they come from the engine (ps|images --format=json layout)
+    # @return (int, list|string) [returnCode, items or error message]
+    def containersRaw(self):
+        return self.__containers()
+    def imagesRaw(self):
+        return self.__images()
 
     # Manually loading yaml files sucks but I really want to avoid every single extra dependency (now using stdbase lib only)
     def __loadFile(self, filename=None):
         result = {}
         try:
             with open(filename, 'r') as file:
+                import csv              # Lazy, only when there's a profile file to read
                 streamReader = csv.reader(file, delimiter=":")
                 for line in streamReader:
                     if len(line) > 1:
@@ -90,74 +197,230 @@ class Container(object):
     def LoadImages(self):
         self.__imageProfiles = self.__loadFile(self.__file_images)
 
+    # List() Containers list rows, one for each container name
+    # @return (list, string) [ContainerRecord items (label, ID, name, state), label format] (empty list on errors)
     def List(self):
-        results = []
-        (errorCode, output) = self.__exec(f"{self.__platform} ps -a --format=json")
+        (errorCode, jsonData) = self.__containers()
         if errorCode != 0 :
-            return results
-        jsonData = json.loads(output)
-        items = {}
-        lenImage = lenName = 0
-        for item in jsonData:
-            if 'Names' in item and len(item['Names'])>0:
-                for itemName in item['Names']:
-                    if len(item['Image']) > lenImage:
-                        lenImage = len(item['Image'])
-                    if len(itemName) > lenName:
-                        lenName = len(itemName)
-                    items[itemName] = {
-                        'id': item['Id'],
-                        'idshort': item['Id'][:12],
-                        'image': item['Image'],
-                        'name': itemName,
-                        'state': item['State'],
-                        'createdat': item['CreatedAt'],
-                        'command': item['Command'][0][:20] if item['Command'] else ''
-                    }
-        formatFields = f"{{id:<12}}  {{image:<{lenImage}}}  {{name:<{lenName}}}  {{state:<7}}  {{createdAt:<20}} {{command}}"
-        for item in items:
-            label = formatFields.format(
-                        id        = items[item]['idshort'],
-                        image     = items[item]['image'],
-                        name      = items[item]['name'],
-                        state     = items[item]['state'],
-                        createdAt = items[item]['createdat'],
-                        command   = items[item]['command']
-            )
-            results.append((label, items[item]['id'], items[item]['name'], items[item]['state']))
-        return (results, formatFields)
+            return []
+        return containerRecords(jsonData)
+
+    # cmdRuntime() Shell command line running the runtime with [arguments], each of them quoted (IDs and names come
+    #              from the engine, a daemon or an agent), quoted once more for the remote shell when there's a terminal prefix
+    def cmdRuntime(self, *arguments):
+        argv = [self.__platform or self.runtime] + list(arguments)
+        terminal = getattr(self.__engine, 'terminal', None)
+        if terminal:
+            argv = shlex.split(terminal) + [shlex.join(argv)]
+        return shlex.join(argv)
 
     def cmdStorageInformation(self):
-        return f"{self.__platform} system df -v"
+        return self.cmdRuntime('system', 'df', '-v')
 
     def cmdStart(self, containerID=''):
-        return f"{self.__platform} start -ai {containerID}"
+        return self.cmdRuntime('start', '-ai', containerID)
 
-    def cmdAttach(self, containerID=''):
-        return f"{self.__platform} exec -it {containerID}"
+    # cmdAttach() Interactive [shell] in [containerID]
+    def cmdAttach(self, containerID='', shell='/bin/sh'):
+        return self.cmdRuntime('exec', '-it', containerID, shell)
 
     def cmdLog(self, containerID=''):
-        return f"{self.__platform} logs {containerID} | less"
+        return self.cmdRuntime('logs', containerID)+' | less'
 
     def cmdInspect(self, containerID=''):
-        return f"{self.__platform} inspect {containerID} | less"
+        return self.cmdRuntime('inspect', containerID)+' | less'
+
+    # Image ID of [containerID], from the lists in memory when they're there
+    def __containerImage(self, containerID=''):
+        (errorCode, items) = self.__containers() if self.__state and self.__state.ready else (-1, [])
+        item = next((item for item in items if item['Id'] == containerID), None) if errorCode == 0 else None
+        if not item:
+            (_, item) = self.__engine.container(containerID=containerID)
+        return (item or {}).get('ImageID', '').replace('sha256:', '')
+
+    # containerShell() Shell for attaching to [containerID] (see containerShellList), the first one available in its image.
+    #                  All of them are probed with a single exec, the result is cached by image ID (same image, same files)
+    # @return (string|None) Shell path, None when the probe fails (no /bin/sh in the image, container not running)
+    def containerShell(self, containerID=''):
+        import subprocess
+        imageID = self.__containerImage(containerID)
+        shells  = self.__cache.setdefault('shells', {})
+        if imageID in shells:
+            return shells[imageID]
+        probe = ' || '.join(f'command -v {shell}' for shell in self.containerShellList)
+        (errorCode, output) = argvExec([self.__platform, 'exec', containerID, '/bin/sh', '-c', probe], prefix=getattr(self.__engine, 'terminal', None), stderr=subprocess.DEVNULL)
+        shell = next((line.strip() for line in output.splitlines() if line.strip() in self.containerShellList), None) if errorCode == 0 else None
+        if shell:
+            self.containerShellSet(containerID=containerID, shell=shell, imageID=imageID)
+        return shell
+
+    # containerShellSet() Remember [shell] for the image of [containerID] (shell found without the probe)
+    def containerShellSet(self, containerID='', shell='', imageID=None):
+        imageID = imageID or self.__containerImage(containerID)
+        if not imageID:
+            return
+        shells = self.__cache.setdefault('shells', {})
+        shells.pop(imageID, None)
+        shells[imageID] = shell
+        while len(shells) > SHELLS_CACHED:                  # Oldest ones first
+            shells.pop(next(iter(shells)))
+
+    # Logs() Container output read in background, see forkliftlib.logview
+    # @param follow   (bool) Follow new lines keeping the last LOG_LINES only, whole log otherwise
+    # @param listener (callable) [optional] Called from the reader thread each time new lines are available
+    # @return (LogBuffer|LogFile|None) Logs source for bless.pager(), None when logs are not available
+    def Logs(self, containerID='', follow=False, listener=None):
+        from forkliftlib.logview import LogBuffer, LogFile, LOG_LINES      # Lazy, logs viewer only
+        stream = self.__engine.logs(containerID=containerID, follow=follow, tail=LOG_LINES if follow else None)
+        if not stream:
+            return None
+        if follow:
+            return LogBuffer(stream=stream, listener=listener)
+        return LogFile(stream=stream, listener=listener)
+
+    # LogsMerged() Many containers followed at once, their lines interleaved by timestamp
+    # @param containers (list) [(containerID, name)]
+    # @return (LogMerge|None) Logs source for bless.pager(), None when no logs are available
+    def LogsMerged(self, containers=[], listener=None):
+        from forkliftlib.logview import LogMerge, LOG_MERGE_TAIL
+        streams = []
+        for (containerID, name) in containers:
+            stream = self.__engine.logs(containerID=containerID, follow=True, tail=LOG_MERGE_TAIL, timestamps=True)
+            if stream:
+                streams.append((name, stream))
+        if not streams:
+            return None
+        return LogMerge(streams=streams, listener=listener)
 
     def Stop(self, containerID=''):
-        (_, output) = self.__exec(f"{self.__platform} stop {containerID}", stderr=subprocess.PIPE)
+        (_, output) = self.__engine.stop(containerID=containerID)
         return output.strip()
 
     def Kill(self, containerID=''):
-        (_, output) = self.__exec(f"{self.__platform} kill {containerID}", stderr=subprocess.PIPE)
+        (_, output) = self.__engine.kill(containerID=containerID)
         return output.strip()
 
     def Rename(self, containerID='', nameNew=None):
-        (_, output) = self.__exec(f"{self.__platform} rename {containerID} {nameNew}", stderr=subprocess.PIPE)
+        (_, output) = self.__engine.rename(containerID=containerID, nameNew=nameNew)
         return output.strip()
 
     def Remove(self, containerID=''):
-        (errorCode, output) = self.__exec(f"{self.__platform} rm {containerID}", stderr=subprocess.PIPE)
+        (errorCode, output) = self.__engine.remove(containerID=containerID)
         return (errorCode, output.strip())
 
+    # Bulk() Execute [action] (see BULK_ACTIONS) on all [IDs] concurrently, single batch calls when the engine supports them
+    # @param progress (callable) [optional] progress(BulkResult, done, total) called as soon as each item is done
+    # @return (list, float) [BulkResult list, total elapsed seconds]
+    def Bulk(self, action='stop', IDs=[], workers=BULK_WORKERS, progress=None):
+        (method, command) = BULK_ACTIONS[action]
+        if hasattr(self.__engine, 'batch'):
+            return bulkBatch(function=lambda chunk: self.__engine.batch(action=command, IDs=chunk), items=IDs, workers=workers, progress=progress)
+        engineMethod = getattr(self.__engine, method)
+        return bulkRun(function=lambda ID: engineMethod(ID), items=IDs, workers=workers, progress=progress)
+
+    # Containers states by ID from the lists in memory, empty when they're not there (details are not cached then)
+    def __containerStates(self):
+        if not self.__state or not self.__state.ready:
+            return {}
+        return {item['Id']: item.get('State') for item in self.__state.containers()}
+
+    # Details cached for container [ID] are dropped on its events (restart, rename, update, ... might not change its state),
+    # all of them when events have been lost. Called from the events thread, details being fetched meanwhile are not stored
+    def __inspectForget(self, itemType, ID):
+        with self.__inspectLock:
+            if itemType is None:
+                self.__inspected = {}
+            elif itemType == 'container':
+                self.__inspected = {key: cached for (key, cached) in self.__inspected.items() if not key.startswith(ID)}   # Event IDs might be shortened
+            else:
+                return
+            self.__inspectEpoch += 1
+
+    # Store fetched [details] ({ID: (state, details)}) unless events came in after [epoch], drop containers not in [states]
+    def __inspectStore(self, details={}, epoch=0, states=None):
+        with self.__inspectLock:
+            inspected = dict(self.__inspected)
+            if epoch == self.__inspectEpoch:
+                inspected.update(details)
+            if states:                                      # Containers gone, their details too
+                inspected = {ID: cached for (ID, cached) in inspected.items() if ID in states}
+            self.__inspected = inspected
+
+    # Inspect() Container details ("inspect" output), cached by container ID and state until one of its events
+    # @return (int, dict|None) [returnCode, details (None when it does not exist)]
+    def Inspect(self, containerID=''):
+        state  = self.__containerStates().get(containerID)
+        (cached, epoch) = (self.__inspected.get(containerID), self.__inspectEpoch)
+        if state and cached and cached[0] == state:
+            return (0, cached[1])
+        (errorCode, details) = self.__engine.inspect(containerID=containerID)
+        if errorCode == 0 and details and state:
+            self.__inspectStore({containerID: (state, details)}, epoch)
+        return (errorCode, details)
+
+    # InspectMany() Details of containers [IDs], cached ones as they are and the others concurrently through
+    #               forkliftlib.asynccontainer, at most [limit] engine calls at a time
+    # @return (dict) {ID: details}, containers not found (or failed) are left out
+    def InspectMany(self, IDs=[], limit=BULK_WORKERS):
+        states  = self.__containerStates()
+        (inspected, epoch) = (self.__inspected, self.__inspectEpoch)
+        details = {}
+        for ID in IDs:
+            cached = inspected.get(ID)
+            if states.get(ID) and cached and cached[0] == states[ID]:
+                details[ID] = cached[1]
+        missing = [ID for ID in dict.fromkeys(IDs) if ID not in details]
+        fetched = {}
+        if missing:
+            from forkliftlib.asynccontainer import inspectGather      # Lazy, asyncio is not needed before
+            fetched = inspectGather(engine=self.__engine, IDs=missing, limit=limit)
+            details.update(fetched)
+        self.__inspectStore({ID: (states[ID], item) for (ID, item) in fetched.items() if states.get(ID)}, epoch, states)
+        return details
+
+    # Prefetch() Details of running containers (at most [limit]) loaded at once, see InspectMany(). Nothing is
+    #            loaded through agents and daemons: each call is a round trip and the daemon is shared by many clients
+    # @return (int) Containers details in the cache
+    def Prefetch(self, limit=INSPECT_PREFETCH):
+        if hasattr(self.__engine, 'state'):
+            return len(self.__inspected)
+        (errorCode, items) = self.__containers()
+        running = [item['Id'] for item in items if str(item.get('State', '')).lower() == 'running'] if errorCode == 0 else []
+        self.InspectMany(running[:limit])
+        return len(self.__inspected)
+
+    # Storage() Images layers accounting and reclaimable items, see forkliftlib.storage
+    # @return (int, StorageReport|string) [returnCode, report or error message]
+    def Storage(self):
+        from forkliftlib.storage import storageAnalyze               # Lazy, storage view only
+        (errorImages, images) = self.__images()
+        (errorContainers, containers) = self.__containers()
+        if errorImages != 0 or errorContainers != 0:
+            return (errorImages or errorContainers, 'Cannot list containers and images')
+        return storageAnalyze(engine=self.__engine, images=images, containers=containers)
+
+    # StoragePrune() Remove reclaimable [items] (StorageItem list) in a single operation: containers, images and then
+    #                volumes, a single batch call for each kind when the engine supports them
+    # @param progress (callable) [optional] progress(BulkResult, done, total), result item is the StorageItem
+    # @return (list, float) [BulkResult list (items are StorageItem), total elapsed seconds]
+    def StoragePrune(self, items=[], progress=None):
+        from forkliftlib.storage import STORAGE_KINDS, STORAGE_ACTIONS
+        timeStart = time.monotonic()
+        results = []
+        for kind in STORAGE_KINDS:
+            byID = {item.ID: item for item in items if item.kind == kind}
+            if not byID:
+                continue
+            def kindProgress(result, done, total, offset=len(results)):
+                result.item = byID.get(result.item, result.item)
+                if progress:
+                    progress(result, offset+done, len(items))
+            (done, _) = self.Bulk(action=STORAGE_ACTIONS[kind], IDs=list(byID), workers=1 if hasattr(self.__engine, 'batch') else BULK_WORKERS, progress=kindProgress)
+            for result in done:
+                result.item = byID.get(result.item, result.item)
+            results += done
+        return (results, time.monotonic()-timeStart)
+
     def containerProfilesList(self):
         return self.__containerProfiles.items()
 
@@ -165,59 +428,34 @@ class Container(object):
     def imageProfilesList(self):
         return self.__imageProfiles.items()
 
+    # imagesList() Images list rows, one for each image name (image ID for images without names)
+    # @return (list, string) [ImageRecord items (label, name, repository), label format] (empty list on errors)
     def imagesList(self):
-        (errorCode, output) = self.__exec(f"{self.__platform} images -a --format=json")
+        (errorCode, jsonData) = self.__images()
         if errorCode != 0:
             return []
-        jsonData = json.loads(output)
-        lenRepository = lenTag = lenSize = 0
-        items = {}
-        for item in jsonData:
-            repository = tag = '<none>'
-            if 'Names' in item and len(item['Names'])>0:
-                for itemName in item['Names']:
-                    if len(itemName.rsplit(":", 1)) >= 2:
-                        [repository, tag] = itemName.rsplit(":", 1)
-                    if len(repository) > lenRepository:
-                        lenRepository = len(repository)
-                    if len(tag) > lenTag:
-                        lenTag = len(tag)
-                    [created, _] = item['CreatedAt'].split("T")
-                    size = math.floor(item['Size']/1000000)
-                    items[itemName] = {'idShort': item['Id'][:12], 'repository': repository, 'tag': tag, 'created': created, 'size': size}
-            else:       # <none> image name
-                itemName = item['Id']
-                repository = tag = "<none>"
-                [created, _] = item['CreatedAt'].split("T")
-                size = math.floor(item['Size']/1000000)
-                items[itemName] = {'idShort': item['Id'][:12], 'repository': repository, 'tag': tag, 'created': created, 'size': size}
-            if len(str(size)) > lenSize:
-                lenSize = len(str(size))
-        results = []
-        formatFields = f"{{repository:<{lenRepository}}} {{tag:<{lenTag}}} {{id:12}} {{created:10}} {{size:>{lenSize+1}}}"
-        for item in items:
-            label = formatFields.format(
-                        repository=items[item]['repository'],
-                        tag = items[item]['tag'],
-                        id = items[item]['idShort'],
-                        created = items[item]['created'],
-                        size = str(items[item]['size']),
-            )
-            results.append((label, item, items[item]['repository']))
-        return (results, formatFields)
+        return imageRecords(jsonData)
 
     def imageRename(self, imageIDOld=None, imageNameNew=None):
         if not imageIDOld:
             return 'Cannot rename from an empty image name'
-        (_, output) = self.__exec(f"{self.__platform} tag '{imageIDOld}' '{imageNameNew}'", stderr=subprocess.PIPE)
+        (_, output) = self.__engine.imageTag(imageID=imageIDOld, imageName=imageNameNew)
         if output.strip()=='':
             (_, output) = self.imageRemove(imageID=imageIDOld)
             if output.lower().startswith("untagged:"):          # I'm not interested in output message like: 'Untagged: ...'
                 return ''
         return output.strip()
 
+    # imageLabels() Labels of image [imageID] (ID or name)
+    # @return (dict) Image labels, empty when it has none or it does not exist
+    def imageLabels(self, imageID=None):
+        (errorCode, item) = self.__engine.image(imageID=imageID)
+        if errorCode != 0 or not item:
+            return {}
+        return item.get('Labels') or {}
+
     def imageRemove(self, imageID=None):
         if not imageID:
             return (-1, '')
-        (errorCode, output) = self.__exec(f"{self.__platform} rmi {imageID}", stderr=subprocess.PIPE)
+        (errorCode, output) = self.__engine.imageRemove(imageID=imageID)
         return (errorCode, output.strip())
@@ -0,0 +1,149 @@
+# -*- coding: utf-8 -*-
+#
+# @description      shared state daemon, many text UIs on the same engine connection
+#
+# @author           Andrea Benini
+# @date             2026-10-17
+# @license          GNU Affero General Public License v3.0
+# @see              forklift --daemon owns the engine connection and its StateStore, each forklift
+#                   started on the same host attaches to its UNIX socket and receives the snapshot and
+#                   then the changes only (same protocol of the remote agent, see forkliftlib.agent).
+#                   Engine load doesn't grow with the number of users, forklift falls back to its own
+#                   engine connection when the daemon is not there. Sharing it among many users: socket in
+#                   a directory owned by the daemon account and writable by it only (/run/forklift), socket
+#                   group is DAEMON_GROUP (read/write): its members attach to it and act on its engine
+#
+# pyright: reportMissingImports=false
+#
+import os
+import grp
+import stat
+import socket
+import signal
+import struct
+import socketserver
+
+from forkliftlib.agent    import EngineAgent, AGENT_TIMEOUT
+from forkliftlib.protocol import DAEMON_SOCKET, DAEMON_GROUP
+
+
+DAEMON_MODE    = 0o660                  # Socket permissions, users in the daemon group (DAEMON_GROUP) can attach
+DAEMON_TIMEOUT = 10                     # Seconds, clients not reading their updates for so long are dropped
+
+
+class _DaemonHandler(socketserver.StreamRequestHandler):
+    def handle(self):
+        self.connection.setsockopt(socket.SOL_SOCKET, socket.SO_SNDTIMEO, struct.pack('ll', DAEMON_TIMEOUT, 0))
+        self.server.agent.serve(input=self.rfile, output=self.wfile, closer=self.__drop)
+
+    def __drop(self):
+        try:
+            self.connection.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+
+
+class _DaemonServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+
+# groupID() Numeric ID of group [name], None when it doesn't exist
+def groupID(name=DAEMON_GROUP):
+    try:
+        return grp.getgrnam(name).gr_gid
+    except KeyError:
+        return None
+
+# daemonTrusted() Socket [path] created by the owner of its directory, a directory only that owner can write to (never
+#                 group or world writable): nobody else could have planted it. It's trusted when it belongs to this
+#                 user or root, or when its group is [group] (users are added to it by administrators, see README).
+#                 Runtime commands are built from what the daemon says, other sockets are never used
+# @return (int, string) [returnCode, error message]
+def daemonTrusted(path=DAEMON_SOCKET, group=DAEMON_GROUP):
+    directory = os.path.dirname(os.path.abspath(path))
+    try:
+        (item, parent) = (os.lstat(path), os.lstat(directory))
+    except OSError as E:
+        return (-1, f'Cannot check {path}: {str(E)}')
+    if not stat.S_ISSOCK(item.st_mode):
+        return (-1, f'{path} is not a socket')
+    if not stat.S_ISDIR(parent.st_mode):
+        return (-1, f'{directory} is not a directory')
+    if parent.st_mode & (stat.S_IWGRP | stat.S_IWOTH):
+        return (-1, f'{directory} is writable by other users')
+    if parent.st_uid not in (item.st_uid, 0):
+        return (-1, f'{path} does not belong to the owner of {directory}')
+    if item.st_uid not in (os.getuid(), 0) and item.st_gid != groupID(group):
+        return (-1, f'{path} belongs to another user (uid {item.st_uid}) and not to the {group} group')
+    return (0, '')
+
+# daemonRun() Serve [agent] (AgentServer) on UNIX socket [path] until interrupted, socket group is [group] when it exists
+# @return (int, string) [returnCode, outputMessage]
+def daemonRun(agent=None, path=DAEMON_SOCKET, mode=DAEMON_MODE, group=DAEMON_GROUP):
+    if os.path.lexists(path):
+        (errorCode, message) = daemonTrusted(path, group)   # Stale sockets only, never files or planted sockets
+        if errorCode != 0:
+            return (errorCode, message)
+        try:                                            # Another daemon, or a stale socket left by a dead one
+            with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as probe:
+                probe.connect(path)
+            return (-1, f'Daemon already running on {path}')
+        except OSError:
+            pass
+        try:
+            os.unlink(path)
+        except OSError as E:
+            return (-1, f'Cannot remove stale socket {path}: {str(E)}')
+    directory = os.path.dirname(os.path.abspath(path))
+    try:
+        os.makedirs(directory, mode=0o755, exist_ok=True)
+        if os.lstat(directory).st_mode & (stat.S_IWGRP | stat.S_IWOTH):
+            return (-1, f'{directory} is writable by other users, clients would not attach to {path}')
+    except OSError as E:
+        return (-1, f'Cannot create {directory}: {str(E)}')
+    umask = os.umask(0o777 & ~mode)
+    try:
+        server = _DaemonServer(path, _DaemonHandler)
+    except OSError as E:
+        return (-1, f'Cannot listen on {path}: {str(E)}')
+    finally:
+        os.umask(umask)
+    if groupID(group) is not None:
+        try:                                            # Members of the daemon group attach to it
+            os.chown(path, -1, groupID(group))
+        except OSError:
+            pass
+    server.agent = agent
+    signal.signal(signal.SIGTERM, signal.default_int_handler)      # Socket is removed on kill too
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        try:
+            os.unlink(path)
+        except OSError:
+            pass
+    return (0, '')
+
+
+# daemonAttach() Connection to the daemon on [path], only when it's trusted (see daemonTrusted())
+# @return EngineAgent|None None when the daemon is not available
+def daemonAttach(path=DAEMON_SOCKET, timeout=AGENT_TIMEOUT):
+    if not os.path.exists(path) or daemonTrusted(path)[0] != 0:
+        return None
+    connection = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        connection.connect(path)
+    except OSError:
+        connection.close()
+        return None
+    def closer():
+        try:
+            connection.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+        connection.close()
+    engine = EngineAgent(input=connection.makefile('rb'), output=connection.makefile('wb'), closer=closer, prefix='', terminal='', kind='daemon')
+    return engine if engine.start(timeout=timeout) else None
@@ -0,0 +1,726 @@
+# -*- coding: utf-8 -*-
+#
+# @description      container engine backends
+#
+# @author           Andrea Benini
+# @date             2026-10-17
+# @license          GNU Affero General Public License v3.0
+# @see              Pluggable backends used by the Container class for talking with the runtime.
+#                   EngineSocket speaks the Docker compatible REST API (served by both podman
+#                   and docker) over a UNIX socket with persistent keep-alive connections,
+#                   EngineCLI is the classic fallback forking the runtime executable.
+#                   Both return runtime data with the same layout of "ps|images --format=json"
+#
+# pyright: reportMissingImports=false
+#
+import os
+import re
+import time
+import select
+import struct
+import socket
+import threading
+import urllib.parse
+
+from forkliftlib.execute import argvExec, commandArgv, commandName, execStats
+
+
+SOCKET_TIMEOUT = 30                     # Seconds, single API request
+SERVICE_TIMEOUT = 300                   # Seconds, idle time before an on demand "podman system service" quits
+SERVICE_WAIT = 3                        # Seconds, max wait for the on demand service socket
+CONNECTIONS_IDLE = 8                    # Max idle keep-alive connections kept by EngineSocket (one per concurrent caller)
+CLI_CHUNK = 200                         # Max items in a single runtime command line (EngineCLI)
+REQUEST_IDEMPOTENT = ['GET', 'HEAD']    # API requests sent again after a connection error (EngineSocket)
+SIZE_UNITS = {'': 1, 'b': 1, 'kb': 1000, 'mb': 1000**2, 'gb': 1000**3, 'tb': 1000**4, 'kib': 1024, 'mib': 1024**2, 'gib': 1024**3, 'tib': 1024**4}
+
+
+# @return (int, string) [returnCode, outputMessage]
+def shellExec(command=None, stderr=None):
+    import subprocess                   # Lazy, socket backend never forks anything
+    try:
+        process = subprocess.Popen(command, stdout=subprocess.PIPE, stderr=stderr, shell=True, universal_newlines=True)
+        outputStream, errorStream = process.communicate()
+        if not errorStream:
+            errorStream=''
+        return (process.returncode, outputStream+errorStream)
+    except subprocess.CalledProcessError as E:
+        return (-1, str(E))
+
+
+# Candidate API sockets for [platform], first existing one wins
+def socketCandidates(platform=None):
+    runtimeDir = os.getenv('XDG_RUNTIME_DIR') or f'/run/user/{os.getuid()}'
+    sockets = []
+    for variable in ['FORKLIFT_SOCKET', 'CONTAINER_HOST', 'DOCKER_HOST']:
+        value = os.getenv(variable, '')
+        if value.startswith('unix://'):
+            sockets.append(value[len('unix://'):])
+        elif value.startswith('/'):
+            sockets.append(value)
+    if platform == 'podman':
+        if os.getuid() != 0:
+            sockets.append(runtimeDir+'/podman/podman.sock')
+        sockets.append('/run/podman/podman.sock')
+    elif platform == 'docker':
+        sockets += ['/var/run/docker.sock', '/run/docker.sock', runtimeDir+'/docker.sock']
+    return sockets
+
+
+# engineOpen() Pick the best available engine for [platform]
+# @param platform   (string) Container runtime name (podman, docker, ...)
+# @param socketPath (string) [optional] Explicit API socket, no other candidates are evaluated
+# @param service    (bool)   Start "podman system service" on demand when no podman socket is available
+# @return EngineSocket|EngineCLI|None
+def engineOpen(platform=None, socketPath=None, service=True):
+    if socketPath:
+        engine = EngineSocket(path=socketPath, platform=platform)
+        return engine if engine.valid else None
+    for path in socketCandidates(platform):
+        if os.path.exists(path):
+            engine = EngineSocket(path=path, platform=platform)
+            if engine.valid:
+                return engine
+    if platform == 'podman' and service:
+        engine = EngineSocket.serviceStart(platform=platform)
+        if engine:
+            return engine
+    if platform:
+        return EngineCLI(platform=platform)
+    return None
+
+
+# Normalize items from the API to the same layout provided by "<runtime> ps -a --format=json"
+def _containerNormalize(item):
+    command = item.get('Command') or []
+    if isinstance(command, str):
+        command = [command]
+    created = item.get('CreatedAt') or item.get('Created') or ''
+    if isinstance(created, (int, float)):
+        created = time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(created))
+    return {
+        'Id':        item.get('Id', ''),
+        'Names':     [name.lstrip('/') for name in (item.get('Names') or [])],
+        'Image':     item.get('Image', ''),
+        'ImageID':   item.get('ImageID', '').replace('sha256:', ''),
+        'State':     item.get('State', ''),
+        'CreatedAt': created,
+        'Command':   command,
+    }
+
+# Normalize items from the API to the same layout provided by "<runtime> images -a --format=json"
+def _imageNormalize(item):
+    names = [name for name in (item.get('RepoTags') or item.get('Names') or []) if name != '<none>:<none>']
+    created = item.get('Created', 0)
+    if isinstance(created, (int, float)):
+        created = time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime(created))
+    return {
+        'Id':        item.get('Id', '').replace('sha256:', ''),
+        'Names':     names,
+        'CreatedAt': created,
+        'Size':      item.get('Size', 0),
+        'Labels':    item.get('Labels') or (item.get('Config') or {}).get('Labels') or {},
+    }
+
+
+# Histogram key of an API request (see forkliftlib.execute), IDs and names are left out: "POST /containers/{id}/stop"
+def _requestName(method='GET', url='/'):
+    parts = url.partition('?')[0].split('/')
+    if len(parts) > 2 and parts[1] in ('containers', 'images', 'networks', 'volumes') and parts[2] != 'json':
+        parts[2] = '{id}'
+    return f"{method} {'/'.join(parts)}"
+
+# Runtime JSON output: a single array (podman "--format=json") or one object for each line (docker "{{json .}}")
+def _jsonItems(output=''):
+    import json
+    try:
+        data = json.loads(output)
+    except ValueError:
+        return [json.loads(line) for line in output.splitlines() if line.strip().startswith('{')]
+    return data if isinstance(data, list) else [data]
+
+# Bytes from runtime sizes: 1234, "1234", "12.3kB", "0B (virtual 45MB)"
+def _sizeParse(value=0):
+    if isinstance(value, (int, float)):
+        return int(value)
+    match = re.match(r'\s*([\d.]+)\s*([a-zA-Z]*)', str(value))
+    if not match:
+        return 0
+    return int(float(match.group(1)) * SIZE_UNITS.get(match.group(2).lower(), 1))
+
+
+# Normalize engine events (podman CLI and docker/libpod API layouts) to: {Type, Action, ID, Name}
+def _eventNormalize(item):
+    actor = item.get('Actor') or {}
+    attributes = actor.get('Attributes') or item.get('Attributes') or {}
+    return {
+        'Type':   str(item.get('Type') or item.get('type') or '').lower(),
+        'Action': str(item.get('Action') or item.get('Status') or item.get('status') or '').lower(),
+        'ID':     str(actor.get('ID') or item.get('ID') or item.get('id') or '').replace('sha256:', ''),
+        'Name':   attributes.get('name') or item.get('Name') or '',
+    }
+
+
+# Long lived engine event subscription, iterate it for normalized events, close() it from any thread
+class EventStream(object):
+    def __init__(self, lines=None, closer=None):
+        self.__lines  = lines
+        self.__closer = closer
+
+    def __iter__(self):
+        import json
+        for line in self.__lines:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                yield _eventNormalize(json.loads(line))
+            except ValueError:
+                continue
+
+    def close(self):
+        try:
+            self.__closer()
+        except OSError:
+            pass
+
+
+# Container output, iterate it for raw bytes blocks (stdout and stderr mixed), close() it from any thread
+class LogStream(object):
+    def __init__(self, chunks=None, closer=None):
+        self.__chunks = chunks
+        self.__closer = closer
+
+    def __iter__(self):
+        return iter(self.__chunks)
+
+    def close(self):
+        try:
+            self.__closer()
+        except OSError:
+            pass
+
+
+# Logs API output is multiplexed (8 bytes header: stream, 0, 0, 0, size) for containers without a tty, raw otherwise
+def _logsDemultiplex(response):
+    header = response.read(8)
+    if len(header) == 8 and header[0] in (0, 1, 2) and header[1:4] == b'\0\0\0':
+        while len(header) == 8:
+            (size,) = struct.unpack('>I', header[4:])
+            if size:
+                yield response.read(size)
+            header = response.read(8)
+        return
+    if header:
+        yield header
+    for chunk in iter(lambda: response.read1(65536), b''):
+        yield chunk
+
+
+# _unixConnection() HTTP connection to the API socket [path]. http.client (and its email.* chain, the biggest import
+#                   of the whole program) is imported with the first one, CLI backend sessions never load it
+def _unixConnection(path='', timeout=SOCKET_TIMEOUT):
+    global _UnixHTTPConnection
+    if not _UnixHTTPConnection:
+        import http.client
+        class UnixHTTPConnection(http.client.HTTPConnection):
+            def __init__(self, path, timeout=SOCKET_TIMEOUT):
+                super().__init__('localhost', timeout=timeout)
+                self.__path = path
+
+            def connect(self):
+                sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+                sock.settimeout(self.timeout)
+                sock.connect(self.__path)
+                self.sock = sock
+        _UnixHTTPConnection = UnixHTTPConnection
+    return _UnixHTTPConnection(path, timeout=timeout)
+
+_UnixHTTPConnection = None
+
+
+class EngineSocket(object):
+    def __init__(self, path=None, platform=None, timeout=SOCKET_TIMEOUT):
+        self.__path       = path
+        self.__platform   = platform
+        self.__timeout    = timeout
+        self.__lock       = threading.Lock()
+        self.__idle       = []          # Idle keep-alive connections, sequential callers always reuse the same one
+        self.__isValid    = False
+        (status, headers, _) = self.__request('GET', '/_ping', headersGet=True)
+        if status == 200:
+            self.__isValid = True
+            if not self.__platform:
+                self.__platform = 'podman' if 'libpod-api-version' in headers else 'docker'
+
+    # On demand "podman system service" for rootless (or rootful) hosts without an active socket
+    # @return EngineSocket|None
+    @staticmethod
+    def serviceStart(platform='podman'):
+        if os.getuid() != 0:
+            runtimeDir = os.getenv('XDG_RUNTIME_DIR') or f'/run/user/{os.getuid()}'
+            path = runtimeDir+'/podman/podman.sock'
+        else:
+            path = '/run/podman/podman.sock'
+        import subprocess
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            process = subprocess.Popen([platform, 'system', 'service', f'--time={SERVICE_TIMEOUT}', 'unix://'+path],
+                             stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, start_new_session=True)
+        except OSError:
+            return None
+        timeLimit = time.monotonic() + SERVICE_WAIT
+        while time.monotonic() < timeLimit and process.poll() is None:
+            if os.path.exists(path):
+                engine = EngineSocket(path=path, platform=platform)
+                if engine.valid:
+                    return engine
+            time.sleep(0.05)
+        return None
+
+    @property
+    def name(self):
+        return 'socket'
+    @property
+    def platform(self):
+        return self.__platform
+    @property
+    def path(self):
+        return self.__path
+    @property
+    def valid(self):
+        return self.__isValid
+
+    def close(self):
+        with self.__lock:
+            for connection in self.__idle:
+                connection.close()
+            self.__idle = []
+
+    # Idle keep-alive [connection] closed by the engine meanwhile: readable (EOF) before anything has been asked
+    @staticmethod
+    def __dropped(connection):
+        if connection.sock is None:
+            return True
+        try:
+            return bool(select.select([connection.sock], [], [], 0)[0])
+        except (OSError, ValueError):
+            return True
+
+    # __request() Single HTTP request on a persistent connection. Idle connections dropped by the engine are detected
+    #             before using them, a failed request is sent again only when it's idempotent (GET, HEAD) or when it has
+    #             not been sent at all: actions (stop, kill, rm, rename, ...) are never executed twice
+    # @return (int, dict|list|string, ...) [HTTP status (0 on connection errors), response headers (headersGet only), response body]
+    def __request(self, method='GET', url='/', body=None, headersGet=False):
+        import json                     # Lazy (like subprocess below), engine answers come after the first frame
+        import http.client
+        headers = {'Host': 'localhost'}
+        if body is not None:
+            body = json.dumps(body)
+            headers['Content-Type'] = 'application/json'
+        with self.__lock:
+            connection = self.__idle.pop() if self.__idle else None
+        if connection and self.__dropped(connection):
+            connection.close()
+            connection = None
+        timeStart = time.monotonic()
+        for attempt in range(0, 2):
+            sent = False
+            try:
+                if not connection:
+                    connection = _unixConnection(self.__path, timeout=self.__timeout)
+                    connection.connect()
+                connection.request(method, url, body=body, headers=headers)
+                sent = True
+                response = connection.getresponse()
+                data = response.read()
+                break
+            except (OSError, http.client.HTTPException) as E:
+                connection.close()
+                connection = None
+                if attempt > 0 or (sent and method not in REQUEST_IDEMPOTENT):
+                    execStats.record(_requestName(method, url), time.monotonic()-timeStart, -1, 0)
+                    return (0, {}, str(E)) if headersGet else (0, str(E))
+        execStats.record(_requestName(method, url), time.monotonic()-timeStart, 0 if response.status < 400 else response.status, len(data))
+        with self.__lock:
+            if response.will_close or len(self.__idle) >= CONNECTIONS_IDLE:
+                connection.close()
+            else:
+                self.__idle.append(connection)
+        try:
+            data = json.loads(data) if data else ''
+        except ValueError:
+            data = data.decode(errors='replace')
+        if headersGet:
+            return (response.status, {k.lower(): v for k,v in response.getheaders()}, data)
+        return (response.status, data)
+
+    # Map an HTTP response to the (returnCode, outputMessage) convention used by the CLI
+    def __result(self, status, data, success=''):
+        if 200 <= status < 400:
+            return (0, success)
+        if isinstance(data, dict):
+            data = data.get('message', '')
+        return (status if status else -1, str(data))
+
+    @staticmethod
+    def __quote(value):
+        return urllib.parse.quote(str(value), safe='/:@')
+
+    def containers(self):
+        (status, data) = self.__request('GET', '/containers/json?all=1')
+        if status != 200 or not isinstance(data, list):
+            return (self.__result(status, data)[0] or -1, [])
+        return (0, [_containerNormalize(item) for item in data])
+
+    def images(self):
+        (status, data) = self.__request('GET', '/images/json?all=1')
+        if status != 200 or not isinstance(data, list):
+            return (self.__result(status, data)[0] or -1, [])
+        return (0, [_imageNormalize(item) for item in data])
+
+    # Single container, same layout of containers() items
+    # @return (int, dict|None) [returnCode, container (None when it does not exist anymore)]
+    def container(self, containerID=''):
+        import json
+        filters = urllib.parse.quote(json.dumps({'id': [containerID]}))
+        (status, data) = self.__request('GET', f'/containers/json?all=1&filters={filters}')
+        if status != 200 or not isinstance(data, list):
+            return (self.__result(status, data)[0] or -1, None)
+        return (0, _containerNormalize(data[0]) if data else None)
+
+    # Single image, same layout of images() items
+    # @return (int, dict|None) [returnCode, image (None when it does not exist anymore)]
+    def image(self, imageID=''):
+        (status, data) = self.__request('GET', f'/images/{self.__quote(imageID)}/json')
+        if status == 404:
+            return (0, None)
+        if status != 200 or not isinstance(data, dict):
+            return (self.__result(status, data)[0] or -1, None)
+        return (0, _imageNormalize(data))
+
+    # inspect() Container details, "inspect" output as it is
+    # @return (int, dict|None) [returnCode, details (None when it does not exist anymore)]
+    def inspect(self, containerID=''):
+        (status, data) = self.__request('GET', f'/containers/{self.__quote(containerID)}/json')
+        if status == 404:
+            return (0, None)
+        if status != 200 or not isinstance(data, dict):
+            return (self.__result(status, data)[0] or -1, None)
+        return (0, data)
+
+    # Event subscription on a dedicated connection, the persistent one is left for ordinary requests
+    # @return EventStream|None
+    def events(self):
+        import http.client
+        try:
+            connection = _unixConnection(self.__path, timeout=None)
+            connection.request('GET', '/events', headers={'Host': 'localhost'})
+            response = connection.getresponse()
+        except (OSError, http.client.HTTPException):
+            return None
+        if response.status != 200:
+            connection.close()
+            return None
+        def closer():                                   # Wakes up the reader, connection is then dropped
+            if connection.sock:
+                connection.sock.shutdown(socket.SHUT_RDWR)
+        return EventStream(lines=iter(response.readline, b''), closer=closer)
+
+    # logs() Container output, [follow] keeps the stream open for new lines until it's closed
+    # @param tail       (int) [optional] Last [tail] lines only, whole log when not set
+    # @param timestamps (bool) Each line starts with its RFC3339 timestamp and a space
+    # @return (LogStream|None) None when the container cannot be found
+    def logs(self, containerID='', follow=False, tail=None, timestamps=False):
+        import http.client
+        query = {'stdout': 1, 'stderr': 1, 'follow': int(bool(follow)), 'timestamps': int(bool(timestamps))}
+        if tail is not None:
+            query['tail'] = int(tail)
+        try:
+            connection = _unixConnection(self.__path, timeout=None if follow else self.__timeout)
+            connection.request('GET', f'/containers/{self.__quote(containerID)}/logs?'+urllib.parse.urlencode(query), headers={'Host': 'localhost'})
+            response = connection.getresponse()
+        except (OSError, http.client.HTTPException):
+            return None
+        if response.status != 200:
+            connection.close()
+            return None
+        def closer():
+            if connection.sock:
+                connection.sock.shutdown(socket.SHUT_RDWR)
+        return LogStream(chunks=_logsDemultiplex(response), closer=closer)
+
+    def stop(self, containerID=''):
+        (status, data) = self.__request('POST', f'/containers/{self.__quote(containerID)}/stop')
+        return self.__result(status, data, success=containerID)
+
+    def kill(self, containerID=''):
+        (status, data) = self.__request('POST', f'/containers/{self.__quote(containerID)}/kill')
+        return self.__result(status, data, success=containerID)
+
+    def rename(self, containerID='', nameNew=''):
+        (status, data) = self.__request('POST', f'/containers/{self.__quote(containerID)}/rename?'+urllib.parse.urlencode({'name': nameNew}))
+        return self.__result(status, data)
+
+    def remove(self, containerID=''):
+        (status, data) = self.__request('DELETE', f'/containers/{self.__quote(containerID)}')
+        return self.__result(status, data, success=containerID)
+
+    def restart(self, containerID=''):
+        (status, data) = self.__request('POST', f'/containers/{self.__quote(containerID)}/restart')
+        return self.__result(status, data, success=containerID)
+
+    def imageTag(self, imageID='', imageName=''):
+        (repository, _, tag) = imageName.rpartition(':')
+        if not repository or '/' in tag:            # No tag, "registry:port/image" like names
+            (repository, tag) = (imageName, 'latest')
+        (status, data) = self.__request('POST', f'/images/{self.__quote(imageID)}/tag?'+urllib.parse.urlencode({'repo': repository, 'tag': tag}))
+        return self.__result(status, data)
+
+    def imageRemove(self, imageID=''):
+        (status, data) = self.__request('DELETE', f'/images/{self.__quote(imageID)}')
+        if not (200 <= status < 400):
+            return self.__result(status, data)
+        if isinstance(data, dict):                  # libpod layout: {"Untagged": [...], "Deleted": [...]}
+            data = [{key: value} for key in ['Untagged', 'Deleted'] for value in (data.get(key) or [])]
+        output = []
+        for item in data if isinstance(data, list) else []:
+            for key in item:
+                output.append(f'{key}: {item[key]}')
+        return (0, '\n'.join(output))
+
+    # imageLayers() Layers (RootFS diff IDs, base first) of each image in [IDs]
+    # @return (int, dict) [returnCode, {ID: [layer digests]}], images not found are missing
+    def imageLayers(self, IDs=[]):
+        layers = {}
+        for ID in IDs:
+            (status, data) = self.__request('GET', f'/images/{self.__quote(ID)}/json')
+            if status == 404:
+                continue
+            if status != 200 or not isinstance(data, dict):
+                return (self.__result(status, data)[0] or -1, layers)
+            layers[ID] = list((data.get('RootFS') or {}).get('Layers') or [])
+        return (0, layers)
+
+    # imageHistory() Size of each [imageID] history entry, oldest first
+    # @return (int, list) [returnCode, sizes]
+    def imageHistory(self, imageID=''):
+        (status, data) = self.__request('GET', f'/images/{self.__quote(imageID)}/history')
+        if status != 200 or not isinstance(data, list):
+            return (self.__result(status, data)[0] or -1, [])
+        return (0, [_sizeParse(item.get('Size') or 0) for item in reversed(data)])
+
+    # containersSize() Writable layer size of each container
+    # @return (int, dict) [returnCode, {ID: bytes}]
+    def containersSize(self):
+        (status, data) = self.__request('GET', '/containers/json?all=1&size=1')
+        if status != 200 or not isinstance(data, list):
+            return (self.__result(status, data)[0] or -1, {})
+        return (0, {item.get('Id', ''): _sizeParse(item.get('SizeRw') or 0) for item in data})
+
+    # volumes() Volumes, their size (None: unknown) and usage (unused volumes are not mounted by any container)
+    # @return (int, list) [returnCode, [{Name, Mountpoint, Size, InUse}]]
+    def volumes(self):
+        import json
+        (status, data) = self.__request('GET', '/volumes')
+        if status != 200 or not isinstance(data, dict):
+            return (self.__result(status, data)[0] or -1, [])
+        filters = urllib.parse.quote(json.dumps({'dangling': ['true']}))
+        (status, unused) = self.__request('GET', f'/volumes?filters={filters}')
+        unused = {item.get('Name') for item in (unused.get('Volumes') or [])} if status == 200 and isinstance(unused, dict) else None
+        sizes = {}
+        (status, usage) = self.__request('GET', '/system/df')           # Sizes computed by the engine, when it can
+        if status == 200 and isinstance(usage, dict):
+            for item in usage.get('Volumes') or []:
+                size = (item.get('UsageData') or {}).get('Size', item.get('Size', -1))
+                if isinstance(size, int) and size >= 0:
+                    sizes[item.get('Name') or item.get('VolumeName')] = size
+        return (0, [{'Name': item.get('Name', ''), 'Mountpoint': item.get('Mountpoint', ''), 'Size': sizes.get(item.get('Name')),
+                     'InUse': None if unused is None else item.get('Name') not in unused} for item in (data.get('Volumes') or [])])
+
+    def volumeRemove(self, volumeName=''):
+        (status, data) = self.__request('DELETE', f'/volumes/{self.__quote(volumeName)}')
+        return self.__result(status, data, success=volumeName)
+
+
+class EngineCLI(object):
+    # @param prefix (string) [optional] Commands are executed through it, remote hosts: "ssh -o ... host"
+    def __init__(self, platform=None, prefix=None):
+        self.__platform = platform
+        self.__prefix   = prefix
+
+    @property
+    def name(self):
+        return 'cli'
+    @property
+    def platform(self):
+        return self.__platform
+    @property
+    def valid(self):
+        return self.__platform is not None
+
+    def close(self):
+        pass
+
+    # Runtime [arguments] output (no shell, see forkliftlib.execute), [quiet] drops its stderr (reads) instead of returning it (actions)
+    # @return (int, string) [returnCode, outputMessage]
+    def __exec(self, *arguments, quiet=False):
+        import subprocess
+        return argvExec([self.__platform, *arguments], prefix=self.__prefix, stderr=subprocess.DEVNULL if quiet else subprocess.PIPE)
+
+    def containers(self):
+        import json
+        (errorCode, output) = self.__exec('ps', '-a', '--format=json', quiet=True)
+        if errorCode != 0:
+            return (errorCode, [])
+        return (0, json.loads(output))
+
+    def images(self):
+        import json
+        (errorCode, output) = self.__exec('images', '-a', '--format=json', quiet=True)
+        if errorCode != 0:
+            return (errorCode, [])
+        return (0, json.loads(output))
+
+    def container(self, containerID=''):
+        import json
+        (errorCode, output) = self.__exec('ps', '-a', '--filter', f'id={containerID}', '--format=json', quiet=True)
+        if errorCode != 0:
+            return (errorCode, None)
+        items = json.loads(output)
+        return (0, items[0] if items else None)
+
+    def image(self, imageID=''):
+        import json
+        (errorCode, output) = self.__exec('image', 'inspect', imageID, quiet=True)
+        if errorCode != 0:
+            return (0, None)
+        items = json.loads(output)
+        return (0, _imageNormalize(items[0]) if items else None)
+
+    def inspect(self, containerID=''):
+        (errorCode, output) = self.__exec('container', 'inspect', containerID, quiet=True)
+        try:
+            items = _jsonItems(output) if output.strip() else None
+        except ValueError:
+            items = None
+        if items is None:                           # Missing containers are an empty list, no list at all is a failure
+            return (errorCode or -1, None)
+        return (0, items[0] if items else None)
+
+    # @return EventStream|None
+    def events(self):
+        import subprocess
+        eventFormat = 'json' if self.__platform == 'podman' else '{{json .}}'
+        try:
+            process = subprocess.Popen(commandArgv([self.__platform, 'events', '--format', eventFormat], self.__prefix), stdin=subprocess.DEVNULL,
+                                       stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, universal_newlines=True)
+        except OSError:
+            return None
+        return EventStream(lines=process.stdout, closer=process.terminate)
+
+    def logs(self, containerID='', follow=False, tail=None, timestamps=False):
+        import subprocess
+        options = (['--follow'] if follow else []) + (['--tail', str(int(tail))] if tail is not None else []) + (['--timestamps'] if timestamps else [])
+        try:
+            process = subprocess.Popen(commandArgv([self.__platform, 'logs', *options, containerID], self.__prefix), stdin=subprocess.DEVNULL,
+                                       stdout=subprocess.PIPE, stderr=subprocess.STDOUT)
+        except OSError:
+            return None
+        def closer():
+            process.terminate()
+            try:
+                process.wait(timeout=1)
+            except subprocess.TimeoutExpired:
+                process.kill()
+        return LogStream(chunks=iter(lambda: process.stdout.read1(65536), b''), closer=closer)
+
+    def stop(self, containerID=''):
+        return self.__exec('stop', containerID)
+
+    def kill(self, containerID=''):
+        return self.__exec('kill', containerID)
+
+    def rename(self, containerID='', nameNew=''):
+        return self.__exec('rename', containerID, nameNew)
+
+    def remove(self, containerID=''):
+        return self.__exec('rm', containerID)
+
+    def restart(self, containerID=''):
+        return self.__exec('restart', containerID)
+
+    # batch() Same [action] on many items with a single runtime call (stop, kill, rm, restart, rmi)
+    # @return (list) [(returnCode, outputMessage)] one for each item in [IDs]
+    def batch(self, action='', IDs=[]):
+        import subprocess
+        argv = [self.__platform, *action.split(), *IDs]
+        timeStart = time.monotonic()
+        try:
+            process = subprocess.run(commandArgv(argv, self.__prefix), stdin=subprocess.DEVNULL, stdout=subprocess.PIPE, stderr=subprocess.PIPE, close_fds=False, universal_newlines=True)
+        except OSError as E:
+            return [(-1, str(E))] * len(IDs)
+        execStats.record(commandName(argv), time.monotonic()-timeStart, process.returncode, len(process.stdout)+len(process.stderr))
+        lines  = process.stdout.splitlines()
+        errors = process.stderr.splitlines()
+        results = []
+        for ID in IDs:                              # Runtime echoes each item done, errors are matched against their ID
+            output = [line for line in lines if ID in line]
+            if output or process.returncode == 0:
+                results.append((0, '\n'.join(output)))
+            else:
+                error = [line for line in errors if ID in line] or errors
+                results.append((process.returncode or -1, '\n'.join(error)))
+        return results
+
+    def imageTag(self, imageID='', imageName=''):
+        return self.__exec('tag', imageID, imageName)
+
+    def imageRemove(self, imageID=''):
+        return self.__exec('rmi', imageID)
+
+    # imageLayers() Layers of each image in [IDs], a single "image inspect" for each CLI_CHUNK images
+    def imageLayers(self, IDs=[]):
+        layers = {}
+        for index in range(0, len(IDs), CLI_CHUNK):
+            (errorCode, output) = self.__exec('image', 'inspect', *IDs[index:index+CLI_CHUNK], quiet=True)
+            try:
+                items = _jsonItems(output)
+            except ValueError:
+                return (errorCode or -1, layers)
+            for item in items:                      # Missing images make it fail, the others are still there
+                layers[item.get('Id', '').replace('sha256:', '')] = list((item.get('RootFS') or {}).get('Layers') or [])
+        return (0, layers)
+
+    def imageHistory(self, imageID=''):
+        (errorCode, output) = self.__exec('history', '--no-trunc', '--human=false', '--format', '{{.Size}}', imageID, quiet=True)
+        if errorCode != 0:
+            return (errorCode, [])
+        return (0, [_sizeParse(line) for line in reversed(output.splitlines()) if line.strip()])
+
+    def containersSize(self):
+        (errorCode, output) = self.__exec('ps', '-a', '--size', '--format=json', quiet=True)
+        try:
+            items = _jsonItems(output) if errorCode == 0 else []
+        except ValueError:
+            return (-1, {})
+        sizes = {}
+        for item in items:                          # podman: {"rwSize": ...}, docker: "12kB (virtual 45MB)"
+            size = item.get('Size') or 0
+            sizes[item.get('Id') or item.get('ID', '')] = _sizeParse(size.get('rwSize', 0) if isinstance(size, dict) else size)
+        return (errorCode, sizes)
+
+    def volumes(self):
+        (errorCode, output) = self.__exec('volume', 'ls', '--format=json', quiet=True)
+        try:
+            items = _jsonItems(output) if errorCode == 0 and output.strip() else []
+        except ValueError:
+            return (-1, [])
+        if errorCode != 0:
+            return (errorCode, [])
+        (errorCode, unused) = self.__exec('volume', 'ls', '--quiet', '--filter', 'dangling=true', quiet=True)
+        unused = set(unused.split()) if errorCode == 0 else None
+        return (0, [{'Name': item.get('Name', ''), 'Mountpoint': item.get('Mountpoint', ''), 'Size': None,
+                     'InUse': None if unused is None else item.get('Name') not in unused} for item in items])
+
+    def volumeRemove(self, volumeName=''):
+        return self.__exec('volume', 'rm', volumeName)
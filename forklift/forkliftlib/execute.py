@@ -0,0 +1,193 @@
+# -*- coding: utf-8 -*-
+#
+# @description      runtime commands execution without a shell, calls timings histogram
+#
+# @author           Andrea Benini
+# @date             2026-10-17
+# @license          GNU Affero General Public License v3.0
+# @see              Runtime commands are argv lists spawned directly: no /bin/sh in between and no quoting,
+#                   names and IDs are single arguments whatever they contain. Executables are resolved once
+#                   through $PATH, an absolute path with inherited descriptors lets subprocess use posix_spawn()
+#                   instead of fork()+exec(). Remote runtimes are reached through a prefix ("ssh ... host"),
+#                   the command is quoted once for the remote shell. Each call is recorded in execStats:
+#                   command, duration, exit code and output size, durations in a logarithmic histogram.
+#                   Engine API requests are recorded there too (see forkliftlib.engine.EngineSocket)
+#
+# pyright: reportMissingImports=false
+#
+import os
+import shlex
+import threading
+import time
+
+
+EXEC_BUCKETS = [0.001, 0.002, 0.005, 0.01, 0.02, 0.05, 0.1, 0.2, 0.5, 1, 2, 5, 10]      # Seconds, histogram upper bounds (one more bucket: slower)
+EXEC_GROUPS  = ['buildx', 'container', 'image', 'network', 'system', 'volume']          # Runtime commands with a subcommand
+EXEC_FAILED  = 127                      # Return code when the executable cannot be spawned (same as the shell)
+
+
+# Calls of a single command: count, errors, durations and output bytes
+class ExecStat(object):
+    __slots__ = ('name', 'calls', 'errors', 'elapsed', 'longest', 'size', 'buckets')
+    def __init__(self, name=''):
+        self.name    = name
+        self.calls   = 0
+        self.errors  = 0                # Non zero exit codes
+        self.elapsed = 0.0              # Seconds, all calls
+        self.longest = 0.0
+        self.size    = 0                # Output bytes, all calls
+        self.buckets = [0] * (len(EXEC_BUCKETS)+1)
+
+    @property
+    def mean(self):
+        return self.elapsed/self.calls if self.calls else 0.0
+
+    # percentile() Duration of the [percent] slowest calls, upper bound of its histogram bucket (the longest call for the last one)
+    def percentile(self, percent=50):
+        (rank, count) = (self.calls*percent/100, 0)
+        for (index, calls) in enumerate(self.buckets):
+            count += calls
+            if calls and count >= rank:
+                return min(EXEC_BUCKETS[index], self.longest) if index < len(EXEC_BUCKETS) else self.longest
+        return self.longest
+
+    def add(self, elapsed=0.0, returnCode=0, size=0):
+        self.calls   += 1
+        self.errors  += 1 if returnCode != 0 else 0
+        self.elapsed += elapsed
+        self.longest  = max(self.longest, elapsed)
+        self.size    += size
+        self.buckets[next((index for (index, bound) in enumerate(EXEC_BUCKETS) if elapsed < bound), len(EXEC_BUCKETS))] += 1
+
+    def merge(self, other=None):
+        self.calls   += other.calls
+        self.errors  += other.errors
+        self.elapsed += other.elapsed
+        self.longest  = max(self.longest, other.longest)
+        self.size    += other.size
+        self.buckets  = [mine+theirs for (mine, theirs) in zip(self.buckets, other.buckets)]
+
+
+# In memory calls histogram by command name, shared by all threads
+class ExecStats(object):
+    def __init__(self):
+        self.__lock  = threading.Lock()
+        self.__stats = {}
+
+    # record() One call of [name]: [elapsed] seconds, [returnCode], [size] output bytes
+    def record(self, name='', elapsed=0.0, returnCode=0, size=0):
+        with self.__lock:
+            stat = self.__stats.get(name)
+            if stat is None:
+                stat = self.__stats[name] = ExecStat(name)
+            stat.add(elapsed, returnCode, size)
+
+    # snapshot() Copy of the commands stats, slowest overall first
+    # @return (list) ExecStat list
+    def snapshot(self):
+        with self.__lock:
+            stats = []
+            for stat in self.__stats.values():
+                copy = ExecStat(stat.name)
+                copy.merge(stat)
+                stats.append(copy)
+        return sorted(stats, key=lambda stat: (-stat.elapsed, stat.name))
+
+    # total() All commands in a single ExecStat
+    def total(self):
+        total = ExecStat('total')
+        for stat in self.snapshot():
+            total.merge(stat)
+        return total
+
+    def reset(self):
+        with self.__lock:
+            self.__stats = {}
+
+execStats = ExecStats()
+
+
+# commandName() Histogram key of [argv]: executable name and its (sub)command, "podman image inspect"
+def commandName(argv=[]):
+    words = [os.path.basename(argv[0])] if argv else []
+    for argument in argv[1:]:
+        if argument.startswith('-'):
+            continue
+        words.append(argument)
+        if argument not in EXEC_GROUPS:
+            break
+    if len(words) == 1 and len(argv) > 1:      # Options only, "podman --version"
+        words.append(argv[1])
+    return ' '.join(words)
+
+# pathWhich() Executable [name] through $PATH, same lookup of shutil.which() (its import is not cheap at startup)
+# @return (string|None) Absolute path, None when it's not found
+def pathWhich(name=''):
+    if os.sep in name:
+        return name if os.path.isfile(name) and os.access(name, os.X_OK) else None
+    for directory in os.environ.get('PATH', os.defpath).split(os.pathsep):
+        path = os.path.join(directory or os.curdir, name)
+        if os.path.isfile(path) and os.access(path, os.X_OK):
+            return os.path.abspath(path) if not directory else path
+    return None
+
+# pathPrivate() Directory [path] only the current user can use, created (0700) when missing. An existing one must be
+#               a real directory (no symlink) owned by the user with no access for others: in shared places (/tmp)
+#               another user could have created it first and planted sockets or symlinks in it
+# @param mask (int) Permissions others must not have, 0o022: readable by everyone but written by the user only
+# @return (int, string) [returnCode, outputMessage] the directory name when it can be used, the reason otherwise
+def pathPrivate(path='', mask=0o077):
+    import stat
+    try:
+        os.makedirs(os.path.dirname(path) or os.curdir, exist_ok=True)
+        os.mkdir(path, 0o700)
+    except FileExistsError:
+        pass
+    except OSError as E:
+        return (-1, f'{path}: {E.strerror}')
+    try:
+        status = os.lstat(path)
+    except OSError as E:
+        return (-1, f'{path}: {E.strerror}')
+    if not stat.S_ISDIR(status.st_mode):
+        return (-1, f'{path}: not a directory')
+    if status.st_uid != os.getuid():
+        return (-1, f'{path}: owned by another user')
+    if status.st_mode & mask:
+        return (-1, f'{path}: open to other users (mode {stat.S_IMODE(status.st_mode):o})')
+    return (0, path)
+
+_executables = {}
+# Absolute path of [name] through $PATH (cached), [name] itself when it's not found there
+def _executable(name=''):
+    if os.sep in name:
+        return name
+    path = _executables.get(name)
+    if path is None:
+        path = _executables[name] = pathWhich(name) or ''
+    return path or name
+
+# commandArgv() Command line spawned for [argv], through [prefix] (remote shell command, string or list) when set
+# @return (list) argv with the executable resolved
+def commandArgv(argv=[], prefix=None):
+    if prefix:
+        argv = (shlex.split(prefix) if isinstance(prefix, str) else list(prefix)) + [shlex.join(argv)]
+    return [_executable(argv[0])] + list(argv[1:])
+
+# argvExec() Run [argv] without a shell and record it in execStats, [stderr] like subprocess (None: inherited,
+#            PIPE: appended to the output, DEVNULL: dropped, STDOUT: merged)
+# @param prefix (string|list) [optional] Command reaching the runtime host, [argv] is quoted for its shell
+# @param name   (string) [optional] Histogram key, commandName(argv) when not set
+# @return (int, string) [returnCode, outputMessage]
+def argvExec(argv=[], prefix=None, stderr=None, name=None):
+    import subprocess                   # Lazy, socket backend never forks anything
+    timeStart = time.monotonic()
+    try:
+        process = subprocess.Popen(commandArgv(argv, prefix), stdin=subprocess.DEVNULL, stdout=subprocess.PIPE, stderr=stderr,
+                                   close_fds=False, universal_newlines=True)
+        (outputStream, errorStream) = process.communicate()
+        (returnCode, output) = (process.returncode, outputStream+(errorStream or ''))
+    except OSError as E:
+        (returnCode, output) = (EXEC_FAILED, str(E))
+    execStats.record(name or commandName(argv), time.monotonic()-timeStart, returnCode, len(output))
+    return (returnCode, output)
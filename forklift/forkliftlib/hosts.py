@@ -0,0 +1,187 @@
+# -*- coding: utf-8 -*-
+#
+# @description      containers and images from many hosts at once
+#
+# @author           Andrea Benini
+# @date             2026-10-17
+# @license          GNU Affero General Public License v3.0
+# @see              Each host is followed by its own thread through SSH: the runtime is detected, a
+#                   StateStore (snapshot + events on a long lived channel) keeps its containers and
+#                   images in memory, a cheap command measures its latency from time to time. All SSH
+#                   channels to the same host share a single connection (ControlMaster), a slow or
+#                   unreachable host never blocks the others: its error is reported and it's retried
+#
+# pyright: reportMissingImports=false
+#
+import os
+import time
+import tempfile
+import threading
+import subprocess
+
+from forkliftlib.engine  import EngineCLI
+from forkliftlib.execute import argvExec, pathPrivate
+from forkliftlib.state   import StateStore, REFRESH_INTERVAL
+
+
+HOST_PING     = 10                      # Seconds between two latency checks
+HOST_RETRY    = 10                      # Seconds before connecting again to an unreachable host
+HOST_PLATFORMS = ['podman', 'docker']
+SSH_COMMAND   = 'ssh -o BatchMode=yes -o ConnectTimeout=10'
+# Multiplexed SSH: first command opens the master connection, it's kept alive in background for a while
+SSH_MULTIPLEX = ' -o ControlMaster=auto -o ControlPersist=300 -o ControlPath={control}/%C'
+
+
+# sshCommand() Default SSH command, control sockets are kept in a private directory ($XDG_RUNTIME_DIR or a temporary
+#              one). A control directory that is not private (see pathPrivate()) could hold sockets of another user
+#              and route connections through them: SSH is not multiplexed then
+def sshCommand():
+    runtimeDir = os.getenv('XDG_RUNTIME_DIR')
+    control = os.path.join(runtimeDir, 'forklift-ssh') if runtimeDir else os.path.join(tempfile.gettempdir(), f'forklift-ssh-{os.getuid()}')
+    (errorCode, _) = pathPrivate(control)
+    return SSH_COMMAND + (SSH_MULTIPLEX.format(control=control) if errorCode == 0 else '')
+
+
+class Host(object):
+    # @param name     (string) Host as given to [ssh] ([user@]host)
+    # @param ssh      (string) Command used to reach it, ssh options and host name are appended to it
+    # @param interval (float) Polling interval when the host runtime has no events
+    # @param listener (callable) [optional] Called from the host thread when something changed
+    def __init__(self, name='', ssh='ssh', interval=REFRESH_INTERVAL, listener=None):
+        self.__name      = name
+        self.__prefix    = f'{ssh} -n {name}'            # stdin is never forwarded, keys typed belong to the dashboard
+        self.__interval  = interval
+        self.__listener  = listener
+        self.__platform  = None
+        self.__engine    = None
+        self.__store     = None
+        self.__latency   = None
+        self.__error     = 'connecting'
+        self.__thread    = None
+        self.__stopEvent = threading.Event()
+
+    @property
+    def name(self):
+        return self.__name
+    @property
+    def platform(self):
+        return self.__platform
+    @property
+    def engine(self):                   # EngineCLI for this host, None until connected
+        return self.__engine
+    @property
+    def latency(self):                  # Seconds, last round trip
+        return self.__latency
+    @property
+    def error(self):                    # Last error, empty string when the host is fine
+        return self.__error
+
+    def start(self):
+        if self.__thread:
+            return
+        self.__stopEvent.clear()
+        self.__thread = threading.Thread(target=self.__run, name=f'forklift-host-{self.__name}', daemon=True)
+        self.__thread.start()
+
+    def stop(self):
+        self.__stopEvent.set()
+        if self.__store:
+            self.__store.stop()
+        if self.__thread:
+            self.__thread.join(timeout=1)
+            self.__thread = None
+
+    def containers(self):
+        store = self.__store
+        return store.containers() if store and store.ready else []
+
+    def images(self):
+        store = self.__store
+        return store.images() if store and store.ready else []
+
+    # Single round trip through the (multiplexed) connection
+    # @return (int, string) [returnCode, outputMessage]
+    def __ping(self, *command):
+        timeStart = time.monotonic()
+        (errorCode, output) = argvExec(list(command), prefix=self.__prefix, stderr=subprocess.STDOUT)
+        if errorCode == 0:
+            self.__latency = time.monotonic() - timeStart
+        return (errorCode, output)
+
+    def __connect(self):
+        for platform in HOST_PLATFORMS:
+            (errorCode, output) = self.__ping(platform, '--version')
+            if errorCode == 0:
+                self.__platform = platform
+                self.__engine   = EngineCLI(platform=platform, prefix=self.__prefix)
+                self.__store    = StateStore(engine=self.__engine, interval=self.__interval)
+                self.__store.listenerAdd(self.__notify)
+                self.__store.start()
+                self.__error    = '' if self.__store.ready else 'cannot list containers'
+                return True
+            if errorCode == 255:                            # SSH failure, no need to try other runtimes
+                break
+        lines = [line for line in output.strip().splitlines() if line]
+        self.__error = lines[-1] if lines else f'unreachable ({errorCode})'
+        return False
+
+    def __run(self):
+        while not self.__stopEvent.is_set():
+            try:
+                if not self.__store:
+                    connected = self.__connect()
+                    self.__notify()
+                    if not connected:
+                        self.__stopEvent.wait(HOST_RETRY)
+                        continue
+                elif self.__ping('true')[0] != 0:           # Connection lost, starting again
+                    self.__store.stop()
+                    (self.__store, self.__engine, self.__error) = (None, None, 'connection lost')
+                    self.__notify()
+                    continue
+                else:
+                    self.__error = '' if self.__store.ready else 'cannot list containers'
+                    self.__notify()
+            except Exception as E:
+                self.__error = str(E)
+                self.__notify()
+            self.__stopEvent.wait(HOST_PING)
+
+    def __notify(self):
+        if self.__listener:
+            self.__listener()
+
+
+# Many hosts followed concurrently, containers and images are merged with their host name
+class HostPool(object):
+    # @param hosts (list) Hosts names
+    # @param ssh   (string) [optional] SSH command (host name is appended to it), multiplexed ssh when not set
+    def __init__(self, hosts=[], ssh=None, interval=REFRESH_INTERVAL, listener=None):
+        ssh = ssh or sshCommand()
+        self.__hosts = [Host(name=name, ssh=ssh, interval=interval, listener=listener) for name in hosts]
+
+    @property
+    def hosts(self):
+        return self.__hosts
+
+    def host(self, name=''):
+        for host in self.__hosts:
+            if host.name == name:
+                return host
+        return None
+
+    def start(self):
+        for host in self.__hosts:
+            host.start()
+
+    def stop(self):
+        for host in self.__hosts:
+            host.stop()
+
+    # @return (list) [(host name, container)]
+    def containers(self):
+        return [(host.name, item) for host in self.__hosts for item in host.containers()]
+
+    # @return (list) [(host name, image)]
+    def images(self):
+        return [(host.name, item) for host in self.__hosts for item in host.images()]
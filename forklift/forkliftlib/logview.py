@@ -0,0 +1,392 @@
+# -*- coding: utf-8 -*-
+#
+# @description      container logs sources for the bless pager
+#
+# @author           Andrea Benini
+# @date             2026-10-17
+# @license          GNU Affero General Public License v3.0
+# @see              Logs are read in background from the engine and split in lines only once.
+#                   LogBuffer follows a container keeping the last LOG_LINES lines in memory,
+#                   LogFile loads a whole log in a spooled temporary file (on disk when it's big,
+#                   then mmap-ed) indexed by line offsets, lines are decoded when displayed only.
+#                   LogMerge follows many containers at once, lines are interleaved by timestamp.
+#                   All of them provide the source interface used by bless.pager():
+#                       first, len(), line(n), search(text, start, backward), done, follow, close()
+#                   LogMerge adds prefix(n), the container name each line comes from
+#
+# pyright: reportMissingImports=false
+#
+import re
+import mmap
+import time
+import heapq
+import queue
+import array
+import bisect
+import datetime
+import tempfile
+import threading
+import collections
+
+
+LOG_LINES = 10000                       # Lines kept in memory while following a container
+LOG_SPOOL = 4*1024*1024                 # Bytes, bigger logs are spooled on disk
+LOG_MERGE_TAIL  = 100                   # Lines, initial history for each container in a merged view
+LOG_MERGE_QUEUE = 1000                  # Lines, pending lines for each stream, its reader waits when it's full
+LOG_MERGE_RATE  = 200                   # Lines/second for each stream (token bucket), lines above it are dropped
+LOG_MERGE_BURST = 1000                  # Lines, token bucket size
+LOG_MERGE_DELAY = 0.25                  # Seconds, lines are held for reordering before being shown
+LOG_TIMESTAMP   = re.compile(r'(\d{4}-\d\d-\d\dT\d\d:\d\d:\d\d)(?:\.(\d+))?(Z|[+-]\d\d:?\d\d)?$')
+
+# Terminal control characters from containers output are not sent to the screen (tabs are expanded)
+LOG_CONTROL = {code: '?' for code in list(range(0, 32))+[127] if code != 9}
+
+
+# Bytes line (without its newline) to a printable string
+def _lineText(data):
+    return data.decode('utf-8', 'replace').rstrip('\r').translate(LOG_CONTROL).expandtabs(8)
+
+
+# RFC3339 timestamp (any fraction digits, Z or offset) to seconds from epoch, None when it cannot be parsed
+def _timestamp(text):
+    match = LOG_TIMESTAMP.match(text)
+    if not match:
+        return None
+    (seconds, fraction, zone) = match.groups()
+    try:
+        value = datetime.datetime.fromisoformat(seconds + ('+00:00' if not zone or zone == 'Z' else zone)).timestamp()
+    except ValueError:
+        return None
+    return value + (float('0.'+fraction) if fraction else 0.0)
+
+
+# Followed container output, bounded ring of lines. Line numbers are absolute: the oldest kept line is [first]
+class LogBuffer(object):
+    # @param stream   (LogStream) Engine logs stream (follow mode)
+    # @param lines    (int) Ring size
+    # @param listener (callable) [optional] Called from the reader thread when new lines are available
+    def __init__(self, stream=None, lines=LOG_LINES, listener=None):
+        self.__stream   = stream
+        self.__listener = listener
+        self.__lines    = collections.deque(maxlen=lines)
+        self.__total    = 0             # Lines received so far
+        self.__lock     = threading.Lock()
+        self.__done     = False
+        self.__thread   = threading.Thread(target=self.__run, name='forklift-logs', daemon=True)
+        self.__thread.start()
+
+    @property
+    def follow(self):
+        return True
+    @property
+    def done(self):                     # Stream closed (container stopped or close() called)
+        return self.__done
+    @property
+    def first(self):
+        with self.__lock:
+            return self.__total - len(self.__lines)
+    def __len__(self):
+        with self.__lock:
+            return len(self.__lines)
+
+    # line() Absolute line [number], empty string when it's not in the buffer anymore
+    def line(self, number=0):
+        with self.__lock:
+            index = number - (self.__total - len(self.__lines))
+            if 0 <= index < len(self.__lines):
+                return self.__lines[index]
+        return ''
+
+    # search() First line containing [text] after (before) line [start]
+    # @return (int) Absolute line number, -1 when not found
+    def search(self, text='', start=0, backward=False):
+        with self.__lock:
+            first = self.__total - len(self.__lines)
+            lines = list(self.__lines)
+        index = max(0, start - first)
+        candidates = range(min(index, len(lines))-1, -1, -1) if backward else range(index+1, len(lines))
+        for index in candidates:
+            if text in lines[index]:
+                return first + index
+        return -1
+
+    def close(self):
+        self.__stream.close()
+        self.__thread.join(timeout=1)
+
+    def __run(self):
+        partial = b''
+        try:
+            for chunk in self.__stream:
+                lines = (partial + chunk).split(b'\n')
+                partial = lines.pop()
+                if lines:
+                    self.__append(lines)
+        except Exception:                           # Stream dropped (or closed by close())
+            pass
+        if partial:
+            self.__append([partial])
+        self.__done = True
+        self.__notify()
+
+    def __append(self, lines):
+        lines = [_lineText(line) for line in lines]
+        with self.__lock:
+            self.__lines.extend(lines)
+            self.__total += len(lines)
+        self.__notify()
+
+    def __notify(self):
+        if self.__listener:
+            self.__listener()
+
+
+# Whole container output, spooled in a temporary file and indexed by line start offsets while it's loaded
+class LogFile(object):
+    # @param stream   (LogStream) Engine logs stream (no follow)
+    # @param listener (callable) [optional] Called from the reader thread while the log is loaded
+    # @param spool    (int) Bytes kept in memory before moving the log on disk
+    def __init__(self, stream=None, listener=None, spool=LOG_SPOOL):
+        self.__stream   = stream
+        self.__listener = listener
+        self.__spool    = spool
+        self.__file     = tempfile.SpooledTemporaryFile(max_size=spool)
+        self.__offsets  = array.array('Q', [0])     # Lines start, last one is the end of the last complete line
+        self.__size     = 0
+        self.__buffer   = None                      # Whole log (bytes or mmap) once it's loaded
+        self.__lock     = threading.Lock()
+        self.__done     = False
+        self.__thread   = threading.Thread(target=self.__run, name='forklift-logs', daemon=True)
+        self.__thread.start()
+
+    @property
+    def follow(self):
+        return False
+    @property
+    def done(self):                     # Log fully loaded
+        return self.__done
+    @property
+    def first(self):
+        return 0
+    def __len__(self):
+        return len(self.__offsets) - 1
+
+    def line(self, number=0):
+        if not 0 <= number < len(self.__offsets)-1:
+            return ''
+        (start, end) = (self.__offsets[number], self.__offsets[number+1])
+        if self.__buffer is not None:
+            return _lineText(self.__buffer[start:end].rstrip(b'\n'))
+        with self.__lock:
+            self.__file.seek(start)
+            data = self.__file.read(end-start)
+        return _lineText(data.rstrip(b'\n'))
+
+    # search() Same as LogBuffer.search(), the loaded log is scanned as a whole (no line splitting)
+    def search(self, text='', start=0, backward=False):
+        if self.__buffer is None:
+            candidates = range(start-1, -1, -1) if backward else range(start+1, len(self))
+            for number in candidates:
+                if text in self.line(number):
+                    return number
+            return -1
+        needle = text.encode('utf-8')
+        if backward:
+            position = self.__buffer.rfind(needle, 0, self.__offsets[max(0, start)])
+        else:
+            position = self.__buffer.find(needle, self.__offsets[min(start+1, len(self))])
+        if position < 0:
+            return -1
+        return bisect.bisect_right(self.__offsets, position) - 1
+
+    def close(self):
+        self.__stream.close()
+        self.__thread.join(timeout=1)
+        with self.__lock:
+            if isinstance(self.__buffer, mmap.mmap):
+                self.__buffer.close()
+            self.__buffer = None
+            self.__file.close()
+
+    def __run(self):
+        try:
+            for chunk in self.__stream:
+                with self.__lock:
+                    self.__file.seek(0, 2)
+                    self.__file.write(chunk)
+                offsets = []
+                position = chunk.find(b'\n')
+                while position >= 0:
+                    offsets.append(self.__size + position + 1)
+                    position = chunk.find(b'\n', position+1)
+                self.__size += len(chunk)
+                self.__offsets.extend(offsets)
+                if offsets:
+                    self.__notify()
+        except Exception:
+            pass
+        if self.__size > self.__offsets[-1]:        # Last line without newline
+            self.__offsets.append(self.__size)
+        with self.__lock:
+            if self.__file.closed:                  # Closed while loading
+                return
+            if self.__size > self.__spool:          # Rolled over on disk, mapped in memory
+                self.__file.flush()
+                self.__buffer = mmap.mmap(self.__file.fileno(), 0, access=mmap.ACCESS_READ)
+            else:
+                self.__file.seek(0)
+                self.__buffer = self.__file.read()
+        self.__done = True
+        self.__notify()
+
+    def __notify(self):
+        if self.__listener:
+            self.__listener()
+
+
+# Many followed containers in a single bounded ring, lines are interleaved by their timestamp.
+# Each stream has its own reader with a bounded queue (a slow consumer stops the reader, not the memory) and a
+# token bucket (a chatty container cannot flood the view), a single merger thread sorts pending lines by time
+# and publishes the ones older than LOG_MERGE_DELAY
+class LogMerge(object):
+    # @param streams  (list) [(name, LogStream)] Engine logs streams (follow mode, with timestamps)
+    # @param lines    (int) Ring size
+    # @param listener (callable) [optional] Called from the merger thread when new lines are available
+    def __init__(self, streams=[], lines=LOG_LINES, listener=None, rate=LOG_MERGE_RATE, burst=LOG_MERGE_BURST):
+        self.__streams  = [stream for (_, stream) in streams]
+        self.__names    = [name for (name, _) in streams]
+        self.__listener = listener
+        self.__rate     = rate
+        self.__burst    = burst
+        self.__lines    = collections.deque(maxlen=lines)   # (stream index, text)
+        self.__total    = 0
+        self.__lock     = threading.Lock()
+        self.__queues   = [queue.Queue(maxsize=LOG_MERGE_QUEUE) for _ in streams]
+        self.__pending  = threading.Event()                 # Lines queued by readers
+        self.__running  = len(streams)                      # Readers still alive
+        self.__stop     = threading.Event()
+        self.__done     = False
+        self.__readers  = [threading.Thread(target=self.__read, args=(index,), name='forklift-logs', daemon=True) for index in range(len(streams))]
+        self.__merger   = threading.Thread(target=self.__merge, name='forklift-logs-merge', daemon=True)
+        for thread in self.__readers + [self.__merger]:
+            thread.start()
+
+    @property
+    def follow(self):
+        return True
+    @property
+    def done(self):
+        return self.__done
+    @property
+    def first(self):
+        with self.__lock:
+            return self.__total - len(self.__lines)
+    def __len__(self):
+        with self.__lock:
+            return len(self.__lines)
+
+    def line(self, number=0):
+        with self.__lock:
+            index = number - (self.__total - len(self.__lines))
+            if 0 <= index < len(self.__lines):
+                return self.__lines[index][1]
+        return ''
+
+    # prefix() Name of the container line [number] comes from, (name, stream index) padded to the longest name
+    def prefix(self, number=0):
+        width = max(len(name) for name in self.__names)
+        with self.__lock:
+            index = number - (self.__total - len(self.__lines))
+            if 0 <= index < len(self.__lines):
+                stream = self.__lines[index][0]
+                return (f'{self.__names[stream]:<{width}} |', stream)
+        return ('', 0)
+
+    def search(self, text='', start=0, backward=False):
+        with self.__lock:
+            first = self.__total - len(self.__lines)
+            lines = list(self.__lines)
+        index = max(0, start - first)
+        candidates = range(min(index, len(lines))-1, -1, -1) if backward else range(index+1, len(lines))
+        for index in candidates:
+            if text in lines[index][1]:
+                return first + index
+        return -1
+
+    def close(self):
+        self.__stop.set()
+        for stream in self.__streams:
+            stream.close()
+        for index in range(len(self.__queues)):         # Readers waiting on a full queue
+            while not self.__queues[index].empty():
+                self.__queues[index].get_nowait()
+        self.__pending.set()
+        self.__merger.join(timeout=1)
+
+    # Stream reader: lines over the rate are counted and reported with a single line once tokens are back
+    def __read(self, index):
+        (tokens, last, dropped, partial) = (float(self.__burst), time.monotonic(), 0, b'')
+        output = self.__queues[index]
+        try:
+            for chunk in self.__streams[index]:
+                lines = (partial + chunk).split(b'\n')
+                partial = lines.pop()
+                now = time.monotonic()
+                (tokens, last) = (min(self.__burst, tokens + (now-last)*self.__rate), now)
+                for line in lines:
+                    if tokens < 1:
+                        dropped += 1
+                        continue
+                    tokens -= 1
+                    (stamp, _, text) = line.partition(b' ')
+                    stamp = _timestamp(stamp.decode('ascii', 'replace'))
+                    if stamp is None:
+                        (stamp, text) = (time.time(), line)
+                    if dropped:
+                        output.put((stamp, f'[{dropped} lines dropped, over {self.__rate} lines/s]'))
+                        dropped = 0
+                    output.put((stamp, _lineText(text)))
+                    self.__pending.set()
+                    if self.__stop.is_set():
+                        return
+        except Exception:
+            pass
+        finally:
+            with self.__lock:
+                self.__running -= 1
+            self.__pending.set()
+
+    # Merger: pending lines are held for LOG_MERGE_DELAY in a heap ordered by timestamp, older ones are published
+    def __merge(self):
+        (heap, sequence) = ([], 0)
+        while not self.__stop.is_set():
+            self.__pending.wait(LOG_MERGE_DELAY)                # Held lines are published on the next round at most
+            self.__pending.clear()
+            now = time.monotonic()
+            for (index, pending) in enumerate(self.__queues):
+                while True:
+                    try:
+                        (stamp, text) = pending.get_nowait()
+                    except queue.Empty:
+                        break
+                    heapq.heappush(heap, (stamp, sequence, now, index, text))
+                    sequence += 1
+            with self.__lock:
+                running = self.__running
+            lines = []
+            while heap and (heap[0][2] <= now - LOG_MERGE_DELAY or not running):
+                (_, _, _, index, text) = heapq.heappop(heap)
+                lines.append((index, text))
+            if lines:
+                with self.__lock:
+                    self.__lines.extend(lines)
+                    self.__total += len(lines)
+                self.__notify()
+            if not running and not heap:
+                break
+        self.__done = True
+        self.__notify()
+
+    def __notify(self):
+        if self.__listener:
+            self.__listener()
@@ -0,0 +1,72 @@
+# -*- coding: utf-8 -*-
+#
+# @description      forklift agent wire protocol
+#
+# @author           Andrea Benini
+# @date             2026-10-17
+# @license          GNU Affero General Public License v3.0
+# @see              Messages are compact JSON objects, each one prefixed by its length (4 bytes, big
+#                   endian) so any byte stream can carry them (ssh stdin/stdout, UNIX sockets).
+#                   Message type is in "t":
+#                     hello   agent -> client   {v, platform, engine} or {error}
+#                     snap    agent -> client   {c: containers, i: images} whole state, once
+#                     delta   agent -> client   {c: changed containers, cd: removed IDs, i, id} changes only
+#                     call    client -> agent   {n: sequence, m: engine method, a: arguments}
+#                     ret     agent -> client   {n: sequence, r: engine method result}
+#
+# pyright: reportMissingImports=false
+#
+import os
+import struct
+
+
+PROTOCOL_VERSION = 1
+FRAME_HEADER     = struct.Struct('>I')
+FRAME_MAX        = 64*1024*1024         # Bytes, bigger frames are a broken stream, not a message
+DAEMON_SOCKET    = os.getenv('FORKLIFT_DAEMON') or '/run/forklift/forklift.sock'     # Shared by all users of the host, see forkliftlib.daemon
+DAEMON_GROUP     = os.getenv('FORKLIFT_DAEMON_GROUP') or 'forklift'                 # Users allowed to attach to a daemon of another user
+
+
+# frameEncode() Single [message] (dict) ready to be written
+def frameEncode(message={}):
+    import json                         # Lazy, the text UI only needs DAEMON_SOCKET from here
+    data = json.dumps(message, separators=(',', ':')).encode('utf-8')
+    return FRAME_HEADER.pack(len(data)) + data
+
+# frameWrite() Write and flush a single [message] on [stream] (binary file object)
+def frameWrite(stream=None, message={}):
+    stream.write(frameEncode(message))
+    stream.flush()
+
+# frameRead() Next message from [stream] (binary file object)
+# @return (dict|None) Message, None at the end of the stream
+# @raise ValueError on a broken stream
+def frameRead(stream=None):
+    header = _readExact(stream, FRAME_HEADER.size)
+    if not header:
+        return None
+    (size,) = FRAME_HEADER.unpack(header)
+    if size > FRAME_MAX:
+        raise ValueError(f'Frame too big: {size} bytes')
+    data = _readExact(stream, size)
+    if data is None:
+        raise ValueError('Truncated frame')
+    import json
+    return json.loads(data)
+
+def _readExact(stream, size):
+    data = b''
+    while len(data) < size:
+        chunk = stream.read(size-len(data))
+        if not chunk:
+            return None
+        data += chunk
+    return data
+
+
+# itemsDelta() Differences between two states (dict ID -> item)
+# @return (list, list) [changed or new items, removed IDs]
+def itemsDelta(old={}, new={}):
+    changed = [item for (ID, item) in new.items() if old.get(ID) != item]
+    removed = [ID for ID in old if ID not in new]
+    return (changed, removed)
@@ -0,0 +1,208 @@
+# -*- coding: utf-8 -*-
+#
+# @description      containers and images list records, compact and formatted on demand
+#
+# @author           Andrea Benini
+# @date             2026-10-17
+# @license          GNU Affero General Public License v3.0
+# @see              One record for each menu row, built in a single pass over engine items. Records keep
+#                   the engine values (no copies), columns widths are shared by the whole list and grown
+#                   while records are added. Labels are formatted the first time they're asked for:
+#                   menus only ask for visible rows, so a refresh with 50k images formats a screen of them.
+#                   Records are also (label, ID, ...) sequences, the same layout of the old tuples
+#
+# pyright: reportMissingImports=false
+#
+import math
+import collections
+
+from forkliftlib.bless import MenuRecord
+
+
+CONTAINER_FORMAT = "{{id:<12}}  {{image:<{image}}}  {{name:<{name}}}  {{state:<7}}  {{createdAt:<20}} {{command}}"
+IMAGE_NONE       = '<none>'             # Repository and tag of images without names
+IMAGE_FORMAT     = "{{repository:<{repository}}} {{tag:<{tag}}} {{id:12}} {{created:10}} {{size:>{size}}}"
+
+
+# Columns widths and label format shared by the records of a list, format is built once all widths are known
+class RecordColumns(object):
+    __slots__ = ('__template', '__widths', '__format', '__fixed')
+
+    def __init__(self, template=''):
+        self.__template = template
+        self.__widths   = {}
+        self.__format   = None
+        self.__fixed    = None
+
+    # widths() Set columns widths (name=size), labels formatted after this call use them
+    def widths(self, **widths):
+        self.__widths.update(widths)
+        (self.__format, self.__fixed) = (None, None)
+
+    @property
+    def format(self):
+        if self.__format is None:
+            self.__format = self.__template.format(**self.__widths)
+        return self.__format
+
+    @property
+    def fixed(self):                    # Label length with empty values: columns and separators, only longer values add to it
+        if self.__fixed is None:
+            self.__fixed = len(self.format.format_map(collections.defaultdict(str)))
+        return self.__fixed
+
+
+# Containers list row: (label, ID, name, state)
+class ContainerRecord(MenuRecord):
+    __slots__ = ('__columns', '__label', 'ID', 'image', 'name', 'state', 'created', 'command')
+
+    def __init__(self, columns=None, ID='', image='', name='', state='', created='', command=''):
+        self.__columns = columns
+        self.__label   = None
+        self.ID        = ID
+        self.image     = image
+        self.name      = name
+        self.state     = state
+        self.created   = created
+        self.command   = command
+
+    @property
+    def label(self):
+        if self.__label is None:
+            self.__label = self.__columns.format.format(id=self.ID[:12], image=self.image, name=self.name, state=self.state, createdAt=self.created, command=self.command)
+        return self.__label
+
+    @property
+    def width(self):                    # Label length, computed without formatting it (image and name columns fit them all)
+        return self.__columns.fixed + max(0, len(self.state)-7) + max(0, len(self.created)-20) + len(self.command)
+
+    @property
+    def key(self):
+        return self.ID
+
+    def __fields(self):
+        return (self.ID, self.image, self.name, self.state, self.created, self.command)
+
+    def __getitem__(self, index):       # Label is formatted only when [0] is asked for
+        if index == 0:
+            return self.label
+        return (None, self.ID, self.name, self.state)[index]
+    def __len__(self):
+        return 4
+    def __iter__(self):
+        return iter((self.label, self.ID, self.name, self.state))
+
+    def __eq__(self, other):
+        if not isinstance(other, ContainerRecord):
+            return NotImplemented
+        return self.__fields() == other.__fields() and self.__columns.format == other.__columns.format
+    def __hash__(self):
+        return hash(self.__fields())
+
+
+# Images list row: (label, key, repository), key is the image name (or its ID when it has no names).
+# Engine item is kept as it is, repository and tag are a [source] name split at [split] (None: <none>)
+class ImageRecord(MenuRecord):
+    __slots__ = ('__columns', '__label', '__item', '__source', '__split', 'key')
+
+    def __init__(self, columns=None, item={}, key='', source=None, split=None):
+        self.__columns = columns
+        self.__label   = None
+        self.__item    = item
+        self.__source  = source
+        self.__split   = split
+        self.key       = key
+
+    @property
+    def ID(self):
+        return self.__item['Id']
+    @property
+    def repository(self):
+        return IMAGE_NONE if self.__source is None else self.__source[:self.__split]
+    @property
+    def tag(self):
+        return IMAGE_NONE if self.__source is None else self.__source[self.__split+1:]
+    @property
+    def created(self):
+        return self.__item['CreatedAt'].partition('T')[0]
+    @property
+    def size(self):                     # Megabytes
+        return str(math.floor(self.__item['Size']/1000000))
+
+    @property
+    def label(self):
+        if self.__label is None:
+            self.__label = self.__columns.format.format(repository=self.repository, tag=self.tag, id=self.ID[:12], created=self.created, size=self.size)
+        return self.__label
+
+    @property
+    def width(self):                    # Repository, tag and size columns fit them all, creation date is the only longer value
+        created = self.__item['CreatedAt'].find('T')
+        return self.__columns.fixed + max(0, (created if created >= 0 else len(self.__item['CreatedAt']))-10)
+
+    def __fields(self):
+        return (self.key, self.ID, self.__source, self.__split, self.__item['CreatedAt'], self.__item['Size'])
+
+    def __getitem__(self, index):
+        if index == 0:
+            return self.label
+        return (None, self.key, self.repository)[index]
+    def __len__(self):
+        return 3
+    def __iter__(self):
+        return iter((self.label, self.key, self.repository))
+
+    def __eq__(self, other):
+        if not isinstance(other, ImageRecord):
+            return NotImplemented
+        return self.__fields() == other.__fields() and self.__columns.format == other.__columns.format
+    def __hash__(self):
+        return hash(self.__fields())
+
+
+# containerRecords() Containers list rows from engine [items] ("ps --format=json" layout), one row for each name
+# @return (list, string) [records, label format]
+def containerRecords(items=[]):
+    columns = RecordColumns(CONTAINER_FORMAT)
+    records = {}
+    lenImage = lenName = 0
+    for item in items:
+        names = item.get('Names')
+        if not names:
+            continue
+        (ID, image, state, created, command) = (item['Id'], item['Image'], item['State'], item['CreatedAt'], item['Command'])
+        command = command[0][:20] if command else ''
+        if len(image) > lenImage:
+            lenImage = len(image)
+        for name in names:
+            if len(name) > lenName:
+                lenName = len(name)
+            records[name] = ContainerRecord(columns, ID, image, name, state, created, command)
+    columns.widths(image=lenImage, name=lenName)
+    return (list(records.values()), columns.format)
+
+# imageRecords() Images list rows from engine [items] ("images --format=json" layout), one row for each name
+# @return (list, string) [records, label format]
+def imageRecords(items=[]):
+    columns = RecordColumns(IMAGE_FORMAT)
+    records = {}
+    lenRepository = lenTag = lenSize = 0
+    for item in items:
+        (ID, names) = (item['Id'], item.get('Names'))
+        size = len(str(math.floor(item['Size']/1000000)))
+        if size > lenSize:
+            lenSize = size
+        (source, split) = (None, None)                      # <none>:<none> until a name with a tag is found
+        for name in names or [ID]:
+            if names:
+                position = name.rfind(':')
+                if position >= 0:
+                    (source, split) = (name, position)
+                (repository, tag) = (len(IMAGE_NONE), len(IMAGE_NONE)) if source is None else (split, len(source)-split-1)
+                if repository > lenRepository:
+                    lenRepository = repository
+                if tag > lenTag:
+                    lenTag = tag
+            records[name] = ImageRecord(columns, item, name, source, split)
+    columns.widths(repository=lenRepository, tag=lenTag, size=lenSize+1)
+    return (list(records.values()), columns.format)
@@ -0,0 +1,234 @@
+# -*- coding: utf-8 -*-
+#
+# @description      containers and images state cache
+#
+# @author           Andrea Benini
+# @date             2026-10-17
+# @license          GNU Affero General Public License v3.0
+# @see              In memory copy of containers and images known by the engine. A single snapshot
+#                   (containers and images read concurrently) is loaded at startup, incremental updates
+#                   are then applied from the engine event stream. A full resync only happens when the
+#                   event stream drops, engines without events are polled in background at a configurable
+#                   interval.
+#
+# pyright: reportMissingImports=false
+#
+import threading
+
+
+REFRESH_INTERVAL = 2                    # Seconds, polling interval (and resubscription attempts) without an event stream
+
+# Container state applied straight from the event, no need to ask the engine about it
+CONTAINER_STATE = {
+    'start':    'running',
+    'restart':  'running',
+    'unpause':  'running',
+    'pause':    'paused',
+    'die':      'exited',
+    'died':     'exited',
+    'stop':     'exited',
+}
+CONTAINER_REMOVE = ['remove', 'destroy']
+CONTAINER_FETCH  = ['create', 'rename', 'init', 'cleanup', 'update']
+IMAGE_REMOVE     = ['remove', 'delete']
+IMAGE_FETCH      = ['pull', 'tag', 'untag', 'build', 'import', 'load', 'commit']
+
+
+class StateStore(object):
+    # @param engine   (EngineSocket|EngineCLI) Engine backend used for snapshots and events
+    # @param interval (float) Seconds between snapshots when the event stream is not available
+    def __init__(self, engine=None, interval=REFRESH_INTERVAL):
+        self.__engine     = engine
+        self.__interval   = interval
+        self.__lock       = threading.Lock()
+        self.__containers = {}          # Id -> container (ps --format=json layout)
+        self.__images     = {}          # Id -> image (images --format=json layout)
+        self.__listeners  = []
+        self.__watchers   = []          # Events callbacks, see eventListenerAdd()
+        self.__live       = False
+        self.__ready      = False
+        self.__stale      = False
+        self.__stream     = None
+        self.__thread     = None
+        self.__stopEvent  = threading.Event()
+
+    # True when the cache is in sync with the engine (event stream up and running)
+    @property
+    def live(self):
+        return self.__live
+    # True when at least one snapshot has been loaded, it's kept fresh by events or by polling
+    @property
+    def ready(self):
+        return self.__ready
+    # True while containers and images are the seed() ones, the engine has not answered yet
+    @property
+    def stale(self):
+        return self.__stale
+
+    # seed() Last known [containers] and [images] (startup cache), served as stale until the first snapshot
+    def seed(self, containers=[], images=[]):
+        with self.__lock:
+            if self.__ready:
+                return
+            self.__containers = {item['Id']: item for item in containers}
+            self.__images     = {item['Id']: item for item in images}
+        (self.__ready, self.__stale) = (True, True)
+
+    # Start following the engine
+    # @param wait (bool) Block until the first snapshot has been loaded, it's loaded in background otherwise
+    def start(self, wait=True):
+        if self.__thread:
+            return
+        self.__stopEvent.clear()
+        if wait:
+            self.__subscribe()
+        self.__thread = threading.Thread(target=self.__run, args=(not wait,), name='forklift-events', daemon=True)
+        self.__thread.start()
+
+    def stop(self):
+        self.__stopEvent.set()
+        self.__live = False
+        stream = self.__stream
+        if stream:
+            stream.close()
+        if self.__thread:
+            self.__thread.join(timeout=1)
+            self.__thread = None
+
+    # listenerAdd() Register a callback invoked (from the events thread) each time the state changes
+    def listenerAdd(self, callback=None):
+        if callback:
+            self.__listeners.append(callback)
+
+    # eventListenerAdd() Register a callback invoked (from the events thread) with [itemType, ID] of each engine event,
+    #                    [None, None] when events might have been lost (stream dropped): everything could have changed
+    def eventListenerAdd(self, callback=None):
+        if callback:
+            self.__watchers.append(callback)
+
+    def containers(self):
+        with self.__lock:
+            return list(self.__containers.values())
+
+    def images(self):
+        with self.__lock:
+            return list(self.__images.values())
+
+    # resync() Full reload of containers and images from the engine
+    # @return (bool) True on success
+    def resync(self):
+        from forkliftlib.asynccontainer import engineGather          # Lazy, asyncio is imported by the first snapshot only
+        ((errorContainers, containers), (errorImages, images)) = engineGather(self.__engine, [('containers', {}), ('images', {})])
+        if errorContainers != 0 or errorImages != 0:
+            return False
+        containers = {item['Id']: item for item in containers}
+        images     = {item['Id']: item for item in images}
+        with self.__lock:
+            changed = containers != self.__containers or images != self.__images or self.__stale
+            self.__containers = containers
+            self.__images     = images
+        (self.__ready, self.__stale) = (True, False)
+        if changed:
+            self.__notify()
+        return True
+
+    # Event subscription happens before the snapshot, nothing is lost in the meantime
+    def __subscribe(self):
+        self.__stream = self.__engine.events()
+        synced = self.resync()
+        self.__live = self.__stream is not None and synced
+
+    def __run(self, subscribe=False):
+        if subscribe:
+            self.__subscribe()
+        while not self.__stopEvent.is_set():
+            if self.__stream:
+                try:
+                    for event in self.__stream:
+                        self.__apply(event)
+                except Exception:                   # Stream dropped (or closed by stop()), resync
+                    pass
+                self.__stream.close()
+                self.__stream = None
+            self.__live = False
+            self.__event(None, None)
+            if self.__stopEvent.wait(self.__interval):
+                return
+            self.__subscribe()                      # Polling snapshot, event stream when it's back
+
+    def __notify(self):
+        for callback in self.__listeners:
+            callback()
+
+    def __event(self, itemType, ID):
+        for callback in self.__watchers:
+            callback(itemType, ID)
+
+    # Apply a single normalized event {Type, Action, ID, Name} to the cache
+    def __apply(self, event):
+        (itemType, action, ID) = (event['Type'], event['Action'], event['ID'])
+        if not ID:
+            return
+        self.__event(itemType, ID)
+        if itemType == 'container':
+            if action in CONTAINER_STATE:
+                with self.__lock:
+                    item = self.__findID(self.__containers, ID)
+                    if item:                # New item, never changed in place: lists handed out before keep their copy (agent deltas)
+                        self.__containers[item['Id']] = dict(item, State=CONTAINER_STATE[action])
+                if not item:
+                    self.__containerFetch(ID)
+            elif action in CONTAINER_REMOVE:
+                with self.__lock:
+                    item = self.__findID(self.__containers, ID)
+                    if item:
+                        del self.__containers[item['Id']]
+            elif action in CONTAINER_FETCH:
+                self.__containerFetch(ID)
+            else:
+                return
+        elif itemType == 'image':
+            if action in IMAGE_REMOVE:
+                with self.__lock:
+                    item = self.__findID(self.__images, ID)
+                    if item:
+                        del self.__images[item['Id']]
+            elif action in IMAGE_FETCH:
+                self.__imageFetch(ID)
+            else:
+                return
+        else:
+            return
+        self.__notify()
+
+    # Event IDs might be shortened, full IDs are used as cache keys
+    @staticmethod
+    def __findID(items, ID):
+        if ID in items:
+            return items[ID]
+        for key in items:
+            if key.startswith(ID):
+                return items[key]
+        return None
+
+    def __containerFetch(self, ID):
+        (errorCode, item) = self.__engine.container(containerID=ID)
+        if errorCode != 0:
+            return
+        with self.__lock:
+            current = self.__findID(self.__containers, ID)
+            if current:
+                del self.__containers[current['Id']]
+            if item:
+                self.__containers[item['Id']] = item
+
+    def __imageFetch(self, ID):
+        (errorCode, item) = self.__engine.image(imageID=ID)
+        if errorCode != 0:
+            return
+        with self.__lock:
+            current = self.__findID(self.__images, ID)
+            if current:
+                del self.__images[current['Id']]
+            if item:
+                self.__images[item['Id']] = item
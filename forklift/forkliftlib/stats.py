@@ -0,0 +1,216 @@
+# -*- coding: utf-8 -*-
+#
+# @description      containers resources usage from cgroup v2
+#
+# @author           Andrea Benini
+# @date             2026-10-17
+# @license          GNU Affero General Public License v3.0
+# @see              Containers cgroups are located once in the cgroup tree (any directory named after
+#                   a container ID: libpod-ID.scope, docker-ID.scope, docker/ID, ...), their files are
+#                   then sampled at a fixed interval: cpu.stat, memory.current, io.stat, pids.current.
+#                   Reading a few small files is way cheaper than forking "<runtime> stats --no-stream".
+#                   The cgroup root can be moved elsewhere (fake trees for testing)
+#
+# pyright: reportMissingImports=false
+#
+import os
+import re
+import time
+import heapq
+import threading
+import collections
+
+
+CGROUP_ROOT    = '/sys/fs/cgroup'
+CGROUP_DEPTH   = 8                      # Max tree depth searched for containers cgroups
+CGROUP_ID      = re.compile(r'(?:^|[-_/])([0-9a-f]{64})(?:\.scope)?$')
+CGROUP_RESCAN  = 5                      # Seconds, min time between two tree scans for unknown containers
+STATS_INTERVAL = 1.0                    # Seconds between two samples
+STATS_HISTORY  = 60                     # Samples kept for each container
+STATS_FIELDS   = ('cpu', 'memory', 'io', 'pids')
+SPARKLINE      = ' ▁▂▃▄▅▆▇█'
+
+
+# sparkline() Values as a text chart, one character for each value (last [width] values only)
+# @param maximum (float) [optional] Top of the chart, highest value when not set
+def sparkline(values=[], width=10, maximum=None):
+    values = [value or 0 for value in list(values)[-width:]]
+    if not maximum:
+        maximum = max(values, default=0) or 1
+    line = ''.join(SPARKLINE[min(len(SPARKLINE)-1, int(value*(len(SPARKLINE)-1)/maximum + 0.5))] for value in values)
+    return (' '*(width-len(line))) + line
+
+# humanBytes() Short human readable size (1023B, 12.3K, 4.5M, 6.7G)
+def humanBytes(value=0):
+    if value is None:
+        return '-'
+    for unit in ('B', 'K', 'M', 'G'):
+        if value < 1024:
+            return f'{value:.0f}{unit}' if unit == 'B' else f'{value:.1f}{unit}'
+        value /= 1024
+    return f'{value:.1f}T'
+
+
+def _readInt(path):
+    try:
+        with open(path, 'rb') as file:
+            return int(file.read().split()[0])
+    except (OSError, ValueError, IndexError):
+        return None
+
+def _readCPU(path):                     # cpu.stat usage_usec
+    try:
+        with open(path, 'rb') as file:
+            for line in file:
+                if line.startswith(b'usage_usec '):
+                    return int(line.split()[1])
+    except (OSError, ValueError, IndexError):
+        pass
+    return None
+
+def _readIO(path):                      # io.stat, read and written bytes on all devices
+    try:
+        with open(path, 'rb') as file:
+            total = 0
+            for line in file:
+                for field in line.split()[1:]:
+                    if field.startswith(b'rbytes=') or field.startswith(b'wbytes='):
+                        total += int(field[7:])
+            return total
+    except (OSError, ValueError):
+        return None
+
+
+# Single container samples, fixed size ring buffers
+class ContainerStats(object):
+    __slots__ = ('ID', 'path', 'cpu', 'memory', 'io', 'pids', 'counters')
+    def __init__(self, ID='', path='', history=STATS_HISTORY):
+        self.ID       = ID
+        self.path     = path
+        self.cpu      = collections.deque(maxlen=history)       # Percent of a single CPU
+        self.memory   = collections.deque(maxlen=history)       # Bytes
+        self.io       = collections.deque(maxlen=history)       # Bytes/second, read + written
+        self.pids     = collections.deque(maxlen=history)
+        self.counters = None                                    # (time, cpu usec, io bytes) of the previous sample
+
+    # Last sampled value of [field]
+    def last(self, field='cpu'):
+        values = getattr(self, field)
+        return values[-1] if values else None
+
+
+class StatsSampler(object):
+    # @param root     (string) cgroup v2 mount point
+    # @param interval (float) Seconds between two samples
+    # @param history  (int) Samples kept for each container
+    def __init__(self, root=CGROUP_ROOT, interval=STATS_INTERVAL, history=STATS_HISTORY):
+        self.__root      = root
+        self.__interval  = interval
+        self.__history   = history
+        self.__lock      = threading.Lock()
+        self.__paths     = {}                   # Container ID -> cgroup directory
+        self.__stats     = {}                   # Container ID -> ContainerStats
+        self.__tracked   = set()                # Running containers IDs, their cgroups are expected to be there
+        self.__scanned   = 0.0
+        self.__listeners = []
+        self.__thread    = None
+        self.__stopEvent = threading.Event()
+
+    @property
+    def root(self):
+        return self.__root
+    @property
+    def interval(self):
+        return self.__interval
+    # True when the cgroup root looks like a cgroup v2 tree
+    @property
+    def valid(self):
+        return os.path.isfile(os.path.join(self.__root, 'cgroup.controllers'))
+
+    def listenerAdd(self, callback=None):
+        if callback:
+            self.__listeners.append(callback)
+
+    # start() Sample in background until stop(), history is kept between stop() and start()
+    def start(self):
+        if self.__thread:
+            return
+        self.__stopEvent.clear()
+        self.__thread = threading.Thread(target=self.__run, name='forklift-stats', daemon=True)
+        self.__thread.start()
+
+    def stop(self):
+        self.__stopEvent.set()
+        if self.__thread:
+            self.__thread.join(timeout=1)
+            self.__thread = None
+
+    # top() Containers with the highest last [field] value
+    # @param IDs (list) [optional] Only these containers (full IDs)
+    # @return (list) [ContainerStats] at most [count] items
+    def top(self, field='cpu', count=10, IDs=None):
+        with self.__lock:
+            items = list(self.__stats.values()) if IDs is None else [self.__stats[ID] for ID in IDs if ID in self.__stats]
+        return heapq.nlargest(count, items, key=lambda item: item.last(field) or 0)
+
+    # track() Running containers [IDs] (full IDs), the tree is searched again when some of them are not known yet
+    def track(self, IDs=[]):
+        self.__tracked = set(IDs)
+
+    # sample() Read all containers cgroups once
+    def sample(self):
+        now = time.monotonic()
+        if not self.__scanned or (not self.__tracked <= self.__paths.keys() and now-self.__scanned >= CGROUP_RESCAN):
+            self.__scan()
+        for (ID, path) in list(self.__paths.items()):
+            cpu = _readCPU(os.path.join(path, 'cpu.stat'))
+            if cpu is None and not os.path.isdir(path):         # Container is gone
+                with self.__lock:
+                    self.__paths.pop(ID, None)
+                    self.__stats.pop(ID, None)
+                continue
+            io = _readIO(os.path.join(path, 'io.stat'))
+            with self.__lock:
+                stats = self.__stats.get(ID)
+                if not stats:
+                    stats = self.__stats[ID] = ContainerStats(ID=ID, path=path, history=self.__history)
+                previous = stats.counters
+                stats.counters = (now, cpu, io)
+                if previous:
+                    elapsed = max(now - previous[0], 1e-6)
+                    stats.cpu.append(None if cpu is None or previous[1] is None else max(0, cpu-previous[1]) / (elapsed*1e4))
+                    stats.io.append(None if io is None or previous[2] is None else max(0, io-previous[2]) / elapsed)
+                    stats.memory.append(_readInt(os.path.join(path, 'memory.current')))
+                    stats.pids.append(_readInt(os.path.join(path, 'pids.current')))
+
+    # Containers cgroups: directories named after a 64 hex digits ID, their subdirectories are not searched
+    def __scan(self):
+        paths = {}
+        pending = [(self.__root, 0)]
+        while pending:
+            (path, depth) = pending.pop()
+            try:
+                entries = list(os.scandir(path))
+            except OSError:
+                continue
+            for entry in entries:
+                if not entry.is_dir(follow_symlinks=False):
+                    continue
+                match = CGROUP_ID.search(entry.name)
+                if match and 'conmon' not in entry.name:        # Podman monitor process has its own cgroup
+                    paths.setdefault(match.group(1), entry.path)
+                elif depth < CGROUP_DEPTH:
+                    pending.append((entry.path, depth+1))
+        with self.__lock:
+            self.__paths = paths
+            for ID in list(self.__stats):
+                if ID not in paths:
+                    del self.__stats[ID]
+        self.__scanned = time.monotonic()
+
+    def __run(self):
+        while not self.__stopEvent.is_set():
+            self.sample()
+            for callback in self.__listeners:
+                callback()
+            self.__stopEvent.wait(self.__interval)
@@ -0,0 +1,203 @@
+# -*- coding: utf-8 -*-
+#
+# @description      storage analyzer, images layers accounting and reclaimable space
+#
+# @author           Andrea Benini
+# @date             2026-10-17
+# @license          GNU Affero General Public License v3.0
+# @see              Image sizes reported by the engine count shared layers once for each image using them.
+#                   Layers of all images are gathered in batch (RootFS layers), each layer is counted once:
+#                   bytes of layers used by a single image are unique to it, the others are shared.
+#                   Layer sizes come from image sizes: images are visited from the smallest layers stack,
+#                   the size left once known layers are subtracted belongs to its new layers. When new layers
+#                   are not used by the same images, the image history tells how it's split (estimated when
+#                   it cannot be aligned with its layers). Reclaimable items are dangling images (no names,
+#                   unique bytes), stopped containers (writable layer) and volumes not used by containers
+#
+# pyright: reportMissingImports=false
+#
+import os
+import time
+
+from forkliftlib.bulk import bulkRun, BULK_WORKERS
+
+
+STORAGE_STOPPED = ['exited', 'created', 'dead', 'stopped', 'configured']
+STORAGE_KINDS   = ['container', 'image', 'volume']          # Removal order: images are freed by their containers first
+STORAGE_ACTIONS = {'container': 'remove', 'image': 'rmi', 'volume': 'volume'}   # Container.Bulk() actions
+STORAGE_UNITS   = ['B', 'kB', 'MB', 'GB', 'TB']
+
+
+# Single image accounting
+class StorageImage(object):
+    __slots__ = ('ID', 'name', 'size', 'layers', 'shared', 'unique', 'containers')
+    def __init__(self, ID='', name='', size=0, layers=[]):
+        self.ID         = ID
+        self.name       = name
+        self.size       = size          # Engine size, shared layers included
+        self.layers     = layers        # Layer digests, base first
+        self.shared     = 0             # Bytes of layers used by other images too
+        self.unique     = 0             # Bytes freed removing only this image
+        self.containers = []            # Containers IDs using it
+
+
+# Reclaimable item, kind is one of STORAGE_KINDS
+class StorageItem(object):
+    __slots__ = ('kind', 'ID', 'name', 'size', 'note')
+    def __init__(self, kind='', ID='', name='', size=None, note=''):
+        self.kind = kind
+        self.ID   = ID
+        self.name = name
+        self.size = size                # Bytes, None when unknown
+        self.note = note
+
+
+# Storage snapshot: images with their shared and unique bytes, reclaimable items
+class StorageReport(object):
+    def __init__(self):
+        self.images      = []           # StorageImage list, most unique bytes first
+        self.layers      = {}           # Layer digest -> bytes
+        self.users       = {}           # Layer digest -> images IDs using it
+        self.reclaimable = []           # StorageItem list
+        self.estimated   = False        # Some layer sizes are estimated (history not aligned with layers)
+        self.elapsed     = 0.0
+
+    @property
+    def virtual(self):                  # Sum of engine images sizes
+        return sum(image.size for image in self.images)
+    @property
+    def disk(self):                     # Images bytes on disk, each layer once
+        return sum(self.layers.values())
+    @property
+    def shared(self):                   # Bytes of layers used by more than one image
+        return sum(size for (layer, size) in self.layers.items() if len(self.users[layer]) > 1)
+
+    # total() Reclaimable bytes of [kind] items (all of them when not set)
+    def total(self, kind=None):
+        return sum(item.size or 0 for item in self.reclaimable if kind is None or item.kind == kind)
+
+    # freed() Bytes freed removing [items] (StorageItem list): containers writable layers, volumes and the image
+    #         layers not used by any other image. Images still used by containers not in [items] free nothing
+    def freed(self, items=[]):
+        removed = {item.ID for item in items if item.kind == 'container'}
+        images  = {item.ID for item in items if item.kind == 'image'}
+        images  = {image.ID for image in self.images if image.ID in images and set(image.containers) <= removed}
+        total   = sum(item.size or 0 for item in items if item.kind != 'image')
+        return total + sum(size for (layer, size) in self.layers.items() if self.users[layer] <= images)
+
+
+# storageBytes() Human readable [size] (SI units, like the runtimes), "?" when it's unknown
+def storageBytes(size=0):
+    if size is None:
+        return '?'
+    for unit in STORAGE_UNITS:
+        if abs(size) < 1000 or unit == STORAGE_UNITS[-1]:
+            return f'{size:.0f} {unit}' if unit == 'B' else f'{size:.1f} {unit}'
+        size /= 1000
+
+# Bytes in [path] (volume mount point), None when it cannot be read (rootful volumes, ...)
+def _directorySize(path=''):
+    if not path or not os.path.isdir(path):
+        return None
+    total = 0
+    try:
+        for (directory, _, files) in os.walk(path, onerror=_raise):
+            for name in files:
+                try:
+                    total += os.lstat(os.path.join(directory, name)).st_size
+                except OSError:
+                    pass
+    except OSError:
+        return None
+    return total
+
+def _raise(error):
+    raise error
+
+# Layer sizes from history sizes (oldest first): one entry for each layer, or empty layers left out
+def _historyAlign(layers=[], sizes=[]):
+    if len(sizes) == len(layers):
+        return sizes
+    sizes = [size for size in sizes if size > 0]
+    return sizes if len(sizes) == len(layers) else None
+
+
+# storageAnalyze() Storage accounting of [images] and [containers] (engine list items) through [engine]
+# @param engine (object) Engine backend with imageLayers(), imageHistory(), containersSize(), volumes()
+# @return (int, StorageReport|string) [returnCode, report or error message]
+def storageAnalyze(engine=None, images=[], containers=[], workers=BULK_WORKERS):
+    if not all(hasattr(engine, method) for method in ['imageLayers', 'imageHistory', 'containersSize', 'volumes']):
+        return (-1, 'Storage analysis is not available with this engine backend')
+    timeStart = time.monotonic()
+    report = StorageReport()
+    (errorCode, layers) = engine.imageLayers(IDs=[image['Id'] for image in images])
+    if errorCode != 0 and not layers:
+        return (errorCode, 'Cannot read images layers')
+    byID = {}
+    for item in images:
+        image = StorageImage(ID=item['Id'], name=(item.get('Names') or ['<none>'])[0], size=item.get('Size') or 0,
+                             layers=list(dict.fromkeys(layers.get(item['Id']) or [f"image:{item['Id']}"])))
+        byID[image.ID] = image
+        for layer in image.layers:
+            report.users.setdefault(layer, set()).add(image.ID)
+    for container in containers:
+        image = byID.get(container.get('ImageID', '').replace('sha256:', ''))
+        if image:
+            image.containers.append(container['Id'])
+    # Layer sizes, smallest stacks first: new layers of an image share its size left. Split among them is not needed
+    # when they're used by the same images (accounting is the same), otherwise it comes from the image history
+    order   = sorted(byID.values(), key=lambda image: len(image.layers))
+    (known, ambiguous) = (set(), [])
+    for image in order:
+        new = [layer for layer in image.layers if layer not in known]
+        if len(new) > 1 and any(report.users[layer] != report.users[new[0]] for layer in new):
+            ambiguous.append(image.ID)
+        known.update(new)
+    histories = {}
+    def history(ID):
+        (errorCode, sizes) = engine.imageHistory(imageID=ID)
+        if errorCode == 0:
+            histories[ID] = sizes
+        return (errorCode, '')
+    bulkRun(function=history, items=ambiguous, workers=workers)
+    for image in order:
+        new = [layer for layer in image.layers if layer not in report.layers]
+        if not new:
+            continue
+        left = max(0, image.size - sum(report.layers[layer] for layer in image.layers if layer in report.layers))
+        sizes = _historyAlign(image.layers, histories[image.ID]) if image.ID in histories else None
+        if sizes:
+            aligned = dict(zip(image.layers, sizes))
+            scale = left / max(1, sum(aligned[layer] for layer in new))         # History sizes rescaled to the image size
+            for layer in new:
+                report.layers[layer] = int(aligned[layer]*scale)
+        else:
+            report.estimated = report.estimated or image.ID in ambiguous
+            for layer in new:
+                report.layers[layer] = left // len(new)
+        report.layers[new[-1]] += left - sum(report.layers[layer] for layer in new)      # Rounding, image size is all there
+    for image in byID.values():
+        image.unique = sum(report.layers[layer] for layer in image.layers if len(report.users[layer]) == 1)
+        image.shared = sum(report.layers[layer] for layer in image.layers if len(report.users[layer]) > 1)
+    report.images = sorted(byID.values(), key=lambda image: (-image.unique, image.name))
+    # Reclaimable: stopped containers first (their images might be freed with them), dangling images, unused volumes
+    (_, sizes) = engine.containersSize()
+    sizes = {ID[:12]: size for (ID, size) in sizes.items()}
+    names = {}
+    for container in containers:
+        names[container['Id']] = (container.get('Names') or [container['Id'][:12]])[0]
+        if str(container.get('State', '')).lower() in STORAGE_STOPPED:
+            report.reclaimable.append(StorageItem(kind='container', ID=container['Id'], name=names[container['Id']], size=sizes.get(container['Id'][:12]),
+                                                  note=f"{container.get('State', '')}, {container.get('Image', '')}"))
+    for image in report.images:
+        if image.name == '<none>' and image.unique > 0:                 # Intermediate images (all layers used by children) free nothing
+            running = [names.get(ID, ID[:12]) for ID in image.containers]
+            report.reclaimable.append(StorageItem(kind='image', ID=image.ID, name=image.ID[:12], size=image.unique,
+                                                  note=f"dangling, used by {', '.join(running)}" if running else 'dangling'))
+    (errorCode, volumes) = engine.volumes()
+    for volume in volumes if errorCode == 0 else []:
+        if volume['InUse'] is False:
+            size = volume['Size'] if volume['Size'] is not None else _directorySize(volume['Mountpoint'])
+            report.reclaimable.append(StorageItem(kind='volume', ID=volume['Name'], name=volume['Name'][:40], size=size, note='unused'))
+    report.elapsed = time.monotonic()-timeStart
+    return (0, report)
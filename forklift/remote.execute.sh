@@ -1,7 +1,9 @@
 #!/usr/bin/env sh
 #
 # Execute forklift on a remote host through SSH connection
+#   - Build the application from these sources (app.build.py, sources only: smaller to copy)
 #   - Copy application on remote host
+#   - Compile its bytecode there, with the remote python3 (app.build.py --recompile, read from stdin)
 #   - Execute program there through the ssh connection
 #   - Delete the app once done
 #
@@ -12,6 +14,12 @@ REMOTE_USER=ben@hostname
 REMOTE_PATH=.
 REMOTE_EDITOR=`which vim`
 
+APP_BUILD="`dirname "$0"`/app.build.py"
+APP_DIR=`mktemp -d` || exit 1
+trap 'rm -rf "$APP_DIR"' EXIT
+python3 "$APP_BUILD" --no-bytecode --output "$APP_DIR/$APP_NAME" >/dev/null || exit 1
+
 # authorized_keys filename helps a lot if you want to avoid typing passwords all the time
-scp $APP_NAME $REMOTE_USER:$REMOTE_PATH
+scp "$APP_DIR/$APP_NAME" $REMOTE_USER:$REMOTE_PATH
+ssh $REMOTE_USER "python3 - --recompile $REMOTE_PATH/$APP_NAME" < "$APP_BUILD" >/dev/null   # Sources are still there when it fails
 ssh -tt $REMOTE_USER "EDITOR=$REMOTE_EDITOR $REMOTE_PATH/$APP_NAME; rm $REMOTE_PATH/$APP_NAME"
@@ -0,0 +1,4 @@
+# -*- coding: utf-8 -*-
+#
+# @description      forklift tests, stdlib unittest: python -m unittest discover -s tests -t .
+#
@@ -0,0 +1,117 @@
+# -*- coding: utf-8 -*-
+#
+# @description      stand-in engine REST API on a UNIX socket (docker compatible subset)
+#
+# @author           Andrea Benini
+# @date             2026-10-17
+# @license          GNU Affero General Public License v3.0
+# @see              HTTP/1.1 keep-alive server answering the requests EngineSocket makes for lists and actions.
+#                   Each client connection is counted, each request is logged as "METHOD path". Tests can make
+#                   it drop idle connections (engine keep-alive timeout) or hang up before answering an action
+#
+# pyright: reportMissingImports=false
+#
+import os
+import json
+import socket
+import time
+import tempfile
+import threading
+import socketserver
+import http.server
+
+
+class _FakeHandler(http.server.BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'               # Keep-alive
+
+    def setup(self):
+        super().setup()
+        with self.server.lock:
+            self.server.connections += 1
+            self.server.clients.append(self.connection)
+
+    def log_message(self, *arguments):
+        pass
+
+    def __answer(self, status=200, data=None):
+        body = json.dumps(data).encode() if data is not None else b''
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.send_header('Libpod-Api-Version', '4.9.0')
+        self.end_headers()
+        if body:
+            self.wfile.write(body)
+        self.close_connection = self.server.dropIdle         # Closed without telling the client (no "Connection: close")
+
+    def do_GET(self):
+        path = self.path.split('?')[0]
+        self.server.log(f'GET {path}')
+        if path == '/_ping':
+            return self.__answer(200, 'OK')
+        if path == '/containers/json':
+            return self.__answer(200, list(self.server.containers.values()))
+        if path.startswith('/containers/') and path.endswith('/json'):
+            item = self.server.containers.get(path.split('/')[2])
+            return self.__answer(200 if item else 404, item or {'message': 'no such container'})
+        return self.__answer(404, {'message': f'{path} not found'})
+
+    def do_POST(self):
+        path = self.path.split('?')[0]
+        self.server.log(f'POST {path}')
+        self.rfile.read(int(self.headers.get('Content-Length') or 0))
+        if self.server.hangUp:                              # Action received (and executed), answer lost
+            self.close_connection = True
+            return
+        parts = path.split('/')
+        if len(parts) == 4 and parts[1] == 'containers' and parts[2] in self.server.containers:
+            if parts[3] in ('stop', 'kill'):
+                self.server.containers[parts[2]]['State'] = 'exited'
+            return self.__answer(204)
+        return self.__answer(404, {'message': 'no such container'})
+
+
+class FakeAPI(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+    # @param containers (list) Container items, API layout (Id, Names, Image, State, ...)
+    def __init__(self, containers=[]):
+        self.directory   = tempfile.TemporaryDirectory()
+        self.path        = os.path.join(self.directory.name, 'api.sock')
+        self.lock        = threading.Lock()
+        self.containers  = {item['Id']: dict(item) for item in containers}
+        self.connections = 0
+        self.closed      = 0            # Connections closed by the server
+        self.clients     = []           # Client sockets, dropped by close() like an engine going away
+        self.requests    = []
+        self.dropIdle    = False
+        self.hangUp      = False
+        super().__init__(self.path, _FakeHandler)
+        self.thread = threading.Thread(target=self.serve_forever, kwargs={'poll_interval': 0.05}, daemon=True)
+        self.thread.start()
+
+    def shutdown_request(self, request):
+        super().shutdown_request(request)
+        with self.lock:
+            self.closed += 1
+
+    # idle() Wait until all connections have been closed by the server (dropIdle)
+    def idle(self, timeout=5):
+        deadline = time.monotonic() + timeout
+        while self.closed < self.connections and time.monotonic() < deadline:
+            time.sleep(0.005)
+
+    def log(self, request=''):
+        with self.lock:
+            self.requests.append(request)
+
+    def close(self):
+        self.shutdown()
+        self.server_close()
+        with self.lock:
+            for client in self.clients:
+                try:
+                    client.shutdown(socket.SHUT_RDWR)
+                except OSError:
+                    pass
+        self.directory.cleanup()
@@ -0,0 +1,110 @@
+# -*- coding: utf-8 -*-
+#
+# @description      in process stand-ins for engines and event streams
+#
+# @author           Andrea Benini
+# @date             2026-10-17
+# @license          GNU Affero General Public License v3.0
+# @see              FakeEngine answers like EngineSocket (no batch(), normalized events) from a dictionary of
+#                   containers, events are pushed by tests through its stream
+#
+# pyright: reportMissingImports=false
+#
+import queue
+
+
+# Event stream fed by tests: push() normalized events {Type, Action, ID, Name}, close() ends it
+class FakeEvents(object):
+    def __init__(self):
+        self.__queue = queue.Queue()
+
+    def push(self, itemType='container', action='', ID='', name=''):
+        self.__queue.put({'Type': itemType, 'Action': action, 'ID': ID, 'Name': name})
+
+    def close(self):
+        self.__queue.put(None)
+
+    def __iter__(self):
+        while True:
+            event = self.__queue.get()
+            if event is None:
+                return
+            yield event
+
+
+class FakeEngine(object):
+    platform = 'podman'
+    name     = 'fake'
+    valid    = True
+
+    # @param containers (list) Container items (ps --format=json layout), at least Id, Names and State
+    def __init__(self, containers=[], images=[]):
+        self.containers_ = {item['Id']: dict(item) for item in containers}
+        self.images_     = {item['Id']: dict(item) for item in images}
+        self.stream      = FakeEvents()
+        self.calls       = []
+
+    def containers(self):
+        return (0, [dict(item) for item in self.containers_.values()])
+
+    def images(self):
+        return (0, [dict(item) for item in self.images_.values()])
+
+    def container(self, containerID=''):
+        return (0, dict(self.containers_[containerID]) if containerID in self.containers_ else None)
+
+    def image(self, imageID=''):
+        return (0, dict(self.images_[imageID]) if imageID in self.images_ else None)
+
+    def events(self):
+        return self.stream
+
+    def inspect(self, containerID=''):
+        self.calls.append(('inspect', containerID))
+        return self.container(containerID=containerID)
+
+    def __action(self, action, containerID, state=None):
+        self.calls.append((action, containerID))
+        if containerID not in self.containers_:
+            return (125, f'no such container {containerID}')
+        if state:
+            self.containers_[containerID]['State'] = state
+        return (0, containerID)
+
+    def stop(self, containerID=''):
+        return self.__action('stop', containerID, 'exited')
+
+    def kill(self, containerID=''):
+        return self.__action('kill', containerID, 'exited')
+
+    def restart(self, containerID=''):
+        return self.__action('restart', containerID, 'running')
+
+    def remove(self, containerID=''):
+        return self.__action('remove', containerID)
+
+    # Storage analysis, each image is a single layer of its own
+    def imageLayers(self, IDs=[]):
+        return (0, {ID: [f'layer-{ID}'] for ID in IDs if ID in self.images_})
+
+    def imageHistory(self, imageID=''):
+        return (0, [self.images_[imageID].get('Size', 0)] if imageID in self.images_ else [])
+
+    def containersSize(self):
+        return (0, {ID: 1000 for ID in self.containers_})
+
+    def volumes(self):
+        return (0, [{'Name': 'data', 'Mountpoint': '/var/lib/volumes/data', 'Size': 5000, 'InUse': False}])
+
+    def volumeRemove(self, volumeName=''):
+        self.calls.append(('volumeRemove', volumeName))
+        return (0, volumeName)
+
+    def close(self):
+        pass
+
+
+# container() Minimal container item
+def container(ID='', name='', state='running', image='localhost/test:latest'):
+    return {'Id': ID, 'Names': [name or ID], 'Image': image, 'ImageID': 'sha256:'+'0'*64, 'State': state,
+            'CreatedAt': '2026-10-17 10:00:00 +0000 UTC', 'Command': ['sleep', 'infinity']}
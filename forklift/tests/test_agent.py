@@ -0,0 +1,150 @@
+# -*- coding: utf-8 -*-
+#
+# @description      agent server and client over a socket pair: deltas and actions
+#
+# @author           Andrea Benini
+# @date             2026-10-17
+# @license          GNU Affero General Public License v3.0
+#
+# pyright: reportMissingImports=false
+#
+import time
+import socket
+import threading
+import unittest
+
+from forkliftlib.agent    import AgentServer, EngineAgent
+from forkliftlib.protocol import frameRead, frameWrite
+from forkliftlib.state    import StateStore
+from forkliftlib.storage  import storageAnalyze
+from tests.fakes          import FakeEngine, container
+
+
+TIMEOUT = 5                             # Seconds, max wait for a frame
+
+
+class AgentTest(unittest.TestCase):
+    def setUp(self):
+        self.engine = FakeEngine(containers=[container('c1', 'one'), container('c2', 'two', state='exited')])
+        self.state  = StateStore(engine=self.engine, interval=60)
+        self.state.start()
+        self.server = AgentServer(engine=self.engine, state=self.state)
+        (self.local, self.remote) = socket.socketpair()
+        self.local.settimeout(TIMEOUT)
+        self.thread = threading.Thread(target=self.server.serve, kwargs={'input': self.remote.makefile('rb'), 'output': self.remote.makefile('wb')}, daemon=True)
+        self.thread.start()
+        (self.input, self.output) = (self.local.makefile('rb'), self.local.makefile('wb'))
+
+    def tearDown(self):
+        self.state.stop()
+        self.local.shutdown(socket.SHUT_RDWR)               # Files made from it keep it open, the server gets its EOF now
+        self.local.close()
+        self.thread.join(timeout=TIMEOUT)
+        self.remote.close()
+        self.server.close()
+
+    # Next frame of kind [kind], others are skipped
+    def frame(self, kind=''):
+        while True:
+            message = frameRead(self.input)
+            self.assertIsNotNone(message)
+            if message['t'] == kind:
+                return message
+
+    def test_snapshot(self):
+        self.assertEqual(self.frame('hello')['platform'], 'podman')
+        snap = self.frame('snap')
+        self.assertEqual({item['Id']: item['State'] for item in snap['c']}, {'c1': 'running', 'c2': 'exited'})
+
+    def test_delta_on_state_event(self):
+        self.frame('snap')
+        self.engine.stream.push(action='die', ID='c1', name='one')
+        delta = self.frame('delta')
+        self.assertEqual([(item['Id'], item['State']) for item in delta['c']], [('c1', 'exited')])
+        self.engine.stream.push(action='start', ID='c2', name='two')
+        delta = self.frame('delta')
+        self.assertEqual([(item['Id'], item['State']) for item in delta['c']], [('c2', 'running')])
+
+    def test_delta_on_remove(self):
+        self.frame('snap')
+        self.engine.stream.push(action='remove', ID='c2', name='two')
+        self.assertEqual(self.frame('delta')['cd'], ['c2'])
+
+    def test_batch_without_engine_batch(self):
+        self.frame('snap')
+        frameWrite(self.output, {'t': 'call', 'n': 1, 'm': 'batch', 'a': {'action': 'stop', 'IDs': ['c1', 'c2', 'missing']}})
+        result = self.frame('ret')
+        self.assertEqual(result['n'], 1)
+        self.assertEqual([code for (code, _) in result['r']], [0, 0, 125])
+        self.assertEqual(sorted(self.engine.calls), [('stop', 'c1'), ('stop', 'c2'), ('stop', 'missing')])
+
+    def test_unsupported_call(self):
+        self.frame('snap')
+        frameWrite(self.output, {'t': 'call', 'n': 2, 'm': 'system', 'a': {}})
+        self.assertEqual(self.frame('ret')['r'][0], -1)
+
+
+class EngineAgentTest(unittest.TestCase):
+    def setUp(self):
+        self.engine = FakeEngine(containers=[container('c1', 'one'), container('c2', 'two', state='exited')],
+                                 images=[{'Id': 'i1', 'Names': ['localhost/one:latest'], 'Size': 1000}, {'Id': 'i2', 'Names': [], 'Size': 2000}])
+        self.state  = StateStore(engine=self.engine, interval=60)
+        self.state.start()
+        self.server = AgentServer(engine=self.engine, state=self.state)
+        (local, remote) = socket.socketpair()
+        self.sockets = (local, remote)
+        threading.Thread(target=self.server.serve, kwargs={'input': remote.makefile('rb'), 'output': remote.makefile('wb')}, daemon=True).start()
+        def closer():
+            local.shutdown(socket.SHUT_RDWR)
+        self.client = EngineAgent(input=local.makefile('rb'), output=local.makefile('wb'), closer=closer, terminal='', kind='daemon')
+        self.assertTrue(self.client.start(timeout=TIMEOUT))
+
+    def tearDown(self):
+        self.client.close()
+        self.state.stop()
+        self.server.close()
+        for connection in self.sockets:
+            connection.close()
+
+    # Client state of container [ID] once it's [state]
+    def waitState(self, ID='', state=''):
+        deadline = time.monotonic() + TIMEOUT
+        while time.monotonic() < deadline:
+            if (self.client.state.container(ID) or {}).get('State') == state:
+                return True
+            time.sleep(0.01)
+        return False
+
+    def test_state_follows_events(self):
+        self.assertTrue(self.client.valid)
+        self.engine.stream.push(action='start', ID='c2', name='two')
+        self.assertTrue(self.waitState('c2', 'running'))
+
+    def test_bulk_through_agent(self):
+        self.assertEqual(self.client.batch(action='kill', IDs=['c1', 'c2']), [(0, 'c1'), (0, 'c2')])
+        self.assertEqual(self.client.batch(action='volume rm', IDs=['data']), [(0, 'data')])
+        self.assertEqual(self.client.batch(action='system prune', IDs=['x']), [(-1, 'Unsupported action: batch system prune')])
+
+    def test_storage_through_agent(self):
+        (errorCode, report) = storageAnalyze(engine=self.client, images=self.engine.images()[1], containers=self.engine.containers()[1])
+        self.assertEqual(errorCode, 0)
+        self.assertEqual(report.disk, 3000)
+        self.assertEqual({(item.kind, item.ID, item.size) for item in report.reclaimable}, {('container', 'c2', 1000), ('image', 'i2', 2000), ('volume', 'data', 5000)})
+
+    def test_calls_pending_on_disconnect(self):
+        gate    = threading.Event()
+        results = []
+        self.engine.stop = lambda containerID='': (gate.wait(TIMEOUT), (0, containerID))[1]
+        callers = [threading.Thread(target=lambda: results.append(self.client.stop(containerID='c1'))) for _ in range(8)]
+        for caller in callers:
+            caller.start()
+        time.sleep(0.1)                                     # Calls sent, none answered
+        self.sockets[0].shutdown(socket.SHUT_RDWR)
+        for caller in callers:
+            caller.join(timeout=TIMEOUT)
+        gate.set()
+        self.assertEqual(results, [(-1, 'Agent disconnected')]*8)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,69 @@
+# -*- coding: utf-8 -*-
+#
+# @description      Build pipeline logs directory: owned by the user and not writable by others, refused otherwise
+#
+# @author           Andrea Benini
+# @date             2026-10-17
+# @license          GNU Affero General Public License v3.0
+#
+# pyright: reportMissingImports=false
+#
+import os
+import tempfile
+import unittest
+
+from forkliftlib.build import buildGraph, BuildPipeline
+
+
+TIMEOUT = 10
+
+
+class BuildLogsTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.logs      = os.path.join(self.directory.name, 'logs')
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def pipelineRun(self):
+        pipeline = BuildPipeline(profiles=buildGraph([('hello', 'echo hello')], cwd=self.directory.name), logs=self.logs)
+        pipeline.start()
+        pipeline.wait(TIMEOUT)
+        return pipeline
+
+    def test_created(self):
+        pipeline = self.pipelineRun()
+        self.assertEqual(pipeline.jobs[0].status, 'done')
+        self.assertEqual(os.lstat(self.logs).st_mode & 0o777, 0o700)
+        with open(pipeline.jobs[0].log) as file:
+            self.assertEqual(file.read(), 'hello\n')
+
+    def test_readable_by_others(self):
+        os.mkdir(self.logs, 0o755)
+        os.chmod(self.logs, 0o755)
+        self.assertEqual(self.pipelineRun().jobs[0].status, 'done')
+
+    def test_writable_by_others(self):
+        os.mkdir(self.logs)
+        os.chmod(self.logs, 0o1777)
+        job = self.pipelineRun().jobs[0]
+        self.assertEqual((job.status, job.message), ('failed', f'Cannot create logs directory: {self.logs}: open to other users (mode 1777)'))
+
+    def test_symlink(self):
+        target = os.path.join(self.directory.name, 'elsewhere')
+        os.mkdir(target, 0o700)
+        os.symlink(target, self.logs)
+        job = self.pipelineRun().jobs[0]
+        self.assertEqual((job.status, job.message), ('failed', f'Cannot create logs directory: {self.logs}: not a directory'))
+        self.assertEqual(os.listdir(target), [])
+
+    @unittest.skipUnless(os.getuid() == 0, 'changing owner needs root')
+    def test_other_owner(self):
+        os.mkdir(self.logs, 0o755)
+        os.chown(self.logs, 12345, 12345)
+        self.assertEqual(self.pipelineRun().jobs[0].status, 'failed')
+
+
+if __name__ == '__main__':
+    unittest.main()
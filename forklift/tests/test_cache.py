@@ -0,0 +1,74 @@
+# -*- coding: utf-8 -*-
+#
+# @description      Startup cache and build file digests: stored in the user cache directory, one for each configuration path
+#
+# @author           Andrea Benini
+# @date             2026-10-17
+# @license          GNU Affero General Public License v3.0
+#
+# pyright: reportMissingImports=false
+#
+import os
+import json
+import tempfile
+import unittest
+import unittest.mock
+
+from forkliftlib.cache     import cacheDirectory, cacheLoad, cacheSave, CACHE_FILE
+from forkliftlib.buildhash import DigestCache, HASH_CACHE
+
+
+class CacheTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.cacheHome = os.path.join(self.directory.name, 'cache')
+        self.config    = os.path.join(self.directory.name, 'config')
+        os.mkdir(self.config)
+        self.environ   = unittest.mock.patch.dict(os.environ, {'XDG_CACHE_HOME': self.cacheHome})
+        self.environ.start()
+
+    def tearDown(self):
+        self.environ.stop()
+        self.directory.cleanup()
+
+    def test_outside_configuration(self):
+        self.assertTrue(cacheSave(self.config, {'tab': 1}))
+        self.assertEqual(os.listdir(self.config), [])
+        directory = cacheDirectory(self.config)
+        self.assertEqual(os.path.dirname(directory), os.path.join(self.cacheHome, 'forklift'))
+        self.assertEqual(os.listdir(directory), [CACHE_FILE])
+        self.assertEqual(cacheLoad(self.config)['tab'], 1)
+
+    def test_one_for_each_path(self):
+        other = os.path.join(self.directory.name, 'other')
+        os.mkdir(other)
+        cacheSave(self.config, {'tab': 1})
+        cacheSave(other, {'tab': 2})
+        self.assertEqual((cacheLoad(self.config)['tab'], cacheLoad(other)['tab']), (1, 2))
+        self.assertEqual(cacheDirectory(self.config), cacheDirectory(self.config+'/.'))
+
+    def test_broken_or_old(self):
+        self.assertEqual(cacheLoad(self.config), {})
+        fileName = os.path.join(cacheDirectory(self.config), CACHE_FILE)
+        with open(fileName, 'w') as file:
+            json.dump({'version': 0, 'tab': 1}, file)
+        self.assertEqual(cacheLoad(self.config), {})
+        with open(fileName, 'w') as file:
+            file.write('{')
+        self.assertEqual(cacheLoad(self.config), {})
+
+    def test_digests_outside_configuration(self):
+        fileName = os.path.join(self.directory.name, 'Containerfile')
+        with open(fileName, 'w') as file:
+            file.write('FROM scratch\n')
+        os.utime(fileName, (1, 1))                          # Old enough to be cached
+        cache  = DigestCache(self.config)
+        digest = cache.digest(fileName, os.lstat(fileName))
+        self.assertTrue(cache.save())
+        self.assertEqual(os.listdir(self.config), [])
+        self.assertTrue(os.path.isfile(os.path.join(cacheDirectory(self.config), HASH_CACHE)))
+        self.assertEqual(DigestCache(self.config).digest(fileName, os.lstat(fileName)), digest)
+
+
+if __name__ == '__main__':
+    unittest.main()
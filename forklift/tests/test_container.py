@@ -0,0 +1,84 @@
+# -*- coding: utf-8 -*-
+#
+# @description      Container inspect cache: state keys, events invalidation, concurrent prefetch
+#
+# @author           Andrea Benini
+# @date             2026-10-17
+# @license          GNU Affero General Public License v3.0
+#
+# pyright: reportMissingImports=false
+#
+import os
+import tempfile
+import threading
+import unittest
+import unittest.mock
+
+from forkliftlib.container import Container
+from tests.fakes           import FakeEngine, container
+
+
+TIMEOUT = 5
+
+
+class InspectCacheTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.cacheHome = unittest.mock.patch.dict(os.environ, {'XDG_CACHE_HOME': os.path.join(self.directory.name, 'cache')})
+        self.cacheHome.start()
+        self.engine    = FakeEngine(containers=[container(f'c{index}', state='running' if index % 2 else 'exited') for index in range(20)])
+        self.container = Container(path=self.directory.name, engine=self.engine)
+        self.state     = self.container.watch(interval=60)
+
+    def tearDown(self):
+        self.container.close()
+        self.cacheHome.stop()
+        self.directory.cleanup()
+
+    def inspects(self, ID=''):
+        return self.engine.calls.count(('inspect', ID))
+
+    # Push an event on container [ID] and wait for the events thread to hand it to listeners (Container ones first)
+    def event(self, action='', ID=''):
+        seen = threading.Event()
+        self.state.eventListenerAdd(lambda itemType, eventID: seen.set() if eventID == ID else None)
+        self.engine.stream.push(action=action, ID=ID)
+        self.assertTrue(seen.wait(TIMEOUT))
+
+    def test_cached_by_state(self):
+        self.assertEqual(self.container.Inspect('c1')[1]['Id'], 'c1')
+        self.container.Inspect('c1')
+        self.assertEqual(self.inspects('c1'), 1)
+
+    def test_event_drops_details(self):
+        self.container.Inspect('c1')
+        self.event(action='restart', ID='c1')                        # Same state, details changed anyway
+        self.container.Inspect('c1')
+        self.assertEqual(self.inspects('c1'), 2)
+
+    def test_missing_container(self):
+        self.assertEqual(self.container.Inspect('gone'), (0, None))
+
+    def test_prefetch_running(self):
+        self.assertEqual(self.container.Prefetch(), 10)
+        self.assertEqual(sorted(ID for (_, ID) in self.engine.calls), sorted(f'c{index}' for index in range(1, 20, 2)))
+
+    def test_prefetch_concurrent_events(self):
+        errors = []
+        def forget():
+            try:
+                for _ in range(200):
+                    self.engine.stream.push(action='update', ID='c1')
+            except Exception as E:
+                errors.append(E)
+        thread = threading.Thread(target=forget)
+        thread.start()
+        for _ in range(20):
+            self.container.InspectMany([f'c{index}' for index in range(20)])
+        thread.join(timeout=TIMEOUT)
+        self.assertEqual(errors, [])
+        self.assertEqual(len(self.container.InspectMany(['c1', 'c3'])), 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,81 @@
+# -*- coding: utf-8 -*-
+#
+# @description      Daemon socket trust: directory writable by its owner only, socket of this user, root or the daemon group
+#
+# @author           Andrea Benini
+# @date             2026-10-17
+# @license          GNU Affero General Public License v3.0
+#
+# pyright: reportMissingImports=false
+#
+import os
+import grp
+import socket
+import tempfile
+import unittest
+
+from forkliftlib.daemon import daemonTrusted, daemonAttach, daemonRun
+
+
+OTHER = 12345                           # Another user, not in any group
+
+
+class DaemonTrustTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.sockets   = os.path.join(self.directory.name, 'run')
+        os.mkdir(self.sockets, 0o755)
+        os.chmod(self.sockets, 0o755)
+        self.path      = os.path.join(self.sockets, 'forklift.sock')
+        self.listener  = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.listener.bind(self.path)
+        self.group     = grp.getgrgid(os.getgid()+1 if os.getuid() == 0 else os.getgid()).gr_name
+
+    def tearDown(self):
+        self.listener.close()
+        self.directory.cleanup()
+
+    def test_own_socket(self):
+        self.assertEqual(daemonTrusted(self.path, group=self.group), (0, ''))
+
+    def test_writable_directory(self):
+        for mode in (0o1777, 0o775):
+            os.chmod(self.sockets, mode)
+            self.assertEqual(daemonTrusted(self.path, group=self.group), (-1, f'{self.sockets} is writable by other users'))
+        self.assertIsNone(daemonAttach(path=self.path))
+        other = os.path.join(self.sockets, 'other.sock')
+        self.assertEqual(daemonRun(agent=None, path=other), (-1, f'{self.sockets} is writable by other users, clients would not attach to {other}'))
+        self.assertFalse(os.path.lexists(other))
+
+    def test_not_a_socket(self):
+        fileName = os.path.join(self.sockets, 'file')
+        open(fileName, 'w').close()
+        self.assertEqual(daemonTrusted(fileName), (-1, f'{fileName} is not a socket'))
+        link = os.path.join(self.directory.name, 'link')
+        os.symlink(self.sockets, link)
+        self.assertEqual(daemonTrusted(os.path.join(link, 'forklift.sock')), (-1, f'{link} is not a directory'))
+
+    @unittest.skipUnless(os.getuid() == 0, 'changing owner needs root')
+    def test_daemon_group(self):
+        (groupID, other) = (grp.getgrnam(self.group).gr_gid, grp.getgrgid(os.getgid()+2).gr_name)
+        os.chown(self.sockets, OTHER, groupID)
+        os.chown(self.path, OTHER, groupID)
+        os.chmod(self.directory.name, 0o755)
+        os.setegid(groupID)                                 # Root passes any uid check, test it as a plain group member
+        os.seteuid(OTHER+1)
+        try:
+            self.assertEqual(daemonTrusted(self.path, group=self.group), (0, ''))
+            self.assertEqual(daemonTrusted(self.path, group=other), (-1, f'{self.path} belongs to another user (uid {OTHER}) and not to the {other} group'))
+        finally:
+            os.seteuid(0)
+            os.setegid(0)
+
+    @unittest.skipUnless(os.getuid() == 0, 'changing owner needs root')
+    def test_planted_socket(self):
+        os.chown(self.sockets, OTHER, 0)                    # Daemon account directory, socket of someone else in the daemon group
+        os.chown(self.path, OTHER+1, grp.getgrnam(self.group).gr_gid)
+        self.assertEqual(daemonTrusted(self.path, group=self.group), (-1, f'{self.path} does not belong to the owner of {self.sockets}'))
+
+
+if __name__ == '__main__':
+    unittest.main()
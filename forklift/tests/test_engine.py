@@ -0,0 +1,111 @@
+# -*- coding: utf-8 -*-
+#
+# @description      EngineSocket against a stand-in API socket: keep-alive, reconnection, retries, CLI fallback
+#
+# @author           Andrea Benini
+# @date             2026-10-17
+# @license          GNU Affero General Public License v3.0
+#
+# pyright: reportMissingImports=false
+#
+import os
+import tempfile
+import threading
+import unittest
+import unittest.mock
+
+from forkliftlib.engine import EngineSocket, EngineCLI, engineOpen
+from tests.fakeapi      import FakeAPI
+
+
+CONTAINERS = [{'Id': f'c{index}', 'Names': [f'/one-{index}'], 'Image': 'localhost/test:latest', 'ImageID': 'sha256:'+'0'*64,
+               'State': 'running', 'Created': 0, 'Command': 'sleep infinity'} for index in range(3)]
+
+
+class EngineSocketTest(unittest.TestCase):
+    def setUp(self):
+        self.api    = FakeAPI(containers=CONTAINERS)
+        self.engine = EngineSocket(path=self.api.path)
+
+    def tearDown(self):
+        self.engine.close()
+        self.api.close()
+
+    def test_detected(self):
+        self.assertTrue(self.engine.valid)
+        self.assertEqual(self.engine.platform, 'podman')        # Libpod API headers
+        (errorCode, items) = self.engine.containers()
+        self.assertEqual(errorCode, 0)
+        self.assertEqual([item['Names'] for item in items], [['one-0'], ['one-1'], ['one-2']])
+
+    def test_keepalive_reused(self):
+        for _ in range(10):
+            self.assertEqual(self.engine.containers()[0], 0)
+        self.assertEqual(self.api.connections, 1)
+
+    def test_concurrent_callers(self):
+        threads = [threading.Thread(target=self.engine.inspect, kwargs={'containerID': 'c1'}) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        connections = self.api.connections
+        self.assertLessEqual(connections, 5)
+        for _ in range(5):
+            self.engine.inspect(containerID='c1')
+        self.assertEqual(self.api.connections, connections)     # Idle connections are there for sequential calls
+
+    def test_reconnect_after_drop(self):
+        self.api.dropIdle = True
+        for _ in range(3):
+            self.assertEqual(self.engine.containers()[0], 0)
+            self.api.idle()                                     # Dropped while it was idle, not while it's used
+        self.assertEqual(self.engine.stop(containerID='c1'), (0, 'c1'))
+        self.assertEqual(self.api.requests.count('POST /containers/c1/stop'), 1)
+
+    def test_action_not_repeated(self):
+        self.engine.containers()
+        self.api.hangUp = True
+        (errorCode, _) = self.engine.kill(containerID='c2')
+        self.assertNotEqual(errorCode, 0)
+        self.assertEqual(self.api.requests.count('POST /containers/c2/kill'), 1)
+        self.api.hangUp = False
+        self.assertEqual(self.engine.containers()[0], 0)        # Next request on a new connection
+
+    def test_engine_gone(self):
+        self.api.close()
+        self.assertEqual(self.engine.containers()[0], -1)
+        self.api = FakeAPI(containers=CONTAINERS)               # tearDown closes this one
+
+
+class EngineOpenTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.environment = unittest.mock.patch.dict(os.environ, {'XDG_RUNTIME_DIR': self.directory.name, 'CONTAINER_HOST': '', 'DOCKER_HOST': ''})
+        self.environment.start()
+
+    def tearDown(self):
+        self.environment.stop()
+        self.directory.cleanup()
+
+    def test_socket_first(self):
+        api = FakeAPI(containers=CONTAINERS)
+        try:
+            with unittest.mock.patch.dict(os.environ, {'FORKLIFT_SOCKET': 'unix://'+api.path}):
+                engine = engineOpen(platform='docker', service=False)
+            self.assertIsInstance(engine, EngineSocket)
+            self.assertEqual(engine.path, api.path)
+            engine.close()
+        finally:
+            api.close()
+
+    def test_cli_fallback(self):
+        dead = os.path.join(self.directory.name, 'dead.sock')
+        open(dead, 'w').close()                                 # There, nobody listening
+        with unittest.mock.patch.dict(os.environ, {'FORKLIFT_SOCKET': dead}):
+            self.assertIsInstance(engineOpen(platform='podman', service=False), EngineCLI)
+            self.assertIsNone(engineOpen(platform='podman', socketPath=dead))
+
+
+if __name__ == '__main__':
+    unittest.main()
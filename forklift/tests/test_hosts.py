@@ -0,0 +1,131 @@
+# -*- coding: utf-8 -*-
+#
+# @description      HostPool on stand-in hosts: merged lists, host column, an unreachable host never blocks the others.
+#                   SSH control sockets directory: private or not used at all
+#
+# @author           Andrea Benini
+# @date             2026-10-17
+# @license          GNU Affero General Public License v3.0
+# @see              The "ssh" command is a shell script running the remote command locally with benchmark/fakeruntime.py
+#                   installed as podman and docker, each host gets its own seed (its own containers and images)
+#
+# pyright: reportMissingImports=false
+#
+import os
+import sys
+import time
+import tempfile
+import unittest
+import subprocess
+import unittest.mock
+
+from forkliftlib.execute import pathPrivate
+from forkliftlib.hosts   import HostPool, sshCommand
+
+
+FAKERUNTIME = os.path.join(os.path.dirname(os.path.dirname(os.path.realpath(__file__))), 'benchmark', 'fakeruntime.py')
+ITEMS       = 3
+UNREACHABLE = 2                         # Seconds the unreachable host takes before failing (like a connect timeout)
+# ssh -n host 'command': "down" fails like ssh does (exit 255) after a while, the others run the command locally
+SSH_WRAPPER = '''#!/bin/sh
+shift
+case "$1" in
+    down)  sleep {unreachable}; echo "ssh: connect to host down port 22: Connection timed out" >&2; exit 255;;
+    alpha) seed=1;;
+    *)     seed=2;;
+esac
+shift
+PATH={bin}:$PATH FORKLIFT_BENCH_ITEMS={items} FORKLIFT_BENCH_SEED=$seed exec /bin/sh -c "exec $*"
+'''
+
+
+def waitFor(condition, timeout=10):
+    timeEnd = time.monotonic()+timeout
+    while not condition() and time.monotonic() < timeEnd:
+        time.sleep(0.02)
+    return condition()
+
+
+class HostPoolTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        fakeBin = os.path.join(self.directory.name, 'bin')
+        os.mkdir(fakeBin)
+        subprocess.run([sys.executable, FAKERUNTIME, '--install', fakeBin], check=True, stdout=subprocess.DEVNULL)
+        self.ssh = os.path.join(self.directory.name, 'ssh')
+        with open(self.ssh, 'w') as file:
+            file.write(SSH_WRAPPER.format(bin=fakeBin, items=ITEMS, unreachable=UNREACHABLE))
+        os.chmod(self.ssh, 0o755)
+        self.pool = HostPool(hosts=['alpha', 'down', 'beta'], ssh=self.ssh, interval=60)
+
+    def tearDown(self):
+        self.pool.stop()
+        self.directory.cleanup()
+
+    def test_merged_with_host_column(self):
+        self.pool.start()
+        self.assertTrue(waitFor(lambda: len(self.pool.containers()) == 2*ITEMS and len(self.pool.images()) == 2*ITEMS))
+        containers = self.pool.containers()
+        self.assertEqual([name for (name, _) in containers], ['alpha']*ITEMS + ['beta']*ITEMS)
+        alpha = {item['Id'] for (name, item) in containers if name == 'alpha'}
+        beta  = {item['Id'] for (name, item) in containers if name == 'beta'}
+        self.assertFalse(alpha & beta)                      # Different hosts, different containers
+        self.assertEqual({name for (name, _) in self.pool.images()}, {'alpha', 'beta'})
+        for name in ('alpha', 'beta'):
+            host = self.pool.host(name)
+            self.assertEqual((host.platform, host.error), ('podman', ''))
+            self.assertIsNotNone(host.latency)
+            self.assertEqual(len(host.engine.containers()[1]), ITEMS)
+
+    def test_unreachable_does_not_block(self):
+        timeStart = time.monotonic()
+        self.pool.start()
+        self.assertTrue(waitFor(lambda: len(self.pool.containers()) == 2*ITEMS))
+        self.assertLess(time.monotonic()-timeStart, UNREACHABLE)
+        down = self.pool.host('down')
+        self.assertEqual((down.error, down.containers(), down.engine), ('connecting', [], None))
+        self.assertTrue(waitFor(lambda: down.error != 'connecting'))
+        self.assertEqual(down.error, 'ssh: connect to host down port 22: Connection timed out')
+        self.assertIsNone(down.platform)                    # 255 is ssh failing, docker is not tried
+        self.assertEqual(len(self.pool.containers()), 2*ITEMS)
+
+
+class SshControlTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.control   = os.path.join(self.directory.name, 'forklift-ssh')
+        self.environ   = unittest.mock.patch.dict(os.environ, {'XDG_RUNTIME_DIR': self.directory.name})
+        self.environ.start()
+
+    def tearDown(self):
+        self.environ.stop()
+        self.directory.cleanup()
+
+    def test_created_private(self):
+        self.assertEqual(pathPrivate(self.control), (0, self.control))
+        self.assertEqual(os.lstat(self.control).st_mode & 0o777, 0o700)
+        self.assertIn(f'ControlPath={self.control}/%C', sshCommand())
+
+    def test_open_to_others(self):
+        os.mkdir(self.control, 0o700)
+        os.chmod(self.control, 0o1777)
+        self.assertEqual(pathPrivate(self.control)[0], -1)
+        self.assertNotIn('Control', sshCommand())
+
+    def test_symlink(self):
+        target = os.path.join(self.directory.name, 'elsewhere')
+        os.mkdir(target, 0o700)
+        os.symlink(target, self.control)
+        self.assertEqual(pathPrivate(self.control), (-1, f'{self.control}: not a directory'))
+        self.assertNotIn('Control', sshCommand())
+
+    @unittest.skipUnless(os.getuid() == 0, 'changing owner needs root')
+    def test_other_owner(self):
+        os.mkdir(self.control, 0o700)
+        os.chown(self.control, 12345, 12345)
+        self.assertEqual(pathPrivate(self.control), (-1, f'{self.control}: owned by another user'))
+        self.assertNotIn('Control', sshCommand())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,62 @@
+# -*- coding: utf-8 -*-
+#
+# @description      Startup budget: imports and first frame of the sources and of a freshly built forklift.app.
+#                   The shipped forklift.app has the current sources and their bytecode (./app.build.py)
+#
+# @author           Andrea Benini
+# @date             2026-10-17
+# @license          GNU Affero General Public License v3.0
+# @see              benchmark/startup.py is run as it is, with its default budgets (median of a few runs): it exits
+#                   with 1 and tells what is over budget. No engine is needed, the first frame is then its error box
+#
+# pyright: reportMissingImports=false
+#
+import os
+import sys
+import zipfile
+import tempfile
+import unittest
+import subprocess
+
+
+ROOT    = os.path.dirname(os.path.dirname(os.path.realpath(__file__)))
+STARTUP = os.path.join(ROOT, 'benchmark', 'startup.py')
+RUNS    = 3
+
+
+class StartupBudgetTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.environ   = dict(os.environ, XDG_CACHE_HOME=self.directory.name)   # Startup cache of a previous session is not there
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    # Budgets of [target], benchmark report on failures
+    def assertBudget(self, target=''):
+        process = subprocess.run([sys.executable, STARTUP, '--target', target, '--runs', str(RUNS), '--modules', '5', '--', '--path', self.directory.name],
+                                 env=self.environ, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, universal_newlines=True)
+        self.assertEqual(process.returncode, 0, process.stdout)
+
+    def test_sources(self):
+        self.assertBudget(os.path.join(ROOT, 'forklift.py'))
+
+    def test_app(self):
+        app = os.path.join(self.directory.name, 'forklift.app')
+        subprocess.run([sys.executable, os.path.join(ROOT, 'app.build.py'), '--output', app], check=True, stdout=subprocess.DEVNULL)
+        self.assertBudget(app)
+
+    def test_shipped_app(self):
+        sources = {'__main__.py': 'forklift.py', 'forklift.py': 'forklift.py', '__init__.py': '__init__.py'}
+        sources.update({f'forkliftlib/{name}': os.path.join('forkliftlib', name) for name in os.listdir(os.path.join(ROOT, 'forkliftlib')) if name.endswith('.py')})
+        with zipfile.ZipFile(os.path.join(ROOT, 'forklift.app')) as archive:
+            names = set(archive.namelist())
+            self.assertEqual({name for name in names if name.endswith('.py')}, set(sources), 'forklift.app is not up to date, run ./app.build.py')
+            for (name, fileName) in sources.items():
+                with open(os.path.join(ROOT, fileName), 'rb') as file:
+                    self.assertEqual(archive.read(name), file.read(), f'{name} in forklift.app is not up to date, run ./app.build.py')
+            self.assertEqual({name for name in names if name.endswith('.pyc')}, {name+'c' for name in sources})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,122 @@
+# -*- coding: utf-8 -*-
+#
+# @description      Stats sampler on a fake cgroup v2 tree: discovery, CPU, memory, I/O, pids, ring buffers
+#
+# @author           Andrea Benini
+# @date             2026-10-17
+# @license          GNU Affero General Public License v3.0
+#
+# pyright: reportMissingImports=false
+#
+import os
+import shutil
+import tempfile
+import unittest
+import unittest.mock
+
+from forkliftlib.stats import StatsSampler, sparkline, humanBytes
+
+
+PODMAN = 'a'*64
+DOCKER = 'b'*64
+
+
+class FakeCgroup(object):
+    def __init__(self, root=''):
+        self.root = root
+        open(os.path.join(root, 'cgroup.controllers'), 'w').write('cpu io memory pids\n')
+
+    # add() Container cgroup directory [relative] to the root
+    def add(self, relative=''):
+        path = os.path.join(self.root, relative)
+        os.makedirs(path)
+        return path
+
+    # write() Counters of cgroup [path]: cpu usec, memory bytes, read and written bytes (two devices), pids
+    def write(self, path='', cpu=0, memory=0, read=0, written=0, pids=1):
+        files = {'cpu.stat':       f'usage_usec {cpu}\nuser_usec {cpu//2}\nsystem_usec {cpu//2}\n',
+                 'memory.current': f'{memory}\n',
+                 'io.stat':        f'8:0 rbytes={read//2} wbytes={written//2} rios=1 wios=1\n8:16 rbytes={read-read//2} wbytes={written-written//2}\n',
+                 'pids.current':   f'{pids}\n'}
+        for (name, content) in files.items():
+            with open(os.path.join(path, name), 'w') as file:
+                file.write(content)
+
+
+class StatsSamplerTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.cgroup  = FakeCgroup(self.directory.name)
+        self.podman  = self.cgroup.add(f'user.slice/user-1000.slice/user@1000.service/user.slice/libpod-{PODMAN}.scope')
+        self.docker  = self.cgroup.add(f'system.slice/docker-{DOCKER}.scope')
+        self.cgroup.add(f'machine.slice/libpod-conmon-{"c"*64}.scope')        # Monitor process, not a container
+        self.now     = 100.0
+        self.clock   = unittest.mock.patch('forkliftlib.stats.time.monotonic', lambda: self.now)
+        self.clock.start()
+        self.sampler = StatsSampler(root=self.directory.name, history=5)
+
+    def tearDown(self):
+        self.clock.stop()
+        self.directory.cleanup()
+
+    # sample() One sample [seconds] after the previous one
+    def sample(self, seconds=1.0):
+        self.now += seconds
+        self.sampler.sample()
+
+    def test_valid(self):
+        self.assertTrue(self.sampler.valid)
+        self.assertFalse(StatsSampler(root=os.path.join(self.directory.name, 'missing')).valid)
+
+    def test_samples(self):
+        self.cgroup.write(self.podman, cpu=1_000_000, memory=10*1024*1024, read=0, written=0, pids=3)
+        self.cgroup.write(self.docker, cpu=0, memory=1024, pids=1)
+        self.sample()
+        self.assertEqual({stats.ID for stats in self.sampler.top(count=10)}, {PODMAN, DOCKER})
+        self.assertIsNone(self.sampler.top(IDs=[PODMAN])[0].last('cpu'))      # Rates need two samples
+        self.cgroup.write(self.podman, cpu=1_500_000, memory=20*1024*1024, read=4096, written=8192, pids=5)
+        self.cgroup.write(self.docker, cpu=2_000_000, memory=2048, pids=2)
+        self.sample(seconds=2.0)
+        podman = self.sampler.top(IDs=[PODMAN])[0]
+        self.assertAlmostEqual(podman.last('cpu'), 25.0)                       # 0.5s of CPU in 2s
+        self.assertEqual(podman.last('memory'), 20*1024*1024)
+        self.assertAlmostEqual(podman.last('io'), 6144.0)                      # 12 KiB in 2s, all devices
+        self.assertEqual(podman.last('pids'), 5)
+        self.assertEqual([stats.ID for stats in self.sampler.top(field='cpu', count=1)], [DOCKER])   # 100%, a whole CPU
+
+    def test_ring_buffer(self):
+        for index in range(12):
+            self.cgroup.write(self.podman, cpu=index*100_000, memory=index, pids=index)
+            self.sample()
+        podman = self.sampler.top(IDs=[PODMAN])[0]
+        for field in ('cpu', 'memory', 'io', 'pids'):
+            self.assertEqual(len(getattr(podman, field)), 5)
+        self.assertEqual(list(podman.memory), [7, 8, 9, 10, 11])
+        self.assertAlmostEqual(podman.last('cpu'), 10.0)
+
+    def test_container_gone(self):
+        self.cgroup.write(self.podman, cpu=1)
+        self.sample()
+        shutil.rmtree(self.podman)
+        self.sample()
+        self.assertEqual([stats.ID for stats in self.sampler.top()], [DOCKER])
+
+    def test_new_container_rescan(self):
+        self.sample()
+        late = 'd'*64
+        path = self.cgroup.add(f'machine.slice/libpod-{late}.scope')
+        self.cgroup.write(path, cpu=1)
+        self.sampler.track([late])
+        self.sample(seconds=1.0)                                # Too early for another scan
+        self.assertFalse(self.sampler.top(IDs=[late]))
+        self.sample(seconds=5.0)
+        self.assertEqual(len(self.sampler.top(IDs=[late])), 1)
+
+    def test_format(self):
+        self.assertEqual(sparkline([0, 4, 8], width=5), '   ▄█')
+        self.assertEqual(humanBytes(1536), '1.5K')
+        self.assertEqual(humanBytes(None), '-')
+
+
+if __name__ == '__main__':
+    unittest.main()